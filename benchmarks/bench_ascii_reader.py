@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+ASCII格式dat文件读取对比：分块由numpy.loadtxt解析后写入预分配数组 与 pandas.read_csv整表读取。
+两种方式的结果相同，均为int32的采样时间、模拟量和按16位打包的开关量字，分别统计用时和峰值内存。
+
+用法: python benchmarks/bench_ascii_reader.py [采样点数] [模拟量通道数] [开关量通道数]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from py3comtrade.model import ChannelNum, ConfigSample, Nrate
+from py3comtrade.model.type import DataFileType
+from py3comtrade.model.data import pack_digital
+from py3comtrade.reader.data_reader import read_ascii_file
+
+
+def make_sample(analog_num: int, digital_num: int, count: int) -> ConfigSample:
+    """构造单采样段的ASCII采样信息"""
+    sample = ConfigSample(freg=50, nrate_num=1, data_file_type=DataFileType.ASCII,
+                          channel_num=ChannelNum(total_num=analog_num + digital_num,
+                                                 analog_num=analog_num, digital_num=digital_num))
+    sample.add_nrate(Nrate(samp=1200, end_point=count))
+    sample.calc_sampling()
+    return sample
+
+
+def write_ascii(file_path: str, count: int, analog_num: int, digital_num: int):
+    """生成与录波器输出格式相同的ASCII数据文件，分块写入"""
+    rng = np.random.default_rng(0)
+    step = 100000
+    with open(file_path, 'w') as f:
+        for start in range(0, count, step):
+            n = min(step, count - start)
+            block = pd.DataFrame(np.column_stack((
+                np.arange(start + 1, start + n + 1),
+                np.arange(start, start + n) * 833,
+                rng.integers(-32767, 32767, (n, analog_num)),
+                rng.integers(0, 2, (n, digital_num)))))
+            block.to_csv(f, header=False, index=False, lineterminator='\n')
+
+
+def pandas_route(file_path: str, analog_num: int):
+    """原实现的pandas整表读取后再按列切分，并转换为与read_ascii_file相同的类型"""
+    content = pd.read_csv(file_path, header=None).to_numpy()
+    return (content[:, 0:2].astype(np.int32), content[:, 2:analog_num + 2].astype(np.int32),
+            pack_digital(content[:, analog_num + 2:]))
+
+
+def measure(func):
+    """分别返回用时和tracemalloc统计的峰值内存，计时时不开启内存跟踪"""
+    start = time.perf_counter()
+    func()
+    cost = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return cost, peak / 1024 / 1024
+
+
+def main(count: int = 1000000, analog_num: int = 24, digital_num: int = 37):
+    sample = make_sample(analog_num, digital_num, count)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dat_path = os.path.join(tmp_dir, "ascii.dat")
+        write_ascii(dat_path, count, analog_num, digital_num)
+        print(f"文件大小 {os.path.getsize(dat_path) / 1024 / 1024:.1f} MB，{count} 行")
+        result = read_ascii_file(dat_path, sample)
+        final_mb = (result.sample_time.nbytes + result.analog_value.nbytes + result.digital_value.nbytes) / 1024 / 1024
+        print(f"最终数组 {final_mb:.1f} MB")
+        expected = pandas_route(dat_path, analog_num)
+        for actual, value in zip((result.sample_time, result.analog_value, result.digital_value), expected):
+            np.testing.assert_array_equal(value, actual)
+        costs = {}
+        for name, func in (("pandas.read_csv", lambda: pandas_route(dat_path, analog_num)),
+                           ("read_ascii_file", lambda: read_ascii_file(dat_path, sample))):
+            costs[name], peak = measure(func)
+            print(f"{name:<16}{costs[name]:>8.2f} s  峰值内存 {peak:>8.1f} MB")
+        print(f"加速比 {costs['pandas.read_csv'] / costs['read_ascii_file']:.2f}x")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
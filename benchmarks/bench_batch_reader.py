@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+批量读取录波文件耗时：单进程逐个调用comtrade_reader 与 batch_reader进程池并行读取。
+
+用法: python benchmarks/bench_batch_reader.py [录波份数] [最大进程数]
+"""
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from py3comtrade.model.type import ReadMode
+from py3comtrade.reader.batch_reader import batch_reader, record_summary
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+
+def copy_records(tmp_dir: str, copies: int) -> list:
+    """将ygz录波复制多份作为批量读取的输入"""
+    files = []
+    for i in range(copies):
+        for src in glob.glob(os.path.join(DATA_DIR, "ygz.*")):
+            shutil.copy(src, os.path.join(tmp_dir, f"rec{i:05d}{os.path.splitext(src)[1]}"))
+        files.append(os.path.join(tmp_dir, f"rec{i:05d}.cfg"))
+    return files
+
+
+def main(copies: int = 200, max_workers: int = os.cpu_count() or 1):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = copy_records(tmp_dir, copies)
+        print(f"{copies}份录波(96A/128D，2830点)，CPU核数{os.cpu_count()}")
+        start = time.perf_counter()
+        for file_path in files:
+            record_summary(comtrade_reader(file_path, ReadMode.DAT))
+        serial = time.perf_counter() - start
+        print(f"  {'方式':<16}{'耗时(s)':>10}{'加速比':>8}")
+        print(f"  {'逐个读取':<16}{serial:>10.2f}{1:>8.2f}")
+        workers = 2
+        while workers <= max_workers:
+            start = time.perf_counter()
+            results = list(batch_reader(files, ReadMode.DAT, handler=record_summary, max_workers=workers))
+            elapsed = time.perf_counter() - start
+            assert all(result.ok for result in results)
+            print(f"  {f'{workers}进程':<16}{elapsed:>10.2f}{serial / elapsed:>8.2f}")
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
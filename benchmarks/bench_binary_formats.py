@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+BINARY、BINARY32、FLOAT32三种二进制dat文件的读取吞吐量对比。
+
+用法: python benchmarks/bench_binary_formats.py [模拟量通道数] [开关量通道数] [采样点数]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from py3comtrade.model import ChannelNum, ConfigSample, Nrate
+from py3comtrade.model.data import Data, pack_digital
+from py3comtrade.model.type import DataFileType
+from py3comtrade.reader.data_reader import read_binary_file
+
+
+def make_sample(analog_num: int, digital_num: int, count: int, data_file_type: DataFileType) -> ConfigSample:
+    """构造单采样段的采样信息"""
+    sample = ConfigSample(freg=50, nrate_num=1, data_file_type=data_file_type,
+                          channel_num=ChannelNum(total_num=analog_num + digital_num,
+                                                 analog_num=analog_num, digital_num=digital_num))
+    sample.add_nrate(Nrate(samp=10000, end_point=count))
+    sample.calc_sampling()
+    return sample
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """多次运行取最短用时"""
+    costs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        costs.append(time.perf_counter() - start)
+    return min(costs)
+
+
+def main(analog_num: int = 200, digital_num: int = 256, count: int = 100000):
+    rng = np.random.default_rng(0)
+    data = Data(file_path="",
+                sample_time=np.column_stack((np.arange(1, count + 1), np.arange(count) * 100)).astype(np.int32),
+                analog_value=rng.integers(-32767, 32767, (count, analog_num)),
+                digital_value=pack_digital(rng.integers(0, 2, (count, digital_num), dtype=np.uint8)),
+                digital_num=digital_num)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for data_file_type in (DataFileType.BINARY, DataFileType.BINARY32, DataFileType.FLOAT32):
+            sample = make_sample(analog_num, digital_num, count, data_file_type)
+            dat_path = os.path.join(tmp_dir, f"{data_file_type.code}.dat")
+            data.write_binary(dat_path, sample)
+            size_mb = os.path.getsize(dat_path) / 1024 / 1024
+            cost = best_of(lambda: read_binary_file(dat_path, sample))
+            print(f"{data_file_type.code:<9}{size_mb:>9.1f} MB{cost * 1000:>10.1f} ms"
+                  f"{count / cost / 1e6:>10.2f} M采样点/s{size_mb / cost:>10.0f} MB/s")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
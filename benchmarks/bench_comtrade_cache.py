@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+重复打开同一录波的耗时：不使用缓存、首次写入磁盘缓存、命中缓存，以及单纯内存映射打开缓存中npy文件的耗时。
+
+用法: python benchmarks/bench_comtrade_cache.py [重复次数]
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from py3comtrade.reader.comtrade_cache import ComtradeCache
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+
+def measure(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(repeat: int = 20):
+    print(f"  {'录波':<8}{'不使用缓存':>12}{'写入缓存':>12}{'命中缓存':>12}{'仅内存映射':>12}  (ms)")
+    for cfg_path in (os.path.join(DATA_DIR, "ygz.cfg"), os.path.join(DATA_DIR, "xtz.cfg")):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ComtradeCache(tmp_dir)
+            plain = measure(lambda: comtrade_reader(cfg_path), repeat)
+            start = time.perf_counter()
+            comtrade_reader(cfg_path, cache=cache)
+            store = (time.perf_counter() - start) * 1000
+            warm = measure(lambda: comtrade_reader(cfg_path, cache=cache), repeat)
+            npy_files = glob.glob(os.path.join(tmp_dir, "*", "*.npy"))
+            mmap = measure(lambda: [np.load(f, mmap_mode="r") for f in npy_files], repeat)
+            name = os.path.basename(cfg_path)
+            print(f"  {name:<8}{plain:>12.2f}{store:>12.2f}{warm:>12.2f}{mmap:>12.2f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+cfg文件读取对比：config_header_reader只读概要信息 与 config_reader完整解析。
+
+用法: python benchmarks/bench_config_header.py [重复次数] [合成cfg模拟量通道数] [合成cfg开关量通道数]
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+from py3comtrade.reader.config_reader import config_header_reader, config_reader
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+
+
+def write_cfg(file_path: str, analog_num: int, digital_num: int):
+    """生成含中文通道名称的GBK编码cfg文件"""
+    lines = ["合成变电站,1,1999", f"{analog_num + digital_num},{analog_num}A,{digital_num}D"]
+    for i in range(analog_num):
+        lines.append(f"{i + 1},220kV线路{i // 4 + 1}_I{'abcn'[i % 4]},{'ABCN'[i % 4]},线路{i // 4 + 1},A,"
+                     f"0.001,0,0,-32767,32767,1200,1,S")
+    for i in range(digital_num):
+        lines.append(f"{i + 1},220kV线路{i // 8 + 1}_保护动作{i % 8 + 1},,,0")
+    lines += ["50", "1", "1200,12000", "17/09/2015,10:52:53.065000", "17/09/2015,10:52:53.165000",
+              "BINARY", "1"]
+    with open(file_path, "w", encoding="gbk") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def measure(func, files, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for file_path in files:
+            func(file_path)
+    return (time.perf_counter() - start) / repeat / len(files) * 1000
+
+
+def main(repeat: int = 20, analog_num: int = 400, digital_num: int = 600):
+    data_files = sorted(glob.glob(os.path.join(DATA_DIR, "*.cfg")))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        synthetic = os.path.join(tmp_dir, "synthetic.cfg")
+        write_cfg(synthetic, analog_num, digital_num)
+        for title, files in (("tests/data", data_files),
+                             (f"合成cfg({analog_num}A/{digital_num}D)", [synthetic])):
+            print(title)
+            for name, func in (("config_reader", config_reader),
+                               ("config_header_reader", config_header_reader)):
+                print(f"  {name:<22}{measure(func, files, repeat):>8.2f} ms/文件")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
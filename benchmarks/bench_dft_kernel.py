@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+单个数据窗的傅里叶计算耗时：缓存系数表 与 每次重新计算sin/cos。
+
+用法: python benchmarks/bench_dft_kernel.py [数据窗个数] [每周波采样点数]
+"""
+import sys
+import time
+
+import numpy as np
+
+from py3comtrade.computation.calcium import Calcium
+from py3comtrade.computation.fourier import dft_rx
+
+
+def dft_rx_uncached(vs: np.ndarray, num_samples: int, k: int) -> complex:
+    """原fourier.dft_rx实现，每次调用重新生成θ及其sin/cos"""
+    m = num_samples // 2
+    theta = (np.arange(num_samples) * k) * np.pi / m
+    return complex(vs.dot(np.sin(theta)) / m, vs.dot(np.cos(theta)) / m) / np.sqrt(2)
+
+
+def dft_rx_loop(vs: list[float], k: int) -> complex:
+    """原Calcium.dft_rx和Vector.calc_vector实现，逐点调用np.sin/np.cos"""
+    m = len(vs) // 2
+    real = 0.0
+    imag = 0.0
+    for i in range(len(vs)):
+        real += vs[i] * np.sin(i * k * np.pi / m)
+        imag += vs[i] * np.cos(i * k * np.pi / m)
+    return complex(real / m, imag / m) / np.sqrt(2)
+
+
+def per_window_us(func, windows) -> float:
+    start = time.perf_counter()
+    for window in windows:
+        func(window)
+    return (time.perf_counter() - start) / len(windows) * 1e6
+
+
+def main(window_num: int = 5000, cycle_point: int = 80):
+    rng = np.random.default_rng(0)
+    windows = rng.normal(0, 100, (window_num, cycle_point))
+    window_lists = windows.tolist()
+    loop_windows = window_lists[:max(1, window_num // 10)]
+    print(f"{window_num}个数据窗，每周波{cycle_point}点，单个数据窗耗时(us)")
+    for name, func, data in (
+            ("原逐点循环(Calcium/Vector)", lambda w: dft_rx_loop(w, 1), loop_windows),
+            ("原dft_rx每次生成sin/cos", lambda w: dft_rx_uncached(w, cycle_point, 1), windows),
+            ("dft_rx缓存系数表", lambda w: dft_rx(w, cycle_point, 1), windows),
+            ("Calcium.dft_rx缓存系数表", lambda w: Calcium.dft_rx(w, 1), window_lists)):
+        print(f"  {name:<28}{per_window_us(func, data):>10.1f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+大型厂站dmf模型文件解析耗时与峰值内存：ET.parse整树解析 与 iterparse流式解析。
+
+用法: python benchmarks/bench_dmf_parser.py [线路数] [每条线路的开关量数]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from py3comtrade.reader.dmf_reader import dmf_parser, dmf_stream_parser
+
+
+def synthetic_dmf(file_path: str, line_num: int, status_per_line: int):
+    """生成合成dmf文件：每段母线带10条线路，每条线路4个电流通道和若干开关量"""
+    bus_num = max(1, line_num // 10)
+    analog_idx = 0
+    status_idx = 0
+    analogs, statuses, buses, lines = [], [], [], []
+
+    def analog(unit, ph):
+        nonlocal analog_idx
+        analog_idx += 1
+        analogs.append(f'<scl:AnalogChannel idx_cfg="{analog_idx}" idx_org="{analog_idx}" type="A" flag="ACV" freq="50" au="1" bu="0" '
+                       f'sIUnit="{unit}" multiplier="" primary="1" secondary="1" ps="S" ph="{ph}"/>')
+        return analog_idx
+
+    def status(flag):
+        nonlocal status_idx
+        status_idx += 1
+        statuses.append(f'<scl:StatusChannel idx_cfg="{status_idx}" idx_org="{status_idx}" type="Relay" flag="{flag}" '
+                        f'contact="NormallyOpen" srcRef=""/>')
+        return status_idx
+
+    for b in range(1, bus_num + 1):
+        u = [analog("V", ph) for ph in "ABCN"]
+        buses.append(f'<scl:Bus idx="{b}" bus_name="母线{b}" VRtg="220" VRtgSnd="57.7" VRtgSnd_Pos="BUS">'
+                     f'<scl:ACVChn ua_idx="{u[0]}" ub_idx="{u[1]}" uc_idx="{u[2]}" un_idx="{u[3]}" ul_idx="0"/>'
+                     + "".join(f'<scl:AnaChn idx_cfg="{i}"/>' for i in u) + '</scl:Bus>')
+    for n in range(1, line_num + 1):
+        i = [analog("A", ph) for ph in "ABCN"]
+        s = [status("TrPhsA") for _ in range(status_per_line)]
+        lines.append(f'<scl:Line idx="{n}" line_name="线路{n}" bus_ID="{(n - 1) % bus_num + 1}" VRtg="220" '
+                     f'ARtg="1" ARtgSnd="1" LinLen="30" bran_num="1">'
+                     f'<scl:RX r1="0.03" x1="0.3" r0="0.1" x0="0.9"/><scl:CG c0="0" c1="0" g0="0" g1="0"/>'
+                     f'<scl:MR idx="0" mr0="0" mx0="0"/>'
+                     f'<scl:ACC_Bran bran_idx="1" ia_idx="{i[0]}" ib_idx="{i[1]}" ic_idx="{i[2]}" in_idx="{i[3]}" '
+                     f'dir="POS"/>'
+                     + "".join(f'<scl:AnaChn idx_cfg="{x}"/>' for x in i)
+                     + "".join(f'<scl:StaChn idx_cfg="{x}"/>' for x in s) + '</scl:Line>')
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<scl:ComtradeModel xmlns:scl="http://www.iec.ch/61850/2003/SCL" station_name="合成站" '
+                'version="1.0" reference="0" rec_dev_name="录波器">\n')
+        for part in (analogs, statuses, buses, lines):
+            f.write("\n".join(part))
+            f.write("\n")
+        f.write('</scl:ComtradeModel>\n')
+    return analog_idx, status_idx
+
+
+def measure(parser, file_path: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    dmf = parser(file_path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return dmf, elapsed, peak
+
+
+def main(line_num: int = 500, status_per_line: int = 8):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "synthetic.dmf")
+        analog_num, status_num = synthetic_dmf(file_path, line_num, status_per_line)
+        size = os.path.getsize(file_path) / 1024 / 1024
+        print(f"{line_num}条线路，{analog_num}个模拟量，{status_num}个开关量，文件{size:.1f}MB")
+        print(f"  {'解析方式':<16}{'耗时(s)':>10}{'峰值内存(MB)':>14}")
+        for label, parser in (("ET.parse整树", dmf_parser), ("iterparse流式", dmf_stream_parser)):
+            dmf, elapsed, peak = measure(parser, file_path)
+            assert len(dmf.lines) == line_num
+            print(f"  {label:<16}{elapsed:>10.3f}{peak / 1024 / 1024:>14.1f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+枚举字符串解析耗时：逐成员线性比较 与 按枚举类构建一次的查找表+模糊匹配缓存，
+分别统计单次from_string调用和config_reader完整解析cfg文件的耗时。
+
+用法: python benchmarks/bench_enum_lookup.py [重复次数] [合成cfg模拟量通道数] [合成cfg开关量通道数]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from py3comtrade.model.type.analog_enum import ElectricalUnit, PsType
+from py3comtrade.model.type.base_enum import BaseEnum
+from py3comtrade.model.type.phase_code import PhaseCode
+from py3comtrade.reader.config_reader import config_reader
+
+SAMPLES = ((PhaseCode, "A"), (PhaseCode, "C"), (PhaseCode, "IN"), (PhaseCode, " "), (ElectricalUnit, "kV"),
+           (ElectricalUnit, "A"), (ElectricalUnit, "mA"), (PsType, "S"))
+
+
+def linear_from_string(cls, string: str, fuzzy: bool = True, default=None):
+    """原实现：每次调用都逐成员比较两遍"""
+    if not string or string.strip() == '':
+        if default is not None:
+            return default
+        raise ValueError(f"{cls.__name__} 未提供字符串且未设置默认值")
+    string = string.strip().upper()
+    for member in cls:
+        if str(member.get_code()).upper() == string:
+            return member
+    if fuzzy:
+        for member in cls:
+            if string.endswith(str(member.get_code()).upper()):
+                return member
+    raise ValueError(f"无法将 '{string}' 映射到 {cls.__name__} 枚举类型中")
+
+
+def write_cfg(file_path: str, analog_num: int, digital_num: int):
+    """生成电压、电流通道交替的合成cfg文件"""
+    lines = ["合成变电站,1,1999", f"{analog_num + digital_num},{analog_num}A,{digital_num}D"]
+    for i in range(analog_num):
+        unit = "V" if i // 4 % 2 == 0 else "A"
+        lines.append(f"{i + 1},通道{i + 1},{'ABCN'[i % 4]},线路{i // 8 + 1},{unit},"
+                     f"0.001,0,0,-32767,32767,1200,1,S")
+    for i in range(digital_num):
+        lines.append(f"{i + 1},开关量{i + 1},{'ABC'[i % 3]},,0")
+    lines += ["50", "1", "1200,12000", "17/09/2015,10:52:53.065000", "17/09/2015,10:52:53.165000",
+              "BINARY", "1"]
+    with open(file_path, "w", encoding="gbk") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def measure_calls(repeat: int) -> float:
+    """单次from_string调用的平均耗时(us)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for cls, string in SAMPLES:
+            cls.from_string(string, default=cls.S if cls is PsType else PhaseCode.NO_PHASE)
+    return (time.perf_counter() - start) / repeat / len(SAMPLES) * 1e6
+
+
+def measure_reader(file_path: str, repeat: int) -> float:
+    """config_reader解析一次cfg文件的平均耗时(ms)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        config_reader(file_path)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(repeat: int = 20, analog_num: int = 2000, digital_num: int = 4000):
+    table_from_string = BaseEnum.__dict__["from_string"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "synthetic.cfg")
+        write_cfg(file_path, analog_num, digital_num)
+        print(f"合成cfg({analog_num}A/{digital_num}D)")
+        print(f"  {'实现':<12}{'from_string(us/次)':>20}{'config_reader(ms/文件)':>24}")
+        try:
+            for label, implementation in (("逐成员比较", classmethod(linear_from_string)),
+                                          ("查找表+缓存", table_from_string)):
+                BaseEnum.from_string = implementation
+                calls = measure_calls(repeat * 1000)
+                reader = measure_reader(file_path, repeat)
+                print(f"  {label:<12}{calls:>20.2f}{reader:>24.2f}")
+        finally:
+            BaseEnum.from_string = table_from_string
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
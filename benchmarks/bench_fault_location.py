@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+单个录波文件的单端测距耗时：只计算零时刻前后两个数据窗 与 先计算整段录波的相量。
+
+用法: python benchmarks/bench_fault_location.py [cfg文件] [重复次数]
+"""
+import sys
+import time
+
+from py3comtrade.computation.phasor import comtrade_phasors
+from py3comtrade.computation.zerolocation import comtrade_fault_locations
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+
+def per_record_ms(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main(cfg_file: str = "tests/data/ygz.cfg", repeat: int = 200):
+    comtrade = comtrade_reader(cfg_file)
+    print(f"{cfg_file}，{len(comtrade.analogs)}个模拟量通道，{comtrade.sample.count}个采样点，单个录波耗时(ms)")
+    for name, func in (
+            ("整段录波相量", lambda: comtrade_phasors(comtrade, output_primary=True)),
+            ("零时刻前后数据窗测距", lambda: comtrade_fault_locations(comtrade))):
+        print(f"  {name:<20}{per_record_ms(func, repeat):>10.3f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else "tests/data/ygz.cfg", *(int(arg) for arg in sys.argv[2:3]))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+长录波逐周波谐波分析耗时：逐数据窗逐次谐波调用dft_rx 与 整段录波一次FFT。
+
+用法: python benchmarks/bench_harmonic.py [通道数] [周波数] [每周波采样点数] [最高谐波次数]
+"""
+import sys
+import time
+
+import numpy as np
+
+from py3comtrade.computation.fourier import dft_rx
+from py3comtrade.computation.harmonic import calc_harmonics
+from py3comtrade.model.nrate import Nrate
+
+
+def dft_rx_harmonics(instants: np.ndarray, cycle_point: int, max_harmonic: int) -> np.ndarray:
+    """逐通道、逐周波、逐次谐波调用dft_rx"""
+    cycle_num = instants.shape[1] // cycle_point
+    phasors = np.empty((instants.shape[0], cycle_num, max_harmonic), dtype=complex)
+    for c in range(instants.shape[0]):
+        for j in range(cycle_num):
+            window = instants[c, j * cycle_point:(j + 1) * cycle_point]
+            for k in range(1, max_harmonic + 1):
+                phasors[c, j, k - 1] = dft_rx(window, cycle_point, k)
+    return phasors
+
+
+def main(channel_num: int = 96, cycle_num: int = 3000, cycle_point: int = 80, max_harmonic: int = 13):
+    rng = np.random.default_rng(0)
+    instants = rng.normal(0, 100, (channel_num, cycle_num * cycle_point))
+    nrates = [Nrate(index=0, samp=cycle_point * 50, start_point=0, end_point=instants.shape[1],
+                    cycle_point=cycle_point)]
+    print(f"{channel_num}通道 x {cycle_num}周波，每周波{cycle_point}点，1~{max_harmonic}次谐波，耗时(s)")
+    loop_channels = max(1, channel_num // 16)
+    start = time.perf_counter()
+    dft_rx_harmonics(instants[:loop_channels], cycle_point, max_harmonic)
+    loop_time = (time.perf_counter() - start) * channel_num / loop_channels
+    print(f"  {'逐窗口dft_rx(按通道数折算)':<24}{loop_time:>10.2f}")
+    start = time.perf_counter()
+    calc_harmonics(instants, nrates, max_harmonic)
+    print(f"  {'整段FFT':<24}{time.perf_counter() - start:>10.2f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:5]))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+逐点相量计算对比：滑动窗口前缀和 与 逐采样点调用dft_rx_channels、eliminate_exp_decay_channels。
+
+用法: python benchmarks/bench_phasor.py [模拟量通道数] [采样点数] [每周波采样点数]
+"""
+import sys
+import time
+
+import numpy as np
+
+from py3comtrade.computation.fourier import dft_rx_channels, eliminate_exp_decay_channels
+from py3comtrade.computation.phasor import calc_phasors, calc_phasors_exp_decay
+from py3comtrade.model import Nrate
+
+
+def main(analog_num: int = 96, count: int = 200000, cycle_point: int = 80):
+    rng = np.random.default_rng(0)
+    n = np.arange(count)
+    instants = 100 * np.sin(2 * np.pi * n / cycle_point + rng.random((analog_num, 1))) + rng.normal(
+        0, 1, (analog_num, count))
+    nrates = [Nrate(samp=cycle_point * 50, start_point=0, end_point=count, cycle_point=cycle_point)]
+
+    # 逐点计算耗时过长，只计算部分采样点后按比例折算
+    sample_points = min(2000, count - 2 * cycle_point)
+    window_point = cycle_point + cycle_point // 2
+    print(f"{analog_num}通道 x {count}采样点，每周波{cycle_point}点")
+    for name, batched, per_point, window in (
+            ("基波相量", lambda: calc_phasors(instants, nrates),
+             lambda s: dft_rx_channels(instants[:, s:s + cycle_point], cycle_point), cycle_point),
+            ("消除衰减直流分量", lambda: calc_phasors_exp_decay(instants, nrates),
+             lambda s: eliminate_exp_decay_channels(instants[:, s:s + window_point], cycle_point), window_point)):
+        start = time.perf_counter()
+        batched()
+        sliding_cost = time.perf_counter() - start
+        start = time.perf_counter()
+        for s in range(sample_points):
+            per_point(s)
+        loop_cost = (time.perf_counter() - start) / sample_points * (count - window + 1)
+        print(f"  {name}：逐点计算(折算) {loop_cost:>8.2f} s，滑动窗口 {sliding_cost:>6.2f} s")
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
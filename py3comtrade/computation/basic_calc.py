@@ -20,7 +20,7 @@ def raw_to_instant(raw: list[int], a: float, b: float,
         瞬时值数组
     """
     instants = np.asarray(raw) * a + b
-    if primary < secondary < 0:
+    if secondary == 0 or primary < secondary < 0:
         raise ValueError(f"变比系数不合法，输入的一次值为{primary}，输入的二次值为{secondary}")
     ratio = primary / secondary
     if output_primary:
@@ -28,3 +28,42 @@ def raw_to_instant(raw: list[int], a: float, b: float,
     else:
         vs = instants / ratio if input_primary else instants
     return np.around(vs, 3).tolist()
+
+
+def raw_to_instant_matrix(raw: np.ndarray, a: np.ndarray, b: np.ndarray,
+                          primary: np.ndarray, secondary: np.ndarray,
+                          input_primary: np.ndarray, output_primary: bool = False,
+                          dtype: np.dtype = np.float64) -> np.ndarray:
+    """
+    原始采样值矩阵按通道整体转换为瞬时值矩阵，换算结果与raw_to_instant一致但不做舍入
+    参数:
+        raw(np.ndarray)原始采样值矩阵，行为通道，列为采样点
+        a(np.ndarray)各通道增益系数
+        b(np.ndarray)各通道偏移系数
+        primary(np.ndarray)各通道互感器变比一次系数
+        secondary(np.ndarray)各通道互感器变比二次系数
+        input_primary(np.ndarray)各通道输入数值是否为一次值
+        output_primary(bool)输出数值类型是一次值或二次值
+        dtype(np.dtype)输出数据类型，默认为float64，可选float32减少一半内存
+    返回值:
+        瞬时值矩阵，形状与raw一致
+    异常:
+        ValueError: 存在变比系数不合法的通道时抛出，校验规则与raw_to_instant一致
+    """
+    primary = np.asarray(primary, dtype=np.float64)
+    secondary = np.asarray(secondary, dtype=np.float64)
+    invalid = np.flatnonzero((secondary == 0) | ((primary < secondary) & (secondary < 0)))
+    if invalid.size:
+        raise ValueError(f"变比系数不合法，第{invalid.tolist()}行通道的一次值为{primary[invalid].tolist()}，"
+                         f"二次值为{secondary[invalid].tolist()}")
+    ratio = primary / secondary
+    input_primary = np.asarray(input_primary, dtype=bool)
+    if output_primary:
+        factor = np.where(input_primary, 1.0, ratio)
+    else:
+        factor = np.where(input_primary, 1.0 / ratio, 1.0)
+    scale = (np.asarray(a, dtype=np.float64) * factor).astype(dtype)[:, None]
+    offset = (np.asarray(b, dtype=np.float64) * factor).astype(dtype)[:, None]
+    instants = np.multiply(raw, scale, dtype=dtype)
+    instants += offset
+    return instants
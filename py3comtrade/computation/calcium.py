@@ -3,7 +3,7 @@
 import numpy as np
 from pydantic import Field, BaseModel
 
-from py3comtrade.computation import math_polar_rect
+from py3comtrade.computation import fourier, math_polar_rect
 
 
 class Calcium(BaseModel):
@@ -16,11 +16,13 @@ class Calcium(BaseModel):
         v = self.dft_rx(self.instant, k)
         self.vector = complex(round(v.real, 3), round(v.imag, 3))
 
-    def calc_angle(self):
+    def calc_angle(self) -> float:
         self.angle = math_polar_rect.complex_to_polar(self.vector)[1]
+        return self.angle
 
-    def calc_effective(self):
+    def calc_effective(self) -> float:
         self.effective = round(abs(self.vector), 3)
+        return self.effective
 
     def calc_value(self):
         self.calc_vector(k=1)
@@ -41,14 +43,4 @@ class Calcium(BaseModel):
             raise ValueError(f"输入的瞬时值数组长度要大于2，现在长度为{size}")
         if not isinstance(k, int) or k < 0 or k >= size:
             raise ValueError(f"频率k必须是非负整数且小于采样点数")
-        # 计算中点值，明确使用二进制除法
-        m = size // 2
-        real = 0.0
-        imag = 0.0
-        for i in range(size):
-            real += vs[i] * np.sin(i * k * np.pi / m)
-            imag += vs[i] * np.cos(i * k * np.pi / m)
-
-        real /= m
-        imag /= m
-        return complex(real, imag) / np.sqrt(2)
+        return fourier.dft_rx(np.asarray(vs, dtype=np.float64), size, k)
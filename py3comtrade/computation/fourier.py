@@ -7,9 +7,29 @@
 # @Author  : 张松贵
 # @File    : fourier.py
 # @IDE     : PyCharm
+from functools import lru_cache
 
 import numpy as np
 
+SQRT_2 = np.sqrt(2)
+# 缓存的傅里叶系数表数量，按(采样点数, 谐波次数)区分
+DFT_KERNEL_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=DFT_KERNEL_CACHE_SIZE)
+def dft_kernel(num_samples: int, k: int) -> np.ndarray:
+    """
+    获取傅里叶计算的正弦、余弦系数表，同一采样点数和谐波次数只计算一次
+    @param num_samples: 采样点数
+    @param k: 谐波次数
+    @return: 只读的系数表，形状为(2, 采样点数)，第一行为sin(θ)/(m√2)，第二行为cos(θ)/(m√2)，m为采样点数的一半
+    """
+    m = num_samples // 2
+    theta = (np.arange(num_samples) * k) * np.pi / m
+    kernel = np.vstack((np.sin(theta), np.cos(theta))) / (m * SQRT_2)
+    kernel.setflags(write=False)
+    return kernel
+
 
 def dft_rx(vs: np.ndarray, num_samples: int, k: int) -> complex:
     """
@@ -26,26 +46,9 @@ def dft_rx(vs: np.ndarray, num_samples: int, k: int) -> complex:
         raise ValueError("采样点数num_samples必须是正整数")
     if not isinstance(k, int) or k < 0 or k >= num_samples:
         raise ValueError("频率k必须是非负整数且小于采样点数")
-    # 计算中点值，明确使用二进制除法
-    m = num_samples // 2
-    # 生成索引数组i
-    i_values = np.arange(num_samples)
-
-    # 计算角度theta
-    theta = (i_values * k) * np.pi / m
-
-    # 向量化的sin和cos计算，并与vs做点积
-    real_part = vs.dot(np.sin(theta)) / m
-    imag_part = vs.dot(np.cos(theta)) / m
-    # real = 0.0
-    # imag = 0.0
-    # for i in range(num_samples):
-    #     real += vs[i] * np.sin(i * k * np.pi / m)
-    #     imag += vs[i] * np.cos(i * k * np.pi / m)
-    #
-    # real /= m
-    # imag /= m
-    return complex(real_part, imag_part)/np.sqrt(2)
+    # 系数表按采样点数和谐波次数缓存，与瞬时值做一次矩阵乘得到实部和虚部
+    real_part, imag_part = dft_kernel(num_samples, k) @ vs
+    return complex(real_part, imag_part)
 
 
 def dft_exp_decay(vs: np.ndarray, sample_rate: int = None):
@@ -107,26 +110,52 @@ def dft_rx_channels(vs: np.ndarray, sample_rate: int = None, k: int = 1) -> np.n
         sample_rate = vs.shape[1]
     elif sample_rate != vs.shape[1]:
         raise ValueError(f"输入的瞬时值数组长度与输入的采样率{sample_rate}不一致")
-    dft = np.zeros(vs.shape[0], dtype=complex)
-    # 获取一个周波的瞬时值
-    for i in range(vs.shape[0]):
-        # 进行傅里叶计算，获取实部和虚部
-        dft[i] = dft_rx(vs[i], sample_rate, k)
-    return dft
+    if not isinstance(k, int) or k < 0 or k >= sample_rate:
+        raise ValueError("频率k必须是非负整数且小于采样点数")
+    # 全部通道与系数表一次矩阵乘
+    parts = vs @ dft_kernel(sample_rate, k).T
+    return parts[:, 0] + 1j * parts[:, 1]
+
+
+def exp_decay_correct(dft1: np.ndarray, dft2: np.ndarray, dft3: np.ndarray) -> np.ndarray:
+    """
+    由1.5个周波内三组数据窗的傅里叶结果计算消除衰减直流分量后的相量，计算方法同dft_exp_decay，支持数组批量计算
+    :param dft1: 第一组点(第0点开始的一个周波)的傅里叶结果
+    :param dft2: 第二组点(第1/4周波开始的一个周波)的傅里叶结果
+    :param dft3: 第三组点(第1/2周波开始的一个周波)的傅里叶结果
+    :return: 消除衰减直流分量后的相量，分母为0的位置为NaN
+    """
+    fz = dft3.real + dft2.imag
+    fm = dft1.imag + dft2.real
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = np.square(fz / fm)
+    a = np.where(fm == 0, np.nan, a)
+    k1 = (dft1.real + dft3.real) / (1 + a)
+    k2 = (dft1.imag + dft3.imag) / (1 + a)
+    return (dft1.real - k1) + 1j * (dft1.imag - k2)
 
 
 def eliminate_exp_decay_channels(vs: np.ndarray, sample_rate: int = None):
     """
-    消除直流分量后返回对应通道的实部和虚部，需要1.5个周波的数据。
+    消除直流分量后返回对应通道的实部和虚部，需要1.5个周波的数据，全部通道一次计算，各通道结果与dft_exp_decay一致。
     1.[ (第三组点的实部+第二组点的虚部)/(第一组点的虚部+第二组点的实部) ] 的平方，把这个数记为a;
     2.通过第一步的运算结果a，求K1和K2，k1是 (第一组点的实部+第三组点的实部)/ (1+a):k2是(第一组点的虚部+第三组点的虚部) / (1+0).
     3.求修改后的基波分量实部和虚部，实部=第一组点的实部-k1: 虚部= 第二组点的虚部-k2
-    :param vs: 瞬时值数组
-    :param sample_rate:
-    :return: 返回一个二维数组，一维是通道列表，二维是实部虚部元祖
+    :param vs: 瞬时值数组，一维是通道，二维是1.5个周波的瞬时值
+    :param sample_rate: 每周波采样点数，默认为瞬时值长度除以1.5
+    :return: 返回一个一维复数数组，每个元素为对应通道的相量
     """
-    dft = np.zeros(vs.shape[0], dtype=complex)
-    # 获取一个周波的瞬时值
-    for i in range(vs.shape[0]):
-        dft[i] = dft_exp_decay(vs[i], sample_rate)
-    return dft
+    if not isinstance(vs, np.ndarray) or vs.ndim != 2:
+        raise ValueError("输入的瞬时值数组vs必须是二维的numpy数组。")
+    if sample_rate is None:
+        sample_rate = int(vs.shape[1] / 1.5)
+    elif sample_rate <= 0:
+        raise ValueError("采样频率sample_rate必须是正整数。")
+    quarter, half = int(sample_rate / 4), int(sample_rate / 2)
+    # 三组数据窗分别与缓存的系数表做矩阵乘
+    kernel = dft_kernel(sample_rate, 1).T
+    parts = [vs[:, start:start + sample_rate] @ kernel for start in (0, quarter)] + [vs[:, half:] @ kernel]
+    dft1, dft2, dft3 = (part[:, 0] + 1j * part[:, 1] for part in parts)
+    if np.any(dft1.imag + dft2.real == 0):
+        raise ValueError("计算中遇到除以零的情况。")
+    return exp_decay_correct(dft1, dft2, dft3)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+整段录波的频率和频率变化率计算。
+
+采用相量相角差法：以额定频率的一个周波为数据窗逐点计算相量，实际频率f偏离额定频率时，
+相隔N个采样点的两个相量相角差Δφ=2π·f·N/samp，折算到(-π, π]后即可求出f，
+适用于|f-f0|<f0/2的情况。频率变化率为相隔一个周波的两个频率之差除以一个周波的时间。
+所有计算均不跨越采样段，无法计算的位置为NaN。
+"""
+import warnings
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from py3comtrade.computation.phasor import calc_phasors, comtrade_instants
+from py3comtrade.model.comtrade import Comtrade
+from py3comtrade.model.nrate import Nrate
+from py3comtrade.model.type import ElectricalUnit
+from py3comtrade.model.type.mode_enum import SampleMode
+
+
+class Frequency(BaseModel):
+    """
+    频率计算结果，各数组按采样点排列
+    """
+    channels: list[int] = Field(description="参与计算的模拟量通道在analogs中的位置")
+    channel_frequency: np.ndarray = Field(description="各通道频率，单位为Hz，形状为(通道数, 采样点数)")
+    frequency: np.ndarray = Field(description="系统频率，取幅值有效的各通道频率的中位数，单位为Hz")
+    rocof: np.ndarray = Field(description="系统频率变化率，单位为Hz/s")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+def _segment_cycle_point(nrate: Nrate) -> int:
+    """采样段每周波采样点数，取整后不足以计算相量时返回0"""
+    cycle_point = int(round(nrate.cycle_point))
+    return cycle_point if cycle_point > 2 and nrate.end_point - nrate.start_point > 2 * cycle_point else 0
+
+
+def phasor_frequency(phasors: np.ndarray, nrates: list[Nrate]) -> np.ndarray:
+    """
+    由逐点相量的相角差计算频率，第n点的频率取第n-N点和第n点的相量，N为每周波采样点数，
+    以FORWARD方式计算的相量，第n点频率对应的数据范围为[n-N, n+N)
+    :param phasors: 按额定频率逐点计算的基波相量，行为通道，列为采样点
+    :param nrates: 采样段列表
+    :return: 频率矩阵，单位为Hz，形状与phasors一致
+    """
+    phasors = np.asarray(phasors)
+    frequency = np.full(phasors.shape, np.nan)
+    for nrate in nrates:
+        cycle_point = _segment_cycle_point(nrate)
+        if cycle_point == 0:
+            continue
+        start, end = nrate.start_point, nrate.end_point
+        segment = phasors[..., start:end]
+        # 额定频率下相隔N点的相角差，采样率不是额定频率整数倍时不为2π的整数倍
+        nominal = 2 * np.pi * round(nrate.samp / nrate.cycle_point) * cycle_point / nrate.samp
+        delta = np.angle(segment[..., cycle_point:] * np.conj(segment[..., :-cycle_point]) * np.exp(-1j * nominal))
+        frequency[..., start + cycle_point:end] = (delta + nominal) * nrate.samp / (2 * np.pi * cycle_point)
+    return frequency
+
+
+def calc_rocof(frequency: np.ndarray, nrates: list[Nrate]) -> np.ndarray:
+    """
+    计算频率变化率，第n点取第n-N点和第n点频率之差除以一个周波的时间
+    :param frequency: 频率数组，最后一维为采样点
+    :param nrates: 采样段列表
+    :return: 频率变化率，单位为Hz/s，形状与frequency一致
+    """
+    frequency = np.asarray(frequency)
+    rocof = np.full(frequency.shape, np.nan)
+    for nrate in nrates:
+        cycle_point = _segment_cycle_point(nrate)
+        if cycle_point == 0:
+            continue
+        start, end = nrate.start_point, nrate.end_point
+        segment = frequency[..., start:end]
+        rocof[..., start + cycle_point:end] = (segment[..., cycle_point:] - segment[..., :-cycle_point]) * (
+                nrate.samp / cycle_point)
+    return rocof
+
+
+def system_frequency(frequency: np.ndarray, phasors: np.ndarray, min_amplitude_ratio: float = 0.2) -> np.ndarray:
+    """
+    综合多个通道的频率，各采样点取幅值不小于该点最大幅值min_amplitude_ratio倍的通道频率的中位数，
+    避免故障相电压跌落后相角噪声的影响
+    :param frequency: 各通道频率，形状为(通道数, 采样点数)
+    :param phasors: 各通道基波相量，形状与frequency一致
+    :param min_amplitude_ratio: 参与计算的通道幅值比例下限
+    :return: 系统频率，形状为(采样点数,)，全部通道无效的位置为NaN
+    """
+    amplitude = np.abs(phasors)
+    with np.errstate(invalid='ignore'):
+        valid = amplitude >= min_amplitude_ratio * np.nanmax(np.where(np.isnan(amplitude), -np.inf, amplitude),
+                                                             axis=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmedian(np.where(valid & (amplitude > 0), frequency, np.nan), axis=0)
+
+
+def voltage_channels(comtrade: Comtrade) -> list[int]:
+    """
+    获取电压模拟量通道在analogs中的位置，单位为V或kV的通道视为电压通道
+    :param comtrade: 录波对象
+    :return: 位置列表
+    """
+    return [i for i, analog in enumerate(comtrade.analogs) if analog.unit in (ElectricalUnit.V, ElectricalUnit.KV)]
+
+
+def comtrade_frequency(comtrade: Comtrade, channels: list[int] = None,
+                       min_amplitude_ratio: float = 0.2) -> Frequency:
+    """
+    计算录波电压通道的逐点频率和频率变化率，结果中的frequency可作为comtrade_phasors的frequency参数，
+    按实测频率调整数据窗长度
+    :param comtrade: 已读取dat文件的录波对象
+    :param channels: 参与计算的模拟量通道在analogs中的位置，默认为None取全部电压通道
+    :param min_amplitude_ratio: 计算系统频率时参与计算的通道幅值比例下限
+    :return: 频率计算结果
+    """
+    channels = voltage_channels(comtrade) if channels is None else list(channels)
+    if not channels:
+        raise ValueError("录波文件中没有可用于计算频率的电压通道")
+    instants = comtrade_instants(comtrade)[channels]
+    nrates = comtrade.sample.nrates
+    phasors = calc_phasors(instants, nrates, 1, SampleMode.FORWARD)
+    channel_frequency = phasor_frequency(phasors, nrates)
+    frequency = system_frequency(channel_frequency, phasors, min_amplitude_ratio)
+    return Frequency(channels=channels, channel_frequency=channel_frequency, frequency=frequency,
+                     rocof=calc_rocof(frequency, nrates))
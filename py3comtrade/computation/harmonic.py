@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+整段录波的逐周波谐波分析。
+
+各采样段内按不重叠的整周波数据窗切分，所有通道、所有周波一次做实数FFT，第k个频点即k次谐波，
+换算后的相量与fourier.dft_rx对同一数据窗的计算结果一致。数据窗不跨越采样段，
+每周波采样点数不足以计算的谐波为NaN，每周波不超过2个采样点的采样段不参与计算。
+"""
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from py3comtrade.computation.fourier import SQRT_2
+from py3comtrade.computation.phasor import comtrade_instants, cycle_points
+from py3comtrade.model.comtrade import Comtrade
+from py3comtrade.model.nrate import Nrate
+
+
+class HarmonicSpectrum(BaseModel):
+    """
+    逐周波谐波分析结果，通道顺序与输入瞬时值矩阵的行一致
+    """
+    harmonics: np.ndarray = Field(description="谐波次数，从1次开始")
+    points: np.ndarray = Field(description="各周波数据窗的起始采样点号")
+    magnitude: np.ndarray = Field(description="各次谐波有效值，形状为(通道数, 周波数, 谐波数)")
+    angle: np.ndarray = Field(description="各次谐波相角，单位为度，形状与magnitude一致")
+    thd: np.ndarray = Field(description="总谐波畸变率，单位为%，形状为(通道数, 周波数)，基波为0的位置为NaN")
+    phasors: Optional[np.ndarray] = Field(default=None, description="各次谐波相量，形状与magnitude一致")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+def cycle_spectrum(vs: np.ndarray, cycle_point: int, max_harmonic: int) -> np.ndarray:
+    """
+    对同一采样率的瞬时值矩阵按不重叠的整周波数据窗计算1~max_harmonic次谐波相量
+    :param vs: 瞬时值矩阵，行为通道，列为采样点
+    :param cycle_point: 每周波采样点数
+    :param max_harmonic: 最高谐波次数
+    :return: 谐波相量，形状为(通道数, 周波数, max_harmonic)，次数不低于每周波采样点数一半的谐波为NaN
+    """
+    vs = np.asarray(vs, dtype=np.float64)
+    cycle_num = vs.shape[-1] // cycle_point
+    blocks = vs[..., :cycle_num * cycle_point].reshape(vs.shape[:-1] + (cycle_num, cycle_point))
+    # rfft第k个频点为Σv·cosθ-jΣv·sinθ，乘以j即为dft_rx的Σv·sinθ+jΣv·cosθ
+    spectrum = np.fft.rfft(blocks, axis=-1)
+    valid = min(max_harmonic, (cycle_point - 1) // 2)
+    phasors = np.full(blocks.shape[:-1] + (max_harmonic,), np.nan, dtype=complex)
+    phasors[..., :valid] = 1j * spectrum[..., 1:valid + 1] / (cycle_point // 2 * SQRT_2)
+    return phasors
+
+
+def total_harmonic_distortion(phasors: np.ndarray) -> np.ndarray:
+    """
+    计算总谐波畸变率THD=sqrt(Σ|Uk|²)/|U1|×100%，k从2次起，NaN的谐波不计入
+    :param phasors: 谐波相量，最后一维为从1次开始的各次谐波
+    :return: 总谐波畸变率，单位为%，基波为0或NaN的位置为NaN
+    """
+    magnitude = np.abs(phasors)
+    fundamental = magnitude[..., 0]
+    distortion = np.sqrt(np.nansum(magnitude[..., 1:] ** 2, axis=-1))
+    thd = np.full(fundamental.shape, np.nan)
+    with np.errstate(invalid='ignore'):
+        np.divide(distortion * 100, fundamental, out=thd, where=fundamental > 0)
+    return thd
+
+
+def calc_harmonics(instants: np.ndarray, nrates: list[Nrate], max_harmonic: int = 13,
+                   keep_phasors: bool = False) -> HarmonicSpectrum:
+    """
+    按采样段对整段录波逐周波计算各次谐波的有效值、相角和总谐波畸变率
+    :param instants: 瞬时值矩阵，行为通道，列为采样点
+    :param nrates: 采样段列表
+    :param max_harmonic: 最高谐波次数，默认为13次
+    :param keep_phasors: 是否在结果中保留谐波相量
+    :return: 谐波分析结果，周波按采样点号排列
+    """
+    if max_harmonic < 1:
+        raise ValueError(f"最高谐波次数{max_harmonic}应不小于1")
+    instants = np.asarray(instants)
+    segments = []
+    for nrate in nrates:
+        cycle_point = int(round(nrate.cycle_point))
+        if cycle_point <= 2 or nrate.end_point - nrate.start_point < cycle_point:
+            continue
+        segments.append(cycle_spectrum(instants[..., nrate.start_point:nrate.end_point], cycle_point, max_harmonic))
+    if segments:
+        phasors = np.concatenate(segments, axis=-2)
+    else:
+        phasors = np.empty(instants.shape[:-1] + (0, max_harmonic), dtype=complex)
+    return HarmonicSpectrum(harmonics=np.arange(1, max_harmonic + 1),
+                            points=cycle_points(nrates),
+                            magnitude=np.abs(phasors),
+                            angle=np.angle(phasors, deg=True),
+                            thd=total_harmonic_distortion(phasors),
+                            phasors=phasors if keep_phasors else None)
+
+
+def comtrade_harmonics(comtrade: Comtrade, max_harmonic: int = 13, output_primary: bool = False,
+                       keep_phasors: bool = False) -> HarmonicSpectrum:
+    """
+    计算录波全部模拟量通道的逐周波谐波
+    :param comtrade: 已读取dat文件的录波对象
+    :param max_harmonic: 最高谐波次数，默认为13次
+    :param output_primary: 输出值是否是一次值
+    :param keep_phasors: 是否在结果中保留谐波相量
+    :return: 谐波分析结果，通道顺序与analogs一致
+    """
+    return calc_harmonics(comtrade_instants(comtrade, output_primary), comtrade.sample.nrates, max_harmonic,
+                          keep_phasors)
@@ -7,9 +7,17 @@
 # @Author  : 张松贵
 # @File    : impedance.py
 # @IDE     : PyCharm
-
 import numpy as np
 
+from py3comtrade.computation.phasor import analog_positions, combine_currents, comtrade_phasors, current_rows, \
+    voltage_rows
+from py3comtrade.model.comtrade import Comtrade
+from py3comtrade.model.line import Line
+from py3comtrade.model.type.mode_enum import SampleMode
+
+# 测量回路顺序，前三个为相间回路，后三个为接地回路
+LOOPS = ("AB", "BC", "CA", "AG", "BG", "CG")
+
 
 def compute_line_impedance(this_before_v_xfl: list, this_before_i_xfl: list,
                            this_after_v_xfl: list, this_after_i_xfl: list,
@@ -50,3 +58,87 @@ def compute_impedance(this_u, other_u, i):
     if i != 0:
         _impedance = (this_u - other_u) / i
     return np.around(_impedance, 3)
+
+
+def zero_sequence_factor(line: Line) -> complex:
+    """
+    根据线路正序、零序阻抗计算零序补偿系数k0=(Z0-Z1)/(3Z1)
+    :param line: 线路对象
+    :return: 零序补偿系数，线路未配置正序阻抗时为0
+    """
+    z1 = complex(line.rx.r1, line.rx.x1)
+    z0 = complex(line.rx.r0, line.rx.x0)
+    return (z0 - z1) / (3 * z1) if z1 != 0 else 0j
+
+
+def loop_quantities(u: np.ndarray, i: np.ndarray, k0=0j, km=0j, im: np.ndarray = None) -> tuple:
+    """
+    计算相间和接地测量回路的电压和电流，相间回路为Uφ1-Uφ2、Iφ1-Iφ2，接地回路为Uφ、Iφ+k0·3I0+km·3I0m
+    :param u: A、B、C三相电压相量，形状为(3, 采样点数)，或多组时为(组数, 3, 采样点数)
+    :param i: A、B、C三相电流相量，形状与u一致
+    :param k0: 零序补偿系数，多组时可为每组一个的数组
+    :param km: 互感补偿系数Zm0/(3Z1)，多组时可为每组一个的数组
+    :param im: 互感线路的三相电流相量，形状与i一致，默认为None不做互感补偿
+    :return: 回路电压和回路电流组成的元组，倒数第二维按LOOPS依次为AB、BC、CA、AG、BG、CG
+    """
+    u = np.asarray(u, dtype=complex)
+    i = np.asarray(i, dtype=complex)
+    k0 = np.asarray(k0, dtype=complex)[..., None, None]
+    next_phase = [1, 2, 0]
+    ground_currents = i + k0 * i.sum(axis=-2, keepdims=True)
+    if im is not None:
+        km = np.asarray(km, dtype=complex)[..., None, None]
+        ground_currents = ground_currents + km * np.asarray(im, dtype=complex).sum(axis=-2, keepdims=True)
+    voltages = np.concatenate((u - u[..., next_phase, :], u), axis=-2)
+    currents = np.concatenate((i - i[..., next_phase, :], ground_currents), axis=-2)
+    return voltages, currents
+
+
+def loop_impedances(u: np.ndarray, i: np.ndarray, k0=0j) -> np.ndarray:
+    """
+    计算相间和接地测量回路阻抗，相间回路Z=(Uφ1-Uφ2)/(Iφ1-Iφ2)，接地回路Z=Uφ/(Iφ+k0·3I0)
+    :param u: A、B、C三相电压相量，形状为(3, 采样点数)，或多组时为(组数, 3, 采样点数)
+    :param i: A、B、C三相电流相量，形状与u一致
+    :param k0: 零序补偿系数，多组时可为每组一个的数组
+    :return: 回路阻抗，倒数第二维按LOOPS依次为AB、BC、CA、AG、BG、CG，电流为0的位置为NaN
+    """
+    voltages, currents = loop_quantities(u, i, k0)
+    impedances = np.full(np.broadcast_shapes(voltages.shape, currents.shape), np.nan, dtype=complex)
+    with np.errstate(invalid='ignore'):
+        np.divide(voltages, currents, out=impedances, where=currents != 0)
+    return impedances
+
+
+def line_loop_impedances(comtrade: Comtrade, phasors: np.ndarray = None, output_primary: bool = False,
+                         mode: SampleMode = SampleMode.FORWARD) -> dict[str, np.ndarray]:
+    """
+    计算dmf文件中每条线路在每个采样点的测量回路阻抗。
+    电压取线路所接母线的三相电压通道，电流取线路各电流分支按电流方向的合成电流，k0由线路正序、零序阻抗计算。
+    :param comtrade: 已读取dat和dmf文件的录波对象
+    :param phasors: 全部模拟量通道的相量矩阵，默认为None，按comtrade_phasors计算基波相量
+    :param output_primary: 计算相量时是否使用一次值，phasors不为None时忽略
+    :param mode: 计算相量时采样点在数据窗中的位置，phasors不为None时忽略
+    :return: 以线路名称为键的回路阻抗字典，值的形状为(6, 采样点数)，行依次为LOOPS中的回路，无法确定通道的线路不包含在内
+    """
+    if comtrade.dmf is None:
+        raise ValueError("录波文件未读取dmf文件，无法确定线路的电压和电流通道")
+    positions = analog_positions(comtrade)
+    names, u_rows, i_rows, k0s = [], [], [], []
+    for line in comtrade.dmf.lines:
+        bus = comtrade.dmf.find_bus_by_idx(line.bus_idx)
+        u_row = voltage_rows(positions, bus.acv_chn) if bus is not None else None
+        i_row = current_rows(positions, line.acc_bran)
+        if u_row is None or i_row is None:
+            continue
+        names.append(line.name)
+        u_rows.append(u_row)
+        i_rows.append(i_row)
+        k0s.append(zero_sequence_factor(line))
+    if not names:
+        return {}
+    if phasors is None:
+        phasors = comtrade_phasors(comtrade, 1, mode, output_primary)
+    u = phasors[np.array(u_rows)]
+    i = np.stack([combine_currents(phasors, branch_rows) for branch_rows in i_rows])
+    impedances = loop_impedances(u, i, np.array(k0s))
+    return {name: impedances[n] for n, name in enumerate(names)}
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+"""
+整段录波的滑动窗口相量计算。
+
+对每个采样点取一个周波的数据窗做傅里叶计算，结果与fourier.dft_rx对同一数据窗的计算结果一致。
+通过对x(n)·e^(-jωn)求前缀和，任一数据窗的傅里叶和为两个前缀和之差，全部通道、全部采样点一次计算完成，
+计算量与每周波采样点数无关。数据窗不跨越采样段，无法取满一个周波的位置为NaN。
+"""
+from typing import Union
+
+import numpy as np
+
+from py3comtrade.computation.fourier import SQRT_2, exp_decay_correct
+from py3comtrade.model.comtrade import Comtrade
+from py3comtrade.model.nrate import Nrate
+from py3comtrade.model.primary_equipments import ACCBranch, ACVBranch
+from py3comtrade.model.type import CtDirection
+from py3comtrade.model.type.mode_enum import SampleMode
+from py3comtrade.model.type.types import ChannelType
+
+
+def window_offset(window_point: int, mode: SampleMode = SampleMode.FORWARD) -> int:
+    """
+    采样点相对其数据窗起点的偏移，与Configure.get_cursor_cycle_sample_range的取值方式一致
+    :param window_point: 数据窗采样点数
+    :param mode: 取值模式，FORWARD以该点为数据窗起点，BACKWARD以该点为数据窗终点，CENTERED以该点为数据窗中心
+    :return: 偏移的采样点数
+    """
+    if mode == SampleMode.BACKWARD:
+        return window_point - 1
+    if mode == SampleMode.CENTERED:
+        return (window_point - 1) // 2
+    return 0
+
+
+def sliding_dft(vs: np.ndarray, cycle_point: int, k: int = 1) -> np.ndarray:
+    """
+    对瞬时值矩阵逐点滑动一个周波的数据窗计算相量
+    :param vs: 瞬时值矩阵，行为通道，列为采样点，各采样点采样率相同
+    :param cycle_point: 每周波采样点数，即数据窗长度
+    :param k: 谐波次数，1为基波
+    :return: 相量矩阵，形状为(通道数, 采样点数-数据窗长度+1)，第j列为以第j点为起点的数据窗的相量
+    """
+    if cycle_point <= 2 * k:
+        raise ValueError(f"每周波采样点数{cycle_point}不足以计算{k}次谐波")
+    vs = np.asarray(vs, dtype=np.float64)
+    count = vs.shape[-1]
+    if count < cycle_point:
+        return np.empty(vs.shape[:-1] + (0,), dtype=complex)
+    # θ(n)以数据窗长度为周期，取余后计算避免长录波中相位精度下降。数据窗长度为偶数时与dft_rx的θ=ikπ/m相同，
+    # 按实测频率调整后的数据窗长度可能为奇数，此时dft_rx取m=N//2不再是整周期，这里仍按2π/N计算
+    theta = (np.arange(count) % cycle_point) * (2 * k * np.pi / cycle_point)
+    prefix = np.zeros(vs.shape[:-1] + (count + 1,), dtype=complex)
+    np.cumsum(vs * np.exp(-1j * theta), axis=-1, out=prefix[..., 1:])
+    windows = prefix[..., cycle_point:] - prefix[..., :-cycle_point]
+    # 将各数据窗的相位参考点移回数据窗起点，与dft_rx一致
+    windows *= np.exp(1j * theta[:count - cycle_point + 1])
+    return windows * (2j / (cycle_point * SQRT_2))
+
+
+def sliding_dft_exp_decay(vs: np.ndarray, cycle_point: int) -> np.ndarray:
+    """
+    对瞬时值矩阵逐点滑动1.5个周波的数据窗，计算消除衰减直流分量后的基波相量，
+    各数据窗结果与fourier.dft_exp_decay一致，三组点的傅里叶结果直接取自同一组滑动相量
+    :param vs: 瞬时值矩阵，行为通道，列为采样点，各采样点采样率相同
+    :param cycle_point: 每周波采样点数
+    :return: 相量矩阵，形状为(通道数, 采样点数-数据窗长度+1)，数据窗长度为cycle_point+cycle_point//2，
+             第j列为以第j点为起点的数据窗的相量，分母为0的数据窗为NaN
+    """
+    phasors = sliding_dft(vs, cycle_point, 1)
+    quarter, half = cycle_point // 4, cycle_point // 2
+    count = phasors.shape[-1] - half
+    if count <= 0:
+        return np.empty(phasors.shape[:-1] + (0,), dtype=complex)
+    return exp_decay_correct(phasors[..., :count],
+                             phasors[..., quarter:quarter + count],
+                             phasors[..., half:half + count])
+
+
+def calc_phasors(instants: np.ndarray, nrates: list[Nrate], harmonic: Union[int, list[int]] = 1,
+                 mode: SampleMode = SampleMode.FORWARD, frequency: Union[float, np.ndarray] = None) -> np.ndarray:
+    """
+    按采样段计算每个采样点的相量，数据窗不跨越采样段
+    :param instants: 瞬时值矩阵，行为通道，列为采样点
+    :param nrates: 采样段列表，各采样段的数据窗长度取每周波采样点数
+    :param harmonic: 谐波次数或谐波次数列表，1为基波
+    :param mode: 采样点在数据窗中的位置，默认为FORWARD，以该点为数据窗起点
+    :param frequency: 实测电网频率，可为一个值或每个采样点一个值的数组，默认为None使用额定频率。
+                      给定时各采样点的数据窗长度取采样率除以该点频率后取整，频率为NaN的采样点使用额定频率
+    :return: 相量矩阵，形状为(通道数, 采样点数)；harmonic为列表时为(谐波数, 通道数, 采样点数)。
+             数据窗超出采样段或每周波采样点数不足的位置为NaN
+    """
+    instants = np.asarray(instants)
+    harmonics = [harmonic] if isinstance(harmonic, int) else list(harmonic)
+    phasors = np.full((len(harmonics),) + instants.shape, np.nan, dtype=complex)
+    for nrate in nrates:
+        start, end = nrate.start_point, nrate.end_point
+        window_points = segment_window_points(nrate, frequency)
+        for cycle_point in np.unique(window_points):
+            offset = window_offset(cycle_point, mode)
+            points = None
+            if window_points.size > 1:
+                # 数据窗长度随频率变化时，只填充该长度对应的采样点，数据窗需落在采样段内
+                points = start + np.flatnonzero(window_points == cycle_point)
+                columns = points - offset - start
+                valid = (columns >= 0) & (columns <= end - start - cycle_point)
+                points, columns = points[valid], columns[valid]
+            for i, k in enumerate(harmonics):
+                if cycle_point <= 2 * k or end - start < cycle_point:
+                    continue
+                segment = sliding_dft(instants[..., start:end], int(cycle_point), k)
+                if points is None:
+                    phasors[i, ..., start + offset:start + offset + segment.shape[-1]] = segment
+                else:
+                    phasors[i, ..., points] = np.moveaxis(segment[..., columns], -1, 0)
+    return phasors[0] if isinstance(harmonic, int) else phasors
+
+
+def segment_window_points(nrate: Nrate, frequency: Union[float, np.ndarray] = None) -> np.ndarray:
+    """
+    获取采样段内各采样点的数据窗长度
+    :param nrate: 采样段
+    :param frequency: 实测电网频率，可为一个值或每个采样点一个值的数组，默认为None使用额定频率
+    :return: 数据窗长度数组，整段数据窗长度相同时只含一个元素，否则每个采样点一个元素
+    """
+    cycle_point = int(round(nrate.cycle_point))
+    if frequency is None:
+        return np.array([cycle_point])
+    frequency = np.atleast_1d(np.asarray(frequency, dtype=np.float64))
+    if frequency.size > 1:
+        frequency = frequency[nrate.start_point:nrate.end_point]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        window_points = np.rint(nrate.samp / frequency)
+    window_points = np.where(np.isfinite(window_points) & (window_points > 0), window_points, cycle_point).astype(int)
+    return window_points[:1] if np.all(window_points == window_points[0]) else window_points
+
+
+def comtrade_instants(comtrade: Comtrade, output_primary: bool = False) -> np.ndarray:
+    """
+    获取录波全部模拟量通道的瞬时值矩阵，使用Comtrade缓存的换算结果
+    :param comtrade: 已读取dat文件的录波对象
+    :param output_primary: 输出值是否是一次值
+    :return: 只读的瞬时值矩阵，形状为(模拟量通道数, 采样点数)
+    """
+    return comtrade.get_analog_instant_matrix(output_primary)
+
+
+def comtrade_phasors(comtrade: Comtrade, harmonic: Union[int, list[int]] = 1,
+                     mode: SampleMode = SampleMode.FORWARD, output_primary: bool = False,
+                     frequency: Union[float, np.ndarray] = None) -> np.ndarray:
+    """
+    计算录波全部模拟量通道在每个采样点的相量
+    :param comtrade: 已读取dat文件的录波对象
+    :param harmonic: 谐波次数或谐波次数列表，1为基波
+    :param mode: 采样点在数据窗中的位置，默认为FORWARD，以该点为数据窗起点
+    :param output_primary: 输出值是否是一次值
+    :param frequency: 实测电网频率，用于按频率调整数据窗长度，默认为None使用额定频率，见calc_phasors
+    :return: 相量矩阵，形状为(模拟量通道数, 采样点数)；harmonic为列表时为(谐波数, 模拟量通道数, 采样点数)
+    """
+    return calc_phasors(comtrade_instants(comtrade, output_primary), comtrade.sample.nrates, harmonic, mode,
+                        frequency)
+
+
+def cycle_points(nrates: list[Nrate], mode: SampleMode = SampleMode.FORWARD) -> np.ndarray:
+    """
+    获取各采样段内逐周波不重叠数据窗对应的采样点号，数据窗不跨越采样段
+    :param nrates: 采样段列表
+    :param mode: 采样点在数据窗中的位置，默认为FORWARD，返回数据窗的起始采样点号，与calc_phasors的mode一致
+    :return: 采样点号数组
+    """
+    points = []
+    for nrate in nrates:
+        cycle_point = int(round(nrate.cycle_point))
+        if cycle_point <= 2:
+            continue
+        points.append(np.arange(nrate.start_point, nrate.end_point - cycle_point + 1, cycle_point) +
+                      window_offset(cycle_point, mode))
+    return np.concatenate(points) if points else np.empty(0, dtype=int)
+
+
+def calc_phasors_exp_decay(instants: np.ndarray, nrates: list[Nrate],
+                           mode: SampleMode = SampleMode.FORWARD) -> np.ndarray:
+    """
+    按采样段计算每个采样点消除衰减直流分量后的基波相量，数据窗为1.5个周波且不跨越采样段
+    :param instants: 瞬时值矩阵，行为通道，列为采样点
+    :param nrates: 采样段列表
+    :param mode: 采样点在数据窗中的位置，默认为FORWARD，以该点为数据窗起点
+    :return: 相量矩阵，形状为(通道数, 采样点数)，数据窗超出采样段或每周波采样点数不足的位置为NaN
+    """
+    instants = np.asarray(instants)
+    phasors = np.full(instants.shape, np.nan, dtype=complex)
+    for nrate in nrates:
+        cycle_point = int(round(nrate.cycle_point))
+        start, end = nrate.start_point, nrate.end_point
+        window_point = cycle_point + cycle_point // 2
+        if cycle_point <= 2 or end - start < window_point:
+            continue
+        offset = window_offset(window_point, mode)
+        segment = sliding_dft_exp_decay(instants[..., start:end], cycle_point)
+        phasors[..., start + offset:start + offset + segment.shape[-1]] = segment
+    return phasors
+
+
+def analog_positions(comtrade: Comtrade) -> dict[int, int]:
+    """
+    获取模拟量通道cfg索引号与其在analogs中位置的对应关系，用于将dmf中的通道索引号转换为相量矩阵的行号
+    :param comtrade: 录波对象
+    :return: 以cfg通道索引号为键，analogs中位置为值的字典，为录波对象通道查找索引中的字典，不应修改
+    """
+    return comtrade.get_channel_lookup(ChannelType.ANALOG).by_idx_cfg
+
+
+def voltage_rows(positions: dict[int, int], branch: ACVBranch) -> list[int]:
+    """
+    获取三相电压通道在相量矩阵中的行号
+    :param positions: 模拟量通道cfg索引号与analogs中位置的对应关系
+    :param branch: 交流电压通道
+    :return: A、B、C三相行号，通道未配置或不存在时返回None
+    """
+    idx_cfgs = (branch.ua_idx, branch.ub_idx, branch.uc_idx)
+    if not all(idx in positions for idx in idx_cfgs):
+        return None
+    return [positions[idx] for idx in idx_cfgs]
+
+
+def current_rows(positions: dict[int, int], branches: list[ACCBranch]) -> list[tuple[list[int], int]]:
+    """
+    获取各电流分支三相电流通道在相量矩阵中的行号及其电流方向
+    :param positions: 模拟量通道cfg索引号与analogs中位置的对应关系
+    :param branches: 交流电流分支列表
+    :return: 每个分支的(A、B、C三相行号, 方向系数1或-1)列表，任一分支通道未配置或不存在时返回None
+    """
+    rows = []
+    for branch in branches:
+        idx_cfgs = (branch.ia_idx, branch.ib_idx, branch.ic_idx)
+        if not all(idx in positions for idx in idx_cfgs):
+            return None
+        rows.append(([positions[idx] for idx in idx_cfgs], -1 if branch.dir == CtDirection.NEG else 1))
+    return rows or None
+
+
+def combine_currents(phasors: np.ndarray, branch_rows: list[tuple[list[int], int]]) -> np.ndarray:
+    """
+    按电流方向合成各电流分支的三相电流相量
+    :param phasors: 全部模拟量通道的相量矩阵
+    :param branch_rows: current_rows返回的各分支行号及方向系数
+    :return: 合成的三相电流相量，形状为(3, 采样点数)
+    """
+    return sum(sign * phasors[rows] for rows, sign in branch_rows)
@@ -10,8 +10,87 @@
 #  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
+from typing import Optional
 
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 
-class Power:
-    def __init__(self):
-        pass
+from py3comtrade.computation.phasor import analog_positions, combine_currents, comtrade_phasors, current_rows, \
+    cycle_points, voltage_rows
+from py3comtrade.model.comtrade import Comtrade
+from py3comtrade.model.type.mode_enum import SampleMode
+
+
+class Power(BaseModel):
+    """
+    设备三相功率计算结果，各数组按采样点排列
+    """
+    name: str = Field(description="设备名称，线路为线路名称，变压器为变压器名称加绕组位置")
+    p: np.ndarray = Field(description="三相有功功率")
+    q: np.ndarray = Field(description="三相无功功率")
+    s: np.ndarray = Field(description="三相视在功率")
+    pf: np.ndarray = Field(description="功率因数，视在功率为0的位置为NaN")
+    points: Optional[np.ndarray] = Field(default=None, description="各结果对应的采样点号，为None时表示逐采样点结果")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+def three_phase_power(u: np.ndarray, i: np.ndarray) -> np.ndarray:
+    """
+    由三相电压、电流相量计算三相复功率S=ΣU·I*，相量为有效值相量
+    :param u: A、B、C三相电压相量，形状为(3, 采样点数)，或多台设备时为(设备数, 3, 采样点数)
+    :param i: A、B、C三相电流相量，形状与u一致
+    :return: 三相复功率，实部为有功功率，虚部为无功功率
+    """
+    return (np.asarray(u) * np.conj(i)).sum(axis=-2)
+
+
+def comtrade_powers(comtrade: Comtrade, phasors: np.ndarray = None, per_cycle: bool = False,
+                    output_primary: bool = False, mode: SampleMode = SampleMode.FORWARD) -> dict[str, Power]:
+    """
+    计算dmf文件中全部线路和变压器绕组的三相功率，全部设备一次计算，复用同一组相量结果。
+    线路电压取所接母线的电压通道，变压器绕组取绕组的电压通道，电流为各电流分支按电流方向的合成电流。
+    :param comtrade: 已读取dat和dmf文件的录波对象
+    :param phasors: 全部模拟量通道的基波相量矩阵，默认为None，按comtrade_phasors以mode方式计算
+    :param per_cycle: 为True时只输出各采样段内逐周波不重叠数据窗的结果，为False时输出逐采样点的滑动窗口结果
+    :param output_primary: 计算相量时是否使用一次值，phasors不为None时忽略
+    :param mode: 采样点在数据窗中的位置，须与phasors的计算方式一致，per_cycle为True时据此确定各数据窗对应的采样点
+    :return: 以设备名称为键的功率结果字典，无法确定通道的设备不包含在内
+    """
+    if comtrade.dmf is None:
+        raise ValueError("录波文件未读取dmf文件，无法确定设备的电压和电流通道")
+    positions = analog_positions(comtrade)
+    equipments = []
+    for line in comtrade.dmf.lines:
+        bus = comtrade.dmf.find_bus_by_idx(line.bus_idx)
+        equipments.append((line.name, bus.acv_chn if bus is not None else None, line.acc_bran))
+    for transformer in comtrade.dmf.transformers:
+        for winding in transformer.transWinds:
+            equipments.append((f"{transformer.name}{winding.location.get_description()}", winding.acv_chn,
+                               winding.acc_bran))
+    names, u_rows, i_rows = [], [], []
+    for name, acv_branch, acc_branches in equipments:
+        u_row = voltage_rows(positions, acv_branch) if acv_branch is not None else None
+        i_row = current_rows(positions, acc_branches)
+        if u_row is None or i_row is None:
+            continue
+        names.append(name)
+        u_rows.append(u_row)
+        i_rows.append(i_row)
+    if not names:
+        return {}
+    if phasors is None:
+        phasors = comtrade_phasors(comtrade, 1, mode, output_primary)
+    points = None
+    if per_cycle:
+        points = cycle_points(comtrade.sample.nrates, mode)
+        phasors = phasors[:, points]
+    u = phasors[np.array(u_rows)]
+    i = np.stack([combine_currents(phasors, branch_rows) for branch_rows in i_rows])
+    complex_power = three_phase_power(u, i)
+    apparent = np.abs(complex_power)
+    pf = np.full(apparent.shape, np.nan)
+    np.divide(complex_power.real, apparent, out=pf, where=apparent > 0)
+    return {name: Power(name=name, p=complex_power.real[n], q=complex_power.imag[n], s=apparent[n], pf=pf[n],
+                        points=points)
+            for n, name in enumerate(names)}
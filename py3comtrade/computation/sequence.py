@@ -1,14 +1,31 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-
+import os
 
 import numpy as np
-from pydantic import BaseModel,Field
+from pydantic import BaseModel, Field
+
+from py3comtrade.computation.fourier import SQRT_2
+from py3comtrade.computation.phasor import analog_positions, comtrade_phasors
+from py3comtrade.model.comtrade import Comtrade
+from py3comtrade.model.type import GroupMode, PhaseCode
+from py3comtrade.model.type.mode_enum import SampleMode
+
+A = complex(-0.5, np.sqrt(3.0) / 2.0)
+# 转换矩阵，行依次为零序、正序、负序
+SEQUENCE_MATRIX = np.array([[1, 1, 1], [1, A, A * A], [1, A * A, A]]) / 3
+
 
 class Sequence(BaseModel):
-    positive:  float = Field(default=0.000, description="正序分量")
-    negative: float = Field(default=0.000, description="负序分量")
-    zero: float = Field(default=0.000, description="零序分量")
+    positive: complex = Field(default=0j, description="正序分量")
+    negative: complex = Field(default=0j, description="负序分量")
+    zero: complex = Field(default=0j, description="零序分量")
+
+
+class PhaseGroup(BaseModel):
+    name: str = Field(description="三相通道组名称")
+    indices: list[int] = Field(description="A、B、C三相模拟量通道在analogs中的位置")
+
 
 def phasor_to_sequence_by_rotate(pa: complex, pb: complex, pc: complex):
     """
@@ -16,7 +33,7 @@ def phasor_to_sequence_by_rotate(pa: complex, pb: complex, pc: complex):
     :param pa: A相相量值
     :param pb: B相相量值
     :param pc: C相相量值
-    :return: 返回该组通道的序分量值,索引0为零序分量，1为正序分量，2为负序分量
+    :return: 返回该组通道的序分量值
     """
     # 参数校验
     if not all(isinstance(arg, complex) for arg in [pa, pb, pc]):
@@ -27,17 +44,121 @@ def phasor_to_sequence_by_rotate(pa: complex, pb: complex, pc: complex):
     zero = (pa + pb + pc) / 3 / np.sqrt(2.0)
     return Sequence(positive=positive, negative=negative, zero=zero)
 
+
 def phasor_to_sequence_by_matrix(phasor_arr: np.ndarray):
     """
     将相量值转化为序分量，使用numpy矩阵
-    :param phasor_arr:
-    :return: 返回该组通道的序分量值,索引0为零序分量，1为正序分量，2为负序分量
-    """
-    if not all(isinstance(p, complex) for p in phasor_arr):
-        raise ValueError("参数类型输入错误")
-    a = complex(-0.5, np.sqrt(3.0) / 2.0)
-    # 转换矩阵，零序、正序、负序
-    trans_arr = np.array([[1, 1, 1], [1, a, a * a], [1, a * a, a]])
-    order_arr = np.dot(trans_arr, phasor_arr) / 3
-    order_arr = order_arr / np.sqrt(2.0)
-    return Sequence(positive=order_arr[0], negative=order_arr[1], zero=order_arr[2])
+    :param phasor_arr: A、B、C三相相量值
+    :return: 返回该组通道的序分量值
+    """
+    phasor_arr = np.asarray(phasor_arr, dtype=complex)
+    if phasor_arr.shape != (3,):
+        raise ValueError("参数类型输入错误，需要A、B、C三相相量值")
+    zero, positive, negative = SEQUENCE_MATRIX @ phasor_arr / SQRT_2
+    return Sequence(positive=positive, negative=negative, zero=zero)
+
+
+def phasor_to_sequence_series(phasors: np.ndarray) -> np.ndarray:
+    """
+    将三相相量序列一次矩阵乘转换为序分量序列。
+    输入为comtrade_phasors计算的有效值相量，序分量同为有效值，不再像phasor_to_sequence_by_matrix那样除以√2
+    :param phasors: 三相有效值相量数组，形状为(3, 采样点数)，或多组三相时为(组数, 3, 采样点数)
+    :return: 序分量有效值数组，形状与输入一致，倒数第二维索引0为零序分量，1为正序分量，2为负序分量
+    """
+    phasors = np.asarray(phasors, dtype=complex)
+    if phasors.ndim < 2 or phasors.shape[-2] != 3:
+        raise ValueError(f"相量数组形状应为(3, 采样点数)，实际为{phasors.shape}")
+    return SEQUENCE_MATRIX @ phasors
+
+
+def _ccbm_phase_groups(comtrade: Comtrade) -> list[PhaseGroup]:
+    """按被监视元件、单位和相别，将依次出现的A、B、C相模拟量通道组成三相通道组"""
+    phase_names = {PhaseCode.A_PHASE: 0, PhaseCode.B_PHASE: 1, PhaseCode.C_PHASE: 2}
+    pending: dict[tuple, list] = {}
+    groups = []
+    for i, analog in enumerate(comtrade.analogs):
+        phase = phase_names.get(analog.phase)
+        if phase is None:
+            continue
+        key = (analog.ccbm, analog.unit)
+        indices = pending.setdefault(key, [None, None, None])
+        if indices[phase] is not None:
+            indices = pending[key] = [None, None, None]
+        indices[phase] = i
+        if None not in indices:
+            groups.append((key, indices))
+            del pending[key]
+    ccbm_count = {}
+    for key, _ in groups:
+        ccbm_count[key[0]] = ccbm_count.get(key[0], 0) + 1
+    phase_groups = []
+    for (ccbm, _), indices in groups:
+        name = ccbm
+        if not ccbm or ccbm_count[ccbm] > 1:
+            # 被监视元件不能区分通道组时，使用三相通道名称的公共部分
+            name = os.path.commonprefix([comtrade.analogs[i].name for i in indices]).rstrip(" _") or ccbm
+        phase_groups.append(PhaseGroup(name=name, indices=indices))
+    return phase_groups
+
+
+def _dmf_phase_groups(comtrade: Comtrade) -> list[PhaseGroup]:
+    """按dmf文件中母线的电压通道和线路的各电流分支组成三相通道组"""
+    if comtrade.dmf is None:
+        raise ValueError("录波文件未读取dmf文件，无法按dmf分组")
+    positions = analog_positions(comtrade)
+    groups = []
+    for bus in comtrade.dmf.buses:
+        branch = bus.acv_chn
+        groups.append((bus.name, (branch.ua_idx, branch.ub_idx, branch.uc_idx)))
+    for line in comtrade.dmf.lines:
+        for branch in line.acc_bran:
+            name = line.name if len(line.acc_bran) == 1 else f"{line.name}_{branch.idx}"
+            groups.append((name, (branch.ia_idx, branch.ib_idx, branch.ic_idx)))
+    return [PhaseGroup(name=name, indices=[positions[idx] for idx in idx_cfgs])
+            for name, idx_cfgs in groups if all(idx in positions for idx in idx_cfgs)]
+
+
+def _unique_group_names(groups: list[PhaseGroup]) -> list[PhaseGroup]:
+    """同名的通道组依次在名称后加_2、_3等序号，第一个保持原名，使名称可作为唯一的键"""
+    used = {group.name for group in groups}
+    seen = set()
+    for group in groups:
+        if group.name in seen:
+            number = 2
+            while f"{group.name}_{number}" in used:
+                number += 1
+            group.name = f"{group.name}_{number}"
+            used.add(group.name)
+        seen.add(group.name)
+    return groups
+
+
+def phase_groups(comtrade: Comtrade, group_mode: GroupMode = GroupMode.CCBM) -> list[PhaseGroup]:
+    """
+    获取录波中的三相模拟量通道组
+    :param comtrade: 录波对象
+    :param group_mode: 分组方式，CCBM按通道的被监视元件和相别分组，DMF按dmf文件中母线和线路的通道分组
+    :return: 三相通道组列表，名称重复时后出现的通道组名称加_2、_3等序号
+    """
+    if group_mode == GroupMode.DMF:
+        return _unique_group_names(_dmf_phase_groups(comtrade))
+    return _unique_group_names(_ccbm_phase_groups(comtrade))
+
+
+def comtrade_sequences(comtrade: Comtrade, group_mode: GroupMode = GroupMode.CCBM, phasors: np.ndarray = None,
+                       mode: SampleMode = SampleMode.FORWARD) -> dict[str, np.ndarray]:
+    """
+    计算录波中全部三相通道组在每个采样点的序分量
+    :param comtrade: 已读取dat文件的录波对象
+    :param group_mode: 三相通道分组方式
+    :param phasors: 全部模拟量通道的相量矩阵，默认为None，按comtrade_phasors计算基波相量
+    :param mode: 计算相量时采样点在数据窗中的位置
+    :return: 以通道组名称为键的序分量字典，名称唯一(见phase_groups)，值的形状为(3, 采样点数)，索引0为零序分量，1为正序分量，2为负序分量
+    """
+    groups = phase_groups(comtrade, group_mode)
+    if not groups:
+        return {}
+    if phasors is None:
+        phasors = comtrade_phasors(comtrade, 1, mode)
+    sequences = phasor_to_sequence_series(phasors[np.array([group.indices for group in groups])])
+    return {group.name: sequences[i] for i, group in enumerate(groups)}
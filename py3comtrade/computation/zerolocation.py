@@ -7,3 +7,263 @@
 # @Author  : 张松贵
 # @File    : zerolocation.py
 # @IDE     : PyCharm
+"""
+故障测距。
+
+以零时刻为基准，取故障前和故障后各一个周波的数据窗计算基波相量，只计算所需通道的两个数据窗，
+单端测距采用电抗法和Takagi法，双端测距采用不需要两侧同步的负序电压、电流法。
+各计算函数均支持多组数据同时计算，前导维度为线路或录波文件的组数。
+线路阻抗参数按dmf文件约定为每公里的一次阻抗，测距结果单位为公里。
+"""
+import numpy as np
+from pydantic import BaseModel, Field
+
+from py3comtrade.computation.basic_calc import raw_to_instant_matrix
+from py3comtrade.computation.fourier import dft_kernel
+from py3comtrade.computation.impedance import LOOPS, loop_quantities, zero_sequence_factor
+from py3comtrade.computation.phasor import analog_positions, combine_currents, current_rows, voltage_rows
+from py3comtrade.computation.sequence import SEQUENCE_MATRIX
+from py3comtrade.model.comtrade import Comtrade
+from py3comtrade.model.line import Line
+from py3comtrade.model.type import PsType
+
+# 按故障相组合选择测量回路，下标为A、B、C三相是否故障的位掩码(A=1, B=2, C=4)，值为LOOPS中的位置
+LOOP_BY_PHASES = np.array([0, 3, 4, 0, 5, 2, 1, 0])
+
+
+class FaultLocation(BaseModel):
+    name: str = Field(default="", description="线路名称")
+    loop: str = Field(default="", description="故障测量回路")
+    impedance: complex = Field(default=0j, description="故障后测量回路阻抗")
+    reactance: float = Field(default=float('nan'), description="电抗法测距结果，单位公里")
+    takagi: float = Field(default=float('nan'), description="Takagi法测距结果，单位公里")
+    ratio: float = Field(default=float('nan'), description="Takagi法测距结果占线路全长的比例")
+
+
+def fault_windows(comtrade: Comtrade, pre_cycles: float = 1.0, post_cycles: float = 1.0) -> tuple:
+    """
+    获取零时刻前后各一个周波数据窗的起始采样点
+    :param comtrade: 录波对象
+    :param pre_cycles: 故障前数据窗结束位置距零时刻的周波数
+    :param post_cycles: 故障后数据窗起始位置距零时刻的周波数
+    :return: (故障前数据窗起点, 故障后数据窗起点, 每周波采样点数)
+    """
+    zero_point = comtrade.get_zero_point()
+    nrate = comtrade.sample.nrates[comtrade.get_cursor_in_segment(zero_point)]
+    cycle_point = int(round(nrate.cycle_point))
+    if cycle_point <= 2:
+        raise ValueError(f"零时刻所在采样段每周波采样点数{cycle_point}不足以计算相量")
+    pre_start = zero_point - int(round(pre_cycles * cycle_point)) - cycle_point
+    post_start = zero_point + int(round(post_cycles * cycle_point))
+    if pre_start < nrate.start_point or post_start + cycle_point > nrate.end_point:
+        raise ValueError("零时刻前后的数据窗超出零时刻所在采样段")
+    return pre_start, post_start, cycle_point
+
+
+def fault_phasors(comtrade: Comtrade, rows: list[int], pre_cycles: float = 1.0, post_cycles: float = 1.0,
+                  output_primary: bool = True) -> np.ndarray:
+    """
+    计算指定模拟量通道在故障前、故障后数据窗的基波相量
+    :param comtrade: 已读取dat文件的录波对象
+    :param rows: 模拟量通道在analogs中的位置列表
+    :param pre_cycles: 故障前数据窗结束位置距零时刻的周波数
+    :param post_cycles: 故障后数据窗起始位置距零时刻的周波数
+    :param output_primary: 输出值是否是一次值，默认为一次值，与线路阻抗参数一致
+    :return: 相量矩阵，形状为(2, 通道数)，第0行为故障前，第1行为故障后
+    """
+    pre_start, post_start, cycle_point = fault_windows(comtrade, pre_cycles, post_cycles)
+    analogs = [comtrade.analogs[row] for row in rows]
+    raw = np.stack((comtrade.analog_raw[rows, pre_start:pre_start + cycle_point],
+                    comtrade.analog_raw[rows, post_start:post_start + cycle_point]), axis=1)
+    instants = raw_to_instant_matrix(raw.reshape(len(rows), -1),
+                                     [analog.a for analog in analogs],
+                                     [analog.b for analog in analogs],
+                                     [analog.primary for analog in analogs],
+                                     [analog.secondary for analog in analogs],
+                                     [analog.ps == PsType.P for analog in analogs],
+                                     output_primary)
+    sin_part, cos_part = dft_kernel(cycle_point, 1)
+    return (instants.reshape(len(rows), 2, cycle_point) @ (sin_part + 1j * cos_part)).T
+
+
+def select_loops(i_pre: np.ndarray, i_post: np.ndarray, phase_ratio: float = 0.5) -> np.ndarray:
+    """
+    按三相电流突变量选择故障测量回路，突变量不小于最大突变量phase_ratio倍的相为故障相，
+    单相故障取该相接地回路，两相故障取两相的相间回路，三相故障取AB相间回路
+    :param i_pre: 故障前A、B、C三相电流相量，形状为(..., 3)
+    :param i_post: 故障后A、B、C三相电流相量，形状与i_pre一致
+    :param phase_ratio: 判别故障相的突变量比例
+    :return: 测量回路在LOOPS中的位置，形状为i_pre去掉最后一维
+    """
+    delta = np.abs(np.asarray(i_post) - np.asarray(i_pre))
+    faulted = delta >= phase_ratio * delta.max(axis=-1, keepdims=True)
+    return LOOP_BY_PHASES[faulted @ np.array([1, 2, 4])]
+
+
+def reactance_distance(u_loop: np.ndarray, i_loop: np.ndarray, z1: complex) -> np.ndarray:
+    """
+    电抗法测距，d=Im(U/I)/x1
+    :param u_loop: 故障后回路电压
+    :param i_loop: 故障后回路电流
+    :param z1: 线路每公里正序阻抗
+    :return: 故障点距本侧的距离，单位公里，回路电流为0时为NaN
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.imag(np.asarray(u_loop) / np.asarray(i_loop)) / np.imag(z1)
+
+
+def takagi_distance(u_loop: np.ndarray, i_loop: np.ndarray, delta_i_loop: np.ndarray, z1: complex) -> np.ndarray:
+    """
+    Takagi法测距，以回路电流突变量近似故障支路电流消除过渡电阻影响，d=Im(U·ΔI*)/Im(z1·I·ΔI*)
+    :param u_loop: 故障后回路电压
+    :param i_loop: 故障后回路电流
+    :param delta_i_loop: 回路电流突变量，即故障后与故障前回路电流之差
+    :param z1: 线路每公里正序阻抗
+    :return: 故障点距本侧的距离，单位公里，无法计算时为NaN
+    """
+    conj_delta = np.conj(delta_i_loop)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.imag(u_loop * conj_delta) / np.imag(z1 * np.asarray(i_loop) * conj_delta)
+
+
+def double_ended_distance(u_s: np.ndarray, i_s: np.ndarray, u_r: np.ndarray, i_r: np.ndarray,
+                          z1: complex, length: float) -> np.ndarray:
+    """
+    双端负序测距，两侧故障点负序电压幅值相等|U2s-d·z·I2s|=|U2r-(L-d)·z·I2r|，两侧数据无需同步，
+    展开为关于d的二次方程，取落在线路范围内或最接近线路范围的实根
+    :param u_s: 本侧负序电压
+    :param i_s: 本侧负序电流，正方向为母线流向线路
+    :param u_r: 对侧负序电压
+    :param i_r: 对侧负序电流，正方向为母线流向线路
+    :param z1: 线路每公里负序阻抗，取正序阻抗
+    :param length: 线路长度，单位公里
+    :return: 故障点距本侧的距离，单位公里，方程无实根时为NaN
+    """
+    a, b = np.asarray(u_s, dtype=complex), z1 * np.asarray(i_s, dtype=complex)
+    e = z1 * np.asarray(i_r, dtype=complex)
+    c = np.asarray(u_r, dtype=complex) - length * e
+    qa = np.abs(b) ** 2 - np.abs(e) ** 2
+    qb = -2 * np.real(a * np.conj(b) + c * np.conj(e))
+    qc = np.abs(a) ** 2 - np.abs(c) ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrt_disc = np.sqrt((qb * qb - 4 * qa * qc).astype(complex))
+        roots = np.stack(((-qb + sqrt_disc) / (2 * qa), (-qb - sqrt_disc) / (2 * qa)))
+        # 二次项系数为0时退化为一次方程
+        roots = np.where(np.abs(qa) > 1e-12 * (np.abs(qb) + np.abs(qc)), roots, -qc / qb)
+    real = np.abs(roots.imag) <= 1e-9 * np.maximum(np.abs(roots.real), 1.0)
+    roots = np.where(real, roots.real, np.nan)
+    outside = np.abs(roots - np.clip(roots, 0, length))
+    best = np.argmin(np.where(np.isnan(outside), np.inf, outside), axis=0)
+    return np.take_along_axis(roots, best[None], axis=0)[0]
+
+
+def negative_sequence(phasors: np.ndarray) -> np.ndarray:
+    """
+    计算三相相量的负序分量
+    :param phasors: A、B、C三相相量，形状为(..., 3)
+    :return: 负序分量，形状为phasors去掉最后一维
+    """
+    return np.asarray(phasors) @ SEQUENCE_MATRIX[2]
+
+
+def _line_channel_rows(comtrade: Comtrade, line: Line, positions: dict[int, int]) -> tuple:
+    """获取线路电压行号和电流分支行号，无法确定通道时返回None"""
+    bus = comtrade.dmf.find_bus_by_idx(line.bus_idx)
+    u_row = voltage_rows(positions, bus.acv_chn) if bus is not None else None
+    i_row = current_rows(positions, line.acc_bran)
+    if u_row is None or i_row is None:
+        return None
+    return u_row, i_row
+
+
+def line_fault_phasors(comtrade: Comtrade, lines: list[Line], pre_cycles: float = 1.0,
+                       post_cycles: float = 1.0) -> tuple:
+    """
+    计算多条线路故障前后的三相电压、电流一次值相量
+    :param comtrade: 已读取dat和dmf文件的录波对象
+    :param lines: 线路列表，应均能确定电压和电流通道
+    :param pre_cycles: 故障前数据窗结束位置距零时刻的周波数
+    :param post_cycles: 故障后数据窗起始位置距零时刻的周波数
+    :return: (电压, 电流)相量元组，形状均为(2, 线路数, 3)，第0行为故障前，第1行为故障后
+    """
+    positions = analog_positions(comtrade)
+    channel_rows = []
+    for line in lines:
+        rows = _line_channel_rows(comtrade, line, positions)
+        if rows is None:
+            raise ValueError(f"线路{line.name}无法确定电压和电流通道")
+        channel_rows.append(rows)
+    needed = sorted({row for u_row, i_row in channel_rows for row in u_row + [r for rs, _ in i_row for r in rs]})
+    phasors = np.zeros((2, len(comtrade.analogs)), dtype=complex)
+    phasors[:, needed] = fault_phasors(comtrade, needed, pre_cycles, post_cycles)
+    u = np.stack([phasors[:, u_row] for u_row, _ in channel_rows], axis=1)
+    i = np.stack([combine_currents(phasors.T, i_row).T for _, i_row in channel_rows], axis=1)
+    return u, i
+
+
+def comtrade_fault_locations(comtrade: Comtrade, pre_cycles: float = 1.0,
+                             post_cycles: float = 1.0) -> list[FaultLocation]:
+    """
+    对dmf文件中配置了线路长度和正序电抗的每条线路做单端测距，全部线路一次计算。
+    MR中配置了互感阻抗且互感线路在同一录波文件中时，接地回路计入互感线路零序电流的补偿。
+    :param comtrade: 已读取dat和dmf文件的录波对象
+    :param pre_cycles: 故障前数据窗结束位置距零时刻的周波数
+    :param post_cycles: 故障后数据窗起始位置距零时刻的周波数
+    :return: 测距结果列表，无法确定通道或未配置线路参数的线路不包含在内
+    """
+    if comtrade.dmf is None:
+        raise ValueError("录波文件未读取dmf文件，无法确定线路的电压和电流通道")
+    positions = analog_positions(comtrade)
+    lines = [line for line in comtrade.dmf.lines
+             if line.lin_len > 0 and line.rx.x1 != 0 and _line_channel_rows(comtrade, line, positions) is not None]
+    if not lines:
+        return []
+    by_idx = {line.idx: n for n, line in enumerate(lines)}
+    z1 = np.array([complex(line.rx.r1, line.rx.x1) for line in lines])
+    k0 = np.array([zero_sequence_factor(line) for line in lines])
+    km = np.array([complex(line.mr.mr0, line.mr.mx0) for line in lines]) / (3 * z1)
+    u, i = line_fault_phasors(comtrade, lines, pre_cycles, post_cycles)
+    # 互感线路不在本次计算的线路中时，补偿电流为0
+    coupled = np.array([by_idx.get(line.mr.idx, -1) if line.mr.mr0 or line.mr.mx0 else -1 for line in lines])
+    im = np.where((coupled >= 0)[None, :, None], i[:, coupled], 0)
+    voltages, currents = loop_quantities(u[..., None], i[..., None], k0[None], km[None], im[..., None])
+    voltages, currents = voltages[..., 0], currents[..., 0]
+    loops = select_loops(i[0], i[1])
+    n = np.arange(len(lines))
+    u_loop, i_loop = voltages[1, n, loops], currents[1, n, loops]
+    delta_i_loop = i_loop - currents[0, n, loops]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        impedances = u_loop / i_loop
+    reactance = reactance_distance(u_loop, i_loop, z1)
+    takagi = takagi_distance(u_loop, i_loop, delta_i_loop, z1)
+    lengths = np.array([line.lin_len for line in lines])
+    return [FaultLocation(name=line.name, loop=LOOPS[loops[n]], impedance=complex(impedances[n]),
+                          reactance=float(reactance[n]), takagi=float(takagi[n]), ratio=float(takagi[n] / lengths[n]))
+            for n, line in enumerate(lines)]
+
+
+def double_ended_fault_location(local: Comtrade, remote: Comtrade, line_name: str, remote_line_name: str = None,
+                                pre_cycles: float = 1.0, post_cycles: float = 1.0) -> float:
+    """
+    使用线路两侧的录波文件做双端负序测距，线路参数取本侧dmf文件
+    :param local: 本侧录波对象
+    :param remote: 对侧录波对象
+    :param line_name: 本侧dmf文件中的线路名称
+    :param remote_line_name: 对侧dmf文件中的线路名称，默认与本侧相同
+    :param pre_cycles: 故障前数据窗结束位置距零时刻的周波数
+    :param post_cycles: 故障后数据窗起始位置距零时刻的周波数
+    :return: 故障点距本侧的距离，单位公里
+    """
+    remote_line_name = line_name if remote_line_name is None else remote_line_name
+    if local.dmf is None or remote.dmf is None:
+        raise ValueError("录波文件未读取dmf文件，无法确定线路的电压和电流通道")
+    found, remote_found = local.dmf.find_line_by_name(line_name), remote.dmf.find_line_by_name(remote_line_name)
+    if found is None or remote_found is None:
+        raise ValueError(f"未找到线路{line_name if found is None else remote_line_name}")
+    line, remote_line = found[1], remote_found[1]
+    u_s, i_s = line_fault_phasors(local, [line], pre_cycles, post_cycles)
+    u_r, i_r = line_fault_phasors(remote, [remote_line], pre_cycles, post_cycles)
+    distance = double_ended_distance(negative_sequence(u_s[1, 0]), negative_sequence(i_s[1, 0]),
+                                     negative_sequence(u_r[1, 0]), negative_sequence(i_r[1, 0]),
+                                     complex(line.rx.r1, line.rx.x1), line.lin_len)
+    return float(distance)
@@ -11,6 +11,9 @@
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
 
+from typing import List, Optional, Union
+
+import numpy as np
 from pydantic import Field
 
 from .channel import Channel
@@ -29,6 +32,8 @@ class Analog(Channel):
     ps: PsType = Field(default=PsType.P, description="一次还是二次值标识")
     ratio: float = Field(default=1.0, description="通道比率")
     y: list[float] = Field(default_factory=list, description="通道数值")
+    raw: Optional[Union[List[int], np.ndarray]] = Field(default_factory=list,
+                                                        description="通道原始数据，读取dat文件后为采样值矩阵的行视图")
 
     def clear(self) -> None:
         """清除模型中所有字段"""
@@ -10,9 +10,8 @@
 #  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
-from typing import List, Optional
-
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 
 from .type import PhaseCode
 
@@ -36,12 +35,34 @@ class Channel(ChannelIdx):
                              description="通道相别标识，可选，字母、数字，最小0个字符，最大长度2个字符")
     ccbm: str = Field(default="", description="被监视的电路元件，可选，字母、数字，最小0个字符，最大长度64个字符")
     index: int = Field(default=0, description="通道索引号")
-    raw: Optional[List[int]] = Field(default=list, description="通道原始数据")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     def clear(self) -> None:
         """清除模型中所有字段"""
         for field in self.model_fields.keys():
             setattr(self, field, None)
 
+    def __eq__(self, other) -> bool:
+        """
+        按字段和原始数据比较通道，原始数据为数组时按元素比较，
+        不使用BaseModel逐字段直接比较，以免数组比较结果的真值不明确
+        """
+        if type(self) is not type(other):
+            return NotImplemented
+        names = list(type(self).model_fields.keys())
+        if "raw" not in names:
+            names.append("raw")
+        return all(_values_equal(getattr(self, name, None), getattr(other, name, None)) for name in names)
+
     def __str__(self):
         return super().__str__() + f",{self.name},{self.phase.code},{self.ccbm}"
+
+
+def _values_equal(left, right) -> bool:
+    """比较两个字段值，其中之一为数组时按形状和元素比较"""
+    if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+        if left is None or right is None:
+            return left is right
+        return np.array_equal(np.asarray(left), np.asarray(right))
+    return left == right
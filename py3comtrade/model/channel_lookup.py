@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+from typing import Iterable, Union
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+from .channel import Channel
+from .type import PhaseCode
+
+
+def _as_keys(value) -> list:
+    """将单个查询值或查询值序列统一为列表"""
+    if isinstance(value, (str, int, PhaseCode)) or not isinstance(value, Iterable):
+        return [value]
+    return list(value)
+
+
+def _phase_code(phase: Union[PhaseCode, str]) -> str:
+    """相别统一为相别代码"""
+    return phase.code if isinstance(phase, PhaseCode) else str(phase).strip().upper()
+
+
+class ChannelLookup(BaseModel):
+    """
+    通道查找索引，按cfg通道标识、通道名称、相别和被监视元件查找通道在通道列表中的位置，
+    位置即通道的index，可直接作为采样值矩阵的行号
+    """
+    by_idx_cfg: dict[int, int] = Field(default_factory=dict, description="cfg通道标识到位置的映射")
+    by_name: dict[str, int] = Field(default_factory=dict, description="通道名称到位置的映射，重名时取第一个")
+    by_phase: dict[str, list[int]] = Field(default_factory=dict, description="相别代码到位置列表的映射")
+    by_ccbm: dict[str, list[int]] = Field(default_factory=dict, description="被监视元件到位置列表的映射")
+    count: int = Field(default=0, description="通道数量")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def build(cls, channels: list[Channel]) -> 'ChannelLookup':
+        """
+        根据通道列表生成查找索引
+        :param channels: 通道列表
+        :return: 通道查找索引
+        """
+        lookup = cls()
+        for position, channel in enumerate(channels):
+            lookup.add(channel, position)
+        return lookup
+
+    def add(self, channel: Channel, position: int):
+        """
+        将通道追加到查找索引中
+        :param channel: 通道对象
+        :param position: 通道在通道列表中的位置
+        """
+        self.by_idx_cfg.setdefault(channel.idx_cfg, position)
+        self.by_name.setdefault(channel.name, position)
+        self.by_phase.setdefault(_phase_code(channel.phase), []).append(position)
+        self.by_ccbm.setdefault(channel.ccbm, []).append(position)
+        self.count = max(self.count, position + 1)
+
+    def positions(self, idx_cfg: Union[int, list[int]] = None, name: Union[str, list[str]] = None,
+                  phase: Union[PhaseCode, str, list] = None, ccbm: Union[str, list[str]] = None) -> np.ndarray:
+        """
+        按多个条件查找通道位置，各条件可为单个值或值列表，同时给出多个条件时取交集。
+        给出idx_cfg或name时结果按其顺序排列，否则按位置升序排列。
+        :param idx_cfg: cfg通道标识
+        :param name: 通道名称
+        :param phase: 相别，PhaseCode或相别代码
+        :param ccbm: 被监视元件
+        :return: 位置数组，可直接作为采样值矩阵的行号
+        """
+        if idx_cfg is not None:
+            candidates = self._exact(self.by_idx_cfg, _as_keys(idx_cfg), "cfg通道标识")
+            if name is not None:
+                candidates = candidates[np.isin(candidates, self._exact(self.by_name, _as_keys(name), "通道名称"))]
+        elif name is not None:
+            candidates = self._exact(self.by_name, _as_keys(name), "通道名称")
+        else:
+            candidates = np.arange(self.count, dtype=np.intp)
+        if phase is not None:
+            candidates = candidates[np.isin(candidates, self._group(self.by_phase, map(_phase_code, _as_keys(phase))))]
+        if ccbm is not None:
+            candidates = candidates[np.isin(candidates, self._group(self.by_ccbm, _as_keys(ccbm)))]
+        return candidates
+
+    @staticmethod
+    def _exact(mapping: dict, keys: list, key_name: str) -> np.ndarray:
+        """按一一对应的映射查找位置，有不存在的键时报错"""
+        missing = [key for key in keys if key not in mapping]
+        if missing:
+            raise ValueError(f"{key_name}不存在：{missing}")
+        return np.fromiter((mapping[key] for key in keys), dtype=np.intp, count=len(keys))
+
+    @staticmethod
+    def _group(mapping: dict, keys: Iterable) -> np.ndarray:
+        """按一对多的映射查找位置，不存在的键视为没有通道"""
+        groups = [mapping.get(key, []) for key in keys]
+        return np.concatenate([np.asarray(group, dtype=np.intp) for group in groups]) if groups else \
+            np.empty(0, dtype=np.intp)
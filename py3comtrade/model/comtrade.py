@@ -11,18 +11,19 @@
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
 import copy
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
-from pydantic import Field
+from pydantic import ConfigDict, Field, PrivateAttr
 
-from py3comtrade.computation.basic_calc import raw_to_instant
+from py3comtrade.computation.basic_calc import raw_to_instant_matrix
 from py3comtrade.model.dmf import DMF
 from .analog import Analog
 from .configure import Configure
+from .data import Data, digital_bits, unpack_digital
 from .digital import Digital
-from .digital_change_status import StatusRecord
-from .type import FilePath
+from .digital_change_status import DigitalChangeIndex
+from .type import EquipmentType, FilePath
 from .type import PsType
 from .type.types import IdxType, ChannelType
 
@@ -30,8 +31,77 @@ from .type.types import IdxType, ChannelType
 class Comtrade(Configure):
     file_path: FilePath = Field(default=None, description="录波文件路径")
     dmf: DMF = Field(default=None, description="Comtrade数据对象")
-    sample_time: list = Field(default_factory=list, description="采样时间")
-    digital_change: list = Field(default_factory=list, description="变位开关量通道记录")
+    sample_time: Optional[np.ndarray] = Field(default=None, description="采样序号及采样时间，形状为(采样点数, 2)")
+    analog_raw: Optional[np.ndarray] = Field(default=None, description="模拟量原始采样值矩阵，行为通道，列为采样点")
+    digital_raw: Optional[np.ndarray] = Field(default=None,
+                                              description="开关量打包字矩阵，行为开关量字（第i个通道为第i//16行的第i%16位），列为采样点")
+    change_index: Optional[DigitalChangeIndex] = Field(default=None, description="开关量变位索引，为None时表示尚未分析")
+
+    _instant_cache: dict = PrivateAttr(default_factory=dict)
+    # 变位开关量通道列表，为None时表示尚未生成
+    _digital_change: Optional[list] = PrivateAttr(default=None)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def load_data(self, data: Data):
+        """
+        载入dat文件解析结果。
+        采样值按通道转置为一块连续矩阵由Comtrade持有，各模拟量通道的raw为该矩阵对应行的视图，不再逐通道复制数据。
+        开关量保持按16位打包的开关量字，不逐通道拆分，各开关量通道的raw在首次访问时才从开关量字中提取。
+        按需读取（内存映射）时不做转置复制，矩阵直接为映射的视图。
+
+        参数:
+            data(Data) dat文件解析结果
+        """
+        self.sample_time = data.sample_time
+        self.change_index = None
+        self._digital_change = None
+        self._instant_cache.clear()
+        if data.lazy:
+            self.analog_raw = data.analog_value.T
+            self.digital_raw = data.digital_value.T
+        else:
+            self.analog_raw = np.ascontiguousarray(data.analog_value.T)
+            self.digital_raw = np.ascontiguousarray(data.digital_value.T)
+        for analog in self.analogs:
+            analog.raw = self.analog_raw[analog.index]
+        for digital in self.digitals:
+            digital.bind_words(self.digital_raw)
+
+    def get_raw_matrix(self, channel_idx: Union[int, list[int]] = None,
+                       idx_type: IdxType = IdxType.INDEX,
+                       channel_type: ChannelType = ChannelType.ANALOG,
+                       start_point: int = 0,
+                       end_point: int = None) -> np.ndarray:
+        """
+        根据指定通道标识获取指定采样范围内的原始采样值矩阵
+
+        参数:
+            channel_idx(int,list[int]) 通道索引值或通道索引值列表，默认为None，代表全部通道
+            idx_type:(IdxType)通道标识类型，默认使用INDEX，支持按照通道数组索引值和cfg通道标识an两种方式
+            channel_type(ChannelTyep)通道类型，默认模拟量ANALOG，支持模拟量和开关量两种类型
+            start_point(int) 开始采样点，默认值0，包含该点。
+            end_point(int) 结束采样点，默认值为None，为录波文件最大采样点，包含该点。
+        返回值:
+            原始采样值矩阵，行为通道，列为采样点。模拟量全部通道或单个通道时为采样值矩阵的视图，通道列表时为副本；
+            开关量为从开关量字中提取的状态值副本。
+        """
+        start_point, end_point, _ = self.get_cursor_sample_range(start_point, end_point)
+        if channel_type == ChannelType.DIGITAL:
+            words = self.digital_raw[:, start_point:end_point + 1]
+            if channel_idx is None:
+                return unpack_digital(words.T, self.channel_num.digital_num).T
+            channels = self.get_channel(channel_idx, channel_type, idx_type)
+            rows = [channels.index] if not isinstance(channels, list) else [channel.index for channel in channels]
+            return digital_bits(words, rows)
+        matrix = self.analog_raw
+        if channel_idx is None:
+            return matrix[:, start_point:end_point + 1]
+        channels = self.get_channel(channel_idx, channel_type, idx_type)
+        if not isinstance(channels, list):
+            return matrix[channels.index:channels.index + 1, start_point:end_point + 1]
+        rows = [channel.index for channel in channels]
+        return matrix[rows, start_point:end_point + 1]
 
     def get_channel_raw_data_range(self, channel_idx: Union[int, list[int]] = None,
                                    idx_type: IdxType = IdxType.INDEX,
@@ -39,7 +109,8 @@ class Comtrade(Configure):
                                    start_point: int = 0,
                                    end_point: int = None) -> Union[list[Digital], list[Analog]]:
         """
-        根据指定通道标识获取指定采样范围内模拟量原始采样值
+        根据指定通道标识获取指定采样范围内模拟量原始采样值，模拟量通道的raw为采样值矩阵的切片视图，
+        开关量通道的raw为从开关量字中提取的状态值
 
         参数:
             channel_idx(int,list[int]) 通道索引值或通道索引值列表
@@ -60,7 +131,10 @@ class Comtrade(Configure):
         cns = []
         for chaneel in chaneels:
             chaneel_new = copy.copy(chaneel)
-            chaneel_new.raw = chaneel.raw[start_point:end_point + 1]
+            if channel_type == ChannelType.DIGITAL:
+                chaneel_new.raw = digital_bits(self.digital_raw[:, start_point:end_point + 1], chaneel.index)
+            else:
+                chaneel_new.raw = chaneel.raw[start_point:end_point + 1]
             cns.append(chaneel_new)
         return cns
 
@@ -81,42 +155,128 @@ class Comtrade(Configure):
             end_point(int) 结束采样点，默认值为None，为录波文件最大采样点，不包含该点。
             output_primary(bool)输出值是否是一次值
         返回值:
-            通道对象数组
+            通道对象数组，模拟量通道的y为保留3位小数的瞬时值列表，用于展示和导出，计算时应使用get_instant_matrix
         """
-        channel_raw_data = self.get_channel_raw_data_range(channel_idx, idx_type, channel_type, start_point, end_point)
         if channel_type == channel_type.DIGITAL:
-            return channel_raw_data
+            return self.get_channel_raw_data_range(channel_idx, idx_type, channel_type, start_point, end_point)
+        start_point, end_point, _ = self.get_cursor_sample_range(start_point, end_point)
+        channels = self.get_channel(channel_idx, channel_type, idx_type)
+        if not isinstance(channels, list):
+            channels = [channels]
+        values = self.get_instant_matrix([channel.index for channel in channels], IdxType.INDEX,
+                                         start_point, end_point, output_primary)
+        values = np.around(values, 3).tolist()
         instants = []
-        for channel in channel_raw_data:
-            input_primary = True if channel.ps == PsType.P else False
-            channel.y = raw_to_instant(channel.raw, channel.a, channel.b, channel.primary, channel.secondary,
-                                       input_primary, output_primary)
-            instants.append(channel)
+        for channel, y in zip(channels, values):
+            channel_new = copy.copy(channel)
+            channel_new.raw = channel.raw[start_point:end_point + 1]
+            channel_new.y = y
+            instants.append(channel_new)
         return instants
 
+    def get_instant_matrix(self, channel_idx: Union[int, list[int]] = None,
+                           idx_type: IdxType = IdxType.INDEX,
+                           start_point: int = 0,
+                           end_point: int = None,
+                           output_primary: bool = False,
+                           dtype: np.dtype = np.float64) -> np.ndarray:
+        """
+        根据指定通道标识获取指定采样范围内的模拟量瞬时值矩阵，不做舍入，不生成通道对象
+
+        参数:
+            channel_idx(int,list[int]) 通道索引值或通道索引值列表，默认为None，代表全部通道
+            idx_type:(IdxType)通道标识类型，默认使用INDEX，支持按照通道数组索引值和cfg通道标识an两种方式
+            start_point(int) 开始采样点，默认值0，包含该点。
+            end_point(int) 结束采样点，默认值为None，为录波文件最大采样点，包含该点。
+            output_primary(bool)输出值是否是一次值
+            dtype(np.dtype)输出数据类型，默认为float64
+        返回值:
+            瞬时值矩阵，行为通道，列为采样点。全部通道或单个通道时为缓存的只读瞬时值矩阵的视图，通道列表时为副本
+        """
+        start_point, end_point, _ = self.get_cursor_sample_range(start_point, end_point)
+        matrix = self.get_analog_instant_matrix(output_primary, dtype)
+        if channel_idx is None:
+            return matrix[:, start_point:end_point + 1]
+        channels = self.get_channel(channel_idx, ChannelType.ANALOG, idx_type)
+        if not isinstance(channels, list):
+            return matrix[channels.index:channels.index + 1, start_point:end_point + 1]
+        return matrix[[channel.index for channel in channels], start_point:end_point + 1]
+
+    def get_analog_instant_matrix(self, output_primary: bool = False, dtype: np.dtype = np.float64) -> np.ndarray:
+        """
+        获取全部模拟量通道的瞬时值矩阵。
+        各通道的增益、偏移和变比系数组成向量，整个原始采样值矩阵一次乘加换算，不做舍入。
+        换算结果按输出一次值或二次值以及数据类型缓存，重新载入dat文件时清除，返回的矩阵为只读。
+
+        参数:
+            output_primary(bool)输出值是否是一次值
+            dtype(np.dtype)输出数据类型，默认为float64，可选float32减少一半内存
+        返回值:
+            瞬时值矩阵，行为通道，列为采样点
+        """
+        key = (bool(output_primary), np.dtype(dtype).str)
+        instants = self._instant_cache.get(key)
+        if instants is None:
+            analogs = self.analogs
+            instants = raw_to_instant_matrix(self.analog_raw,
+                                             [analog.a for analog in analogs],
+                                             [analog.b for analog in analogs],
+                                             [analog.primary for analog in analogs],
+                                             [analog.secondary for analog in analogs],
+                                             [analog.ps == PsType.P for analog in analogs],
+                                             output_primary, dtype)
+            instants.flags.writeable = False
+            self._instant_cache[key] = instants
+        return instants
+
+    def get_equipment_rows(self, name: str, equipment_type: EquipmentType = EquipmentType.LINE) -> np.ndarray:
+        """
+        获取dmf文件中设备的模拟量通道在采样值矩阵中的行号
+
+        参数:
+            name(str) 设备名称
+            equipment_type(EquipmentType) 设备类型，默认为线路
+        返回值:
+            行号数组，按设备通道在dmf文件中的顺序排列，cfg文件中不存在的通道不包含在内
+        """
+        if self.dmf is None:
+            raise ValueError("录波文件未读取dmf文件，无法确定设备的通道")
+        by_idx_cfg = self.get_channel_lookup(ChannelType.ANALOG).by_idx_cfg
+        channels = self.dmf.get_equipment_channels(name, equipment_type)
+        return np.fromiter((by_idx_cfg[idx] for idx in channels.tolist() if idx in by_idx_cfg), dtype=np.intp)
+
+    @property
+    def digital_change(self) -> list[Digital]:
+        """
+        变位开关量通道列表，首次访问时生成，未读取dat文件时为空列表
+        """
+        if self._digital_change is None and self.change_index is None and self.digital_raw is None:
+            return []
+        return self.get_digital_change()
+
+    @digital_change.setter
+    def digital_change(self, value: Optional[list]):
+        self._digital_change = value
+
     def get_digital_change(self) -> list[Digital]:
         """
-        获取所有发生变位的开关量
+        获取所有发生变位的开关量。首次调用时为全部开关量通道生成变位记录，
+        第一条为初始状态，未变位的通道只有初始状态一条记录
         """
-        if self.digital_change is None:
-            self.analyze_digital_change_status()
-        return self.digital_change
+        if self._digital_change is None:
+            if self.change_index is None:
+                self.analyze_digital_change_status()
+            changed = set(self.change_index.changed_channels().tolist())
+            self._digital_change = []
+            for i, digital in enumerate(self.digitals):
+                digital.change_status = self.change_index.records(i)
+                if i in changed:
+                    self._digital_change.append(digital)
+        return self._digital_change
 
     def analyze_digital_change_status(self):
         """
-        根据开关量采样值计算变化点号及幅值
+        对开关量字矩阵整体按位异或生成变位索引，变位记录在首次获取变位开关量时才生成
         """
-        self.digital_change = []
-        for digital in self.digitals:
-            raw = np.array(digital.raw)
-            status_record = StatusRecord(timestamp=0, status=raw[0].item())
-            digital.change_status.append(status_record)
-            if raw.min() != raw.max():
-                # 找出变化点：当前值与前一个值不同
-                change_indices = np.where(raw[:-1] != raw[1:])[0] + 1
-                # 获取变化后的值
-                change_vs = raw[change_indices]
-                for i in range(len(change_vs)):
-                    status_record = StatusRecord(timestamp=change_indices[i].item(), status=change_vs[i].item())
-                    digital.change_status.append(status_record)
-                self.digital_change.append(digital)
+        self.change_index = DigitalChangeIndex.from_words(self.digital_raw, self.channel_num.digital_num)
+        self._digital_change = None
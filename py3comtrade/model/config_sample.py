@@ -17,6 +17,7 @@
 # @Author    :张松贵
 from typing import List
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from .channel_num import ChannelNum
@@ -70,7 +71,7 @@ class ConfigSample(BaseModel):
         """
         if self.freg == 0:
             raise ValueError("电网频率不能为0")
-        time_per_cycle = 20  # 每个周波的时间，单位为毫秒
+        time_per_cycle = 1000 / self.freg  # 每个周波的时间，单位为毫秒
         # 计算各采样段隐含信息
         for i, nrate in enumerate(self.nrates):
             nrate.index = i
@@ -101,12 +102,36 @@ class ConfigSample(BaseModel):
         """
         根据文件格式计算每采样点占用字节数
         """
-        if self.data_file_type.BINARY32 in ("BINARY32", "FLOAT32"):
-            self.analog_word = 4
+        self.analog_word = 4 if self.data_file_type in (DataFileType.BINARY32, DataFileType.FLOAT32) else 2
         self.analog_sampe_word = self.analog_word * self.channel_num.analog_num
-        self.digital_sampe_word = (self.digital_word * self.channel_num.digital_num) // 16
+        self.digital_sampe_word = self.digital_word * self.digital_word_num
         self.total_sampe_word = self.analog_sampe_word + self.digital_sampe_word + 8
 
+    @property
+    def digital_word_num(self) -> int:
+        """每采样点开关量占用的16位字数，不足16个通道的部分补齐一个字"""
+        return (self.channel_num.digital_num + 15) // 16
+
+    @property
+    def analog_dtype(self) -> np.dtype:
+        """根据数据文件类型获取模拟量采样值的数据类型，二进制文件均为小端字节序"""
+        if self.data_file_type == DataFileType.FLOAT32:
+            return np.dtype('<f4')
+        if self.data_file_type == DataFileType.BINARY32:
+            return np.dtype('<i4')
+        return np.dtype('<i2')
+
+    def record_dtype(self) -> np.dtype:
+        """
+        获取二进制数据文件每个采样点的结构类型，BINARY、BINARY32、FLOAT32三种格式共用
+        :return: 包含采样序号和时间戳、模拟量、开关量字的numpy结构类型
+        """
+        return np.dtype([
+            ('timestamp', '<i4', 2),  # 采样序号和时间戳
+            ('analog', self.analog_dtype, self.channel_num.analog_num),  # 模拟量
+            ('digital', '<u2', self.digital_word_num),  # 开关量
+        ])
+
     def add_nrate(self, nrate: Nrate):
         """添加采样段信息"""
         self.nrates.append(nrate)
@@ -10,11 +10,13 @@
 #  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
-from typing import Union
+from typing import Any, Union
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from .analog import Analog
+from .channel_lookup import ChannelLookup
 from .channel_num import ChannelNum
 from .config_header import ConfigHeader
 from .config_sample import ConfigSample
@@ -22,7 +24,7 @@ from .digital import Digital
 from .nrate import Nrate
 from .precision_time import PrecisionTime
 from .timemult import TimeMult
-from .type import SampleMode
+from .type import PhaseCode, SampleMode
 from .type.types import ChannelType, IdxType
 
 
@@ -40,6 +42,56 @@ class Configure(BaseModel):
     fault_time: PrecisionTime = Field(default=None, description="故障时间")
     timemult: TimeMult = TimeMult(timemult=1)
 
+    analog_lookup: ChannelLookup = Field(default=None, exclude=True, repr=False, description="模拟量通道查找索引")
+    digital_lookup: ChannelLookup = Field(default=None, exclude=True, repr=False, description="开关量通道查找索引")
+
+    def model_post_init(self, __context: Any) -> None:
+        """创建对象后生成通道查找索引"""
+        self.rebuild_channel_lookup()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """替换analogs或digitals列表时同步重新生成通道查找索引"""
+        super().__setattr__(name, value)
+        if name in ("analogs", "digitals"):
+            self.rebuild_channel_lookup()
+
+    def rebuild_channel_lookup(self):
+        """
+        重新生成模拟量和开关量通道查找索引。
+        替换通道列表、add_analog、add_digital时自动更新，直接修改通道列表中的元素或通道的idx_cfg、name、phase、ccbm后需调用
+        """
+        self.analog_lookup = ChannelLookup.build(self.analogs or [])
+        self.digital_lookup = ChannelLookup.build(self.digitals or [])
+
+    def get_channel_lookup(self, channel_type: ChannelType = ChannelType.ANALOG) -> ChannelLookup:
+        """
+        获取通道查找索引，索引未生成或通道数量与索引不一致时（直接向通道列表追加或删除了通道）重新生成
+        :param channel_type: 通道类型
+        :return: 通道查找索引
+        """
+        is_analog = channel_type == ChannelType.ANALOG
+        channels = (self.analogs if is_analog else self.digitals) or []
+        lookup = self.analog_lookup if is_analog else self.digital_lookup
+        if lookup is None or lookup.count != len(channels):
+            self.rebuild_channel_lookup()
+            lookup = self.analog_lookup if is_analog else self.digital_lookup
+        return lookup
+
+    def get_channel_indices(self, channel_type: ChannelType = ChannelType.ANALOG,
+                            idx_cfg: Union[int, list[int]] = None, name: Union[str, list[str]] = None,
+                            phase: Union[PhaseCode, str, list] = None,
+                            ccbm: Union[str, list[str]] = None) -> np.ndarray:
+        """
+        按cfg通道标识、通道名称、相别、被监视元件查找通道索引值，各条件可为单个值或值列表，多个条件取交集
+        :param channel_type: 通道类型
+        :param idx_cfg: cfg通道标识
+        :param name: 通道名称
+        :param phase: 相别，PhaseCode或相别代码
+        :param ccbm: 被监视元件
+        :return: 通道索引值数组，可直接作为采样值矩阵的行号；给出idx_cfg或name时按其顺序排列
+        """
+        return self.get_channel_lookup(channel_type).positions(idx_cfg, name, phase, ccbm)
+
     def clear(self):
         """清除模型中所有字段"""
         for field in self.model_fields.keys():
@@ -191,9 +243,19 @@ class Configure(BaseModel):
         """
         获取零时刻采样值采样点位置。
         使用零时刻相对时间除以每周波的时间，在乘以零时刻所在采样段每个周波的采样点
-        @return: 零时刻采样点位置
+        @return: 零时刻采样点位置，零时刻早于录波起始时刻时为0，晚于录波结束时刻时为最后一个采样点
         """
-        return
+        if self.file_start_time is None or self.fault_time is None:
+            raise ValueError("录波文件缺少文件起始时间或故障时间，无法确定零时刻采样点位置")
+        zero_time = (self.fault_time.time - self.file_start_time.time).total_seconds() * 1000
+        if zero_time <= 0:
+            return 0
+        for nrate in self.sample.nrates:
+            if zero_time < nrate.end_time:
+                segment_time = zero_time - (nrate.end_time - nrate.waste_time)
+                point = nrate.start_point + int(round(segment_time * nrate.samp / 1000))
+                return min(point, nrate.end_point - 1)
+        return self.sample.count - 1
 
     def get_channel(self, index: Union[int, list[int]] = None,
                     channel_type: ChannelType = ChannelType.ANALOG,
@@ -207,50 +269,60 @@ class Configure(BaseModel):
             idx_type(IdxTyep)通道索引值类型，INDEX、CFGAN
         返回值:
             通道对象或通道对象数组（模拟量、开关量）
+        异常:
+            ValueError: 索引超出范围或cfg通道标识不存在时抛出
         """
         is_analog = channel_type == ChannelType.ANALOG
         # 索引如果为None，返回模拟量或开关量的所有通道
         if index is None:
             return self.analogs if is_analog else self.digitals
+        channels = self.analogs if is_analog else self.digitals
+        # 如果按照通道标识符查找，通过查找索引定位，通道标识不存在时报错
+        if idx_type != IdxType.INDEX and isinstance(index, (int, list)):
+            lookup = self.get_channel_lookup(channel_type)
+            if isinstance(index, int):
+                position = lookup.by_idx_cfg.get(index)
+                if position is None:
+                    raise ValueError(f"cfg通道标识不存在：{index}")
+                return channels[position]
+            return [channels[i] for i in lookup.positions(idx_cfg=index)]
         # 根据通道类型获取该类型的最大通道数量
         channel_num_max = self.channel_num.analog_num if is_analog else self.channel_num.digital_num
         # 如果索引值为int，判断索引值是否合法，如果合法返回该索引的通道对象
         if isinstance(index, int):
             if not (0 <= index < channel_num_max):
                 raise ValueError(f"索引超出范围！当前索引: {index}, 允许范围: [0, {channel_num_max})")
-            # 如果是按照索引值查找，返回对应的通道对象
-            if idx_type == IdxType.INDEX:
-                return self.analogs[index] if is_analog else self.digitals[index]
-            # 如果按照通道标识符查找，返回对应的通道对象数组
-            else:
-                return next((analog for analog in self.analogs if analog.idx_cfg == index),
-                            None) if is_analog else next(
-                    (digital for digital in self.digitals if digital.idx_cfg == index), None)
-
-        # 如果索引值为list，判断索引值是否合法，如果合法返回该索引的通道对象数组
+            return channels[index]
+        # 如果索引值为list，返回该索引的通道对象数组
         if isinstance(index, list):
-            if idx_type == IdxType.INDEX:
-                return [self.analogs[i] for i in index] if is_analog else [self.digitals[i] for i in index]
-            else:
-                return [self.analogs[i] for i in index if self.analogs[i].idx_cfg == index] if is_analog else [
-                    self.digitals[i] for i in index if self.digitals[i].idx_cfg == index]
-        raise TypeError("索引类型错误！需要 int 或 list 类型，但收到 {type(channel_idx).__name__}。")
+            return [channels[i] for i in index]
+        raise TypeError(f"索引类型错误！需要 int 或 list 类型，但收到 {type(index).__name__}。")
 
     def add_analog(self, analog: Analog, index: int = None):
-        if index is not None:
-            self.analogs.insert(index, analog)
-        else:
-            analog.index = len(self.analogs)
-            self.analogs.append(analog)
+        """
+        添加模拟量，同步更新通道查找索引
+        :param analog: 模拟量通道对象
+        :param index: 添加的位置，当为空时从列表的尾部添加
+        """
+        self._add_channel(self.analogs, ChannelType.ANALOG, analog, index)
 
     def add_digital(self, digital: Digital, index: int = None):
         """
-        添加开关量
+        添加开关量，同步更新通道查找索引
         :param digital: 开关量通道对象
         :param index: 添加的位置，当为空时从列表的尾部添加
         """
+        self._add_channel(self.digitals, ChannelType.DIGITAL, digital, index)
+
+    def _add_channel(self, channels: list, channel_type: ChannelType, channel, index: int = None):
+        """追加时增量更新查找索引，插入时其后通道的索引值后移，重新生成查找索引"""
         if index is not None:
-            self.digitals.insert(index, digital)
+            channels.insert(index, channel)
+            for i in range(index, len(channels)):
+                channels[i].index = i
+            self.rebuild_channel_lookup()
         else:
-            digital.index = len(self.digitals)
-            self.digitals.append(digital)
+            lookup = self.get_channel_lookup(channel_type)
+            channel.index = len(channels)
+            channels.append(channel)
+            lookup.add(channel, channel.index)
@@ -15,6 +15,55 @@ import pandas as pd
 from pydantic import BaseModel, Field, ConfigDict
 
 from py3comtrade.model.config_sample import ConfigSample
+from py3comtrade.model.nrate import Nrate
+
+
+def unpack_digital(words: np.ndarray, digital_num: int) -> np.ndarray:
+    """
+    将按16位打包的开关量字拆分为逐通道的状态值
+
+    参数:
+        words(np.ndarray) 开关量字数组，形状为(采样点数, 开关量字数)
+        digital_num(int) 开关量通道数
+    返回:
+        开关量状态数组，形状为(采样点数, 开关量通道数)
+    """
+    words = np.ascontiguousarray(words, dtype='<u2')
+    bits = np.unpackbits(words.view(np.uint8), axis=-1, bitorder='little')
+    return bits[:, :digital_num]
+
+
+def pack_digital(bits: np.ndarray, word_num: int = None) -> np.ndarray:
+    """
+    将逐通道的开关量状态值按16位打包为开关量字，第i个通道为第i//16个字的第i%16位
+
+    参数:
+        bits(np.ndarray) 开关量状态数组，形状为(采样点数, 开关量通道数)
+        word_num(int) 开关量字数，默认为按通道数向上取整
+    返回:
+        开关量字数组，uint16，形状为(采样点数, 开关量字数)
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    word_num = (bits.shape[-1] + 15) // 16 if word_num is None else word_num
+    packed = np.zeros((bits.shape[0], word_num * 2), dtype=np.uint8)
+    packed_bytes = np.packbits(bits, axis=-1, bitorder='little')
+    packed[:, :packed_bytes.shape[1]] = packed_bytes
+    return packed.view('<u2')
+
+
+def digital_bits(words: np.ndarray, channels) -> np.ndarray:
+    """
+    从按通道转置的开关量字矩阵中提取指定开关量通道的状态值，只复制所取通道的数据
+
+    参数:
+        words(np.ndarray) 开关量字矩阵，形状为(开关量字数, 采样点数)
+        channels(int,list[int],np.ndarray) 开关量通道序号，从0开始
+    返回:
+        开关量状态值，uint8，单个通道时形状为(采样点数,)，多个通道时为(通道数, 采样点数)
+    """
+    channels = np.asarray(channels)
+    shift = (channels % 16).astype(np.uint16)
+    return ((words[channels // 16] >> shift[..., None]) & 1).astype(np.uint8)
 
 
 class Data(BaseModel):
@@ -22,7 +71,10 @@ class Data(BaseModel):
     size: int = Field(default=0, description="文件大小")
     sample_time: np.ndarray = Field(default=None, description="采样时间")
     analog_value: np.ndarray = Field(default=None, description="模拟量值")
-    digital_value: np.ndarray = Field(default=None, description="开关量值")
+    digital_value: np.ndarray = Field(default=None,
+                                      description="开关量值，按16位打包的开关量字，uint16，形状为(采样点数, 开关量字数)")
+    digital_num: int = Field(default=0, description="开关量通道数")
+    lazy: bool = Field(default=False, description="是否为内存映射按需读取")
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -37,7 +89,7 @@ class Data(BaseModel):
         data = np.column_stack((
             self.sample_time.reshape(-1, 2),
             self.analog_value,
-            self.digital_value
+            unpack_digital(self.digital_value, self.digital_num)
         ))
 
         # 写入CSV文件
@@ -45,50 +97,33 @@ class Data(BaseModel):
 
     def write_binary(self, output_file_path: str, sample: ConfigSample):
         """
-        将数据写入二进制格式文件
+        将数据写入二进制格式文件，按采样信息中的数据文件类型写入BINARY、BINARY32或FLOAT32格式
 
         参数:
             output_file_path: 输出文件路径
             sample: 采样信息
         """
-        # 自定义dtype结构，与parse_binary方法兼容
-        dt = np.dtype([
-            ('timestamp', np.int32, 2),  # 2个int作为时间戳
-            ('analog', np.int16, sample.channel_num.analog_num),  # 模拟量
-            ('digital', np.uint16, sample.channel_num.digital_num // 16),  # 开关量
-        ])
+        # 按采样信息中的数据文件类型获取dtype结构，与read_binary_file方法兼容
+        dt = sample.record_dtype()
 
         # 创建空数组
         data = np.empty(sample.count, dtype=dt)
 
         # 填充数据
         data['timestamp'] = self.sample_time
-        data['analog'] = self.analog_value.astype(np.int16)
+        data['analog'] = self.analog_value.astype(sample.analog_dtype)
 
-        # 处理开关量 - 将位重新打包成uint16
-        # 确保digital_value是正确的形状
-        digital_shape = self.digital_value.shape
-        if len(digital_shape) == 1:
-            # 重塑为2D数组
-            self.digital_value = self.digital_value.reshape(-1, 1)
-
-        # 计算需要的字节数
-        bytes_needed = (self.digital_value.shape[1] + 7) // 8
-        digital_packed = np.zeros((self.digital_value.shape[0], bytes_needed), dtype=np.uint8)
-
-        # 手动打包位
-        for i in range(self.digital_value.shape[1]):
-            byte_idx = i // 8
-            bit_idx = i % 8
-            digital_packed[:, byte_idx] |= (self.digital_value[:, i] << bit_idx)
-
-        # 确保digital_packed的形状与data['digital']匹配
-        if digital_packed.shape[1] != data['digital'].shape[1]:
-            # 调整形状
-            digital_packed = digital_packed.reshape(data['digital'].shape)
-
-        data['digital'] = digital_packed.view(np.uint16)
+        # 开关量已按16位打包，与dat文件中的开关量字一致，直接写入
+        data['digital'] = self.digital_value
 
         # 写入文件
         with open(output_file_path, 'wb') as f:
             f.write(data.tobytes())
+
+
+class DataChunk(Data):
+    """
+    分块读取dat文件时的一个数据块，数据块不跨越采样段
+    """
+    nrate: Nrate = Field(default=None, description="数据块所在的采样段")
+    start_point: int = Field(default=0, description="数据块第一个采样点在录波中的位置，从0开始")
@@ -11,9 +11,13 @@
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
 
-from pydantic import Field
+from typing import List, Optional, Union
+
+import numpy as np
+from pydantic import Field, PrivateAttr
 
 from .channel import Channel
+from .data import digital_bits
 from .digital_change_status import DigitalChangeStatus
 from .type import Contact
 
@@ -25,6 +29,31 @@ class Digital(Channel):
     contact: Contact = Field(default=Contact.NORMALLY_OPEN, description="状态通道正常状态")
     change_status: DigitalChangeStatus = Field(default_factory=list, description="变位记录")
 
+    _raw: Optional[Union[List[int], np.ndarray]] = PrivateAttr(default_factory=list)
+    _words: Optional[np.ndarray] = PrivateAttr(default=None)
+
+    @property
+    def raw(self) -> Optional[Union[List[int], np.ndarray]]:
+        """
+        通道原始状态值，不是模型字段，不参与序列化。
+        绑定开关量字矩阵后首次访问时才从开关量字中提取本通道的状态值
+        """
+        if self._raw is None and self._words is not None:
+            self._raw = digital_bits(self._words, self.index)
+        return self._raw
+
+    @raw.setter
+    def raw(self, value: Optional[Union[List[int], np.ndarray]]):
+        self._raw = value
+
+    def bind_words(self, words: np.ndarray):
+        """
+        绑定按通道转置的开关量字矩阵，raw在首次访问时才从开关量字中提取本通道的状态值
+        :param words: 开关量字矩阵，形状为(开关量字数, 采样点数)
+        """
+        self._words = words
+        self._raw = None
+
     def clear(self) -> None:
         """清除模型中所有字段"""
         super().clear()
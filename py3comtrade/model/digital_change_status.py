@@ -12,7 +12,8 @@
 #  See the Mulan PSL v2 for more details.
 from typing import List
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class StatusRecord(BaseModel):
@@ -23,3 +24,70 @@ class StatusRecord(BaseModel):
 
 class DigitalChangeStatus(BaseModel):
     records: List[StatusRecord] = Field(default_factory=list, description="变位记录列表")
+
+
+class DigitalChangeIndex(BaseModel):
+    """
+    全部开关量通道的变位索引，以数组保存各通道初始状态和每次变位的通道序号、采样点号及变位后状态。
+    变位按通道序号、采样点号升序排列，StatusRecord仅在调用records时生成。
+    """
+    initial: np.ndarray = Field(description="各开关量通道第一个采样点的状态，形状为(通道数,)")
+    channel: np.ndarray = Field(description="发生变位的通道序号")
+    point: np.ndarray = Field(description="变位后第一个采样点的点号")
+    status: np.ndarray = Field(description="变位后的状态")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def from_words(cls, words: np.ndarray, digital_num: int) -> "DigitalChangeIndex":
+        """
+        对开关量字矩阵相邻采样点按位异或，得到全部通道的变位点，不拆分为逐通道的状态值
+        :param words: 开关量字矩阵，行为开关量字（第i个通道为第i//16行的第i%16位），列为采样点
+        :param digital_num: 开关量通道数
+        :return: 开关量变位索引
+        """
+        bit_shift = np.arange(16, dtype=np.uint16)
+        initial = np.zeros(digital_num, dtype=np.uint8)
+        if words.shape[1]:
+            initial = ((words[:, 0, None] >> bit_shift) & 1).reshape(-1)[:digital_num].astype(np.uint8)
+        # 只对发生变化的开关量字拆分变化位
+        word, point = np.nonzero(words[:, 1:] ^ words[:, :-1])
+        point += 1
+        flips = words[word, point] ^ words[word, point - 1]
+        row, bit = np.nonzero((flips[:, None] >> bit_shift) & 1)
+        channel = word[row] * 16 + bit
+        point = point[row]
+        order = np.lexsort((point, channel))
+        channel, point = channel[order], point[order]
+        status = ((words[channel // 16, point] >> (channel % 16).astype(np.uint16)) & 1).astype(np.uint8)
+        return cls(initial=initial, channel=channel, point=point, status=status)
+
+    def __len__(self):
+        return len(self.channel)
+
+    def changed_channels(self) -> np.ndarray:
+        """
+        获取发生过变位的通道序号
+        :return: 升序排列的通道序号数组
+        """
+        return np.unique(self.channel)
+
+    def channel_changes(self, channel_idx: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        获取指定通道的变位点号和变位后状态
+        :param channel_idx: 开关量通道序号，从0开始
+        :return: (变位点号数组, 变位后状态数组)
+        """
+        start, end = np.searchsorted(self.channel, [channel_idx, channel_idx + 1])
+        return self.point[start:end], self.status[start:end]
+
+    def records(self, channel_idx: int) -> list[StatusRecord]:
+        """
+        生成指定通道的变位记录，第一条为初始状态
+        :param channel_idx: 开关量通道序号，从0开始
+        :return: 变位记录列表
+        """
+        points, statuses = self.channel_changes(channel_idx)
+        records = [StatusRecord(timestamp=0, status=self.initial[channel_idx].item())]
+        records.extend(StatusRecord(timestamp=p, status=s) for p, s in zip(points.tolist(), statuses.tolist()))
+        return records
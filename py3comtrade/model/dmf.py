@@ -10,15 +10,36 @@
 #  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 
 from .analog_channel import AnalogChannel
 from .bus import Bus
 from .line import Line
 from .status_channel import StatusChannel
+from .primary_equipments import ACCBranch, ACVBranch
 from .transformer import Transformer
+from .type import EquipmentType
+
+# 通道所属设备反向索引中表示不属于任何设备
+NO_EQUIPMENT = -1
+
+
+def _acv_channels(branch: ACVBranch) -> list[int]:
+    """电压分支的通道索引号"""
+    return [branch.ua_idx, branch.ub_idx, branch.uc_idx, branch.un_idx, branch.ul_idx]
+
+
+def _acc_channels(branches: list[ACCBranch]) -> list[int]:
+    """电流分支的通道索引号"""
+    return [idx for branch in branches for idx in (branch.ia_idx, branch.ib_idx, branch.ic_idx, branch.in_idx)]
+
+
+def _valid_channels(idx_cfgs: list) -> np.ndarray:
+    """去掉未配置的通道索引号，保持首次出现的顺序"""
+    return np.array(list(dict.fromkeys(idx for idx in idx_cfgs if idx is not None and idx > 0)), dtype=np.intp)
 
 
 class DMF(BaseModel):
@@ -32,6 +53,132 @@ class DMF(BaseModel):
     buses: List[Bus] = Field(default_factory=list, description="母线")
     lines: List[Line] = Field(default_factory=list, description="线路")
     transformers: List[Transformer] = Field(default_factory=list, description="变压器")
+    bus_names: dict[str, int] = Field(default_factory=dict, exclude=True, repr=False,
+                                      description="母线名称到母线列表位置的映射")
+    bus_idxs: dict[int, int] = Field(default_factory=dict, exclude=True, repr=False,
+                                     description="母线索引号到母线列表位置的映射")
+    line_names: dict[str, int] = Field(default_factory=dict, exclude=True, repr=False,
+                                       description="线路名称到线路列表位置的映射")
+    transformer_names: dict[str, int] = Field(default_factory=dict, exclude=True, repr=False,
+                                              description="变压器名称到变压器列表位置的映射")
+    equipment_channels: dict[tuple[EquipmentType, str], np.ndarray] = Field(
+        default_factory=dict, exclude=True, repr=False, description="设备类型和名称到其模拟量通道索引号数组的映射")
+    channel_equipment_type: np.ndarray = Field(
+        default_factory=lambda: np.empty(0, dtype=np.int8), exclude=True, repr=False,
+        description="以模拟量通道索引号为下标的所属设备类型代码，不属于任何设备为-1")
+    channel_equipment: np.ndarray = Field(
+        default_factory=lambda: np.empty(0, dtype=np.intp), exclude=True, repr=False,
+        description="以模拟量通道索引号为下标的所属设备在对应设备列表中的位置，不属于任何设备为-1")
+    channel_winding: np.ndarray = Field(
+        default_factory=lambda: np.empty(0, dtype=np.intp), exclude=True, repr=False,
+        description="以模拟量通道索引号为下标的所属变压器绕组位置，不属于变压器绕组为-1")
+    indexed_counts: tuple = Field(default=(), exclude=True, repr=False, description="生成索引时的各设备数量")
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def __setattr__(self, name: str, value) -> None:
+        """替换母线、线路或变压器列表时同步重新生成索引"""
+        super().__setattr__(name, value)
+        if name in ("buses", "lines", "transformers"):
+            self.build_index()
+
+    def build_index(self):
+        """
+        生成母线、线路、变压器的名称索引和模拟量通道到所属设备的反向索引。
+        替换设备列表、增删设备及调用bus_edit时自动更新；直接修改设备的名称、索引号或分支的通道索引号后需调用。
+        母线包含电压分支和模拟量通道，线路包含电流分支和模拟量通道，变压器包含各绕组的电压、电流分支、
+        中性点电流通道和模拟量通道。一个通道被多个设备引用时（如变压器绕组引用母线电压），
+        反向索引按母线、线路、变压器的顺序取第一个设备，设备的通道索引号数组中仍包含该通道。
+        """
+        self.bus_names, self.bus_idxs, self.line_names, self.transformer_names = {}, {}, {}, {}
+        self.equipment_channels = {}
+        owners = []
+        for position, bus in enumerate(self.buses):
+            self.bus_names.setdefault(bus.name, position)
+            self.bus_idxs.setdefault(bus.idx, position)
+            channels = _acv_channels(bus.acv_chn) + [chn.idx_cfg for chn in bus.analog_chn]
+            owners.append((EquipmentType.BUS, bus.name, position, [(channels, NO_EQUIPMENT)]))
+        for position, line in enumerate(self.lines):
+            self.line_names.setdefault(line.name, position)
+            channels = _acc_channels(line.acc_bran) + [chn.idx_cfg for chn in line.ana_chn]
+            owners.append((EquipmentType.LINE, line.name, position, [(channels, NO_EQUIPMENT)]))
+        for position, transformer in enumerate(self.transformers):
+            self.transformer_names.setdefault(transformer.name, position)
+            groups = [(_acv_channels(winding.acv_chn) + _acc_channels(winding.acc_bran)
+                       + [winding.igap.zgap_idx, winding.igap.zsgap_idx], w)
+                      for w, winding in enumerate(transformer.transWinds)]
+            groups.append(([chn.idx_cfg for chn in transformer.ana_chn], NO_EQUIPMENT))
+            owners.append((EquipmentType.TRANSFORMER, transformer.name, position, groups))
+        size = max([idx for *_, groups in owners for channels, _ in groups for idx in _valid_channels(channels)],
+                   default=0) + 1
+        self.channel_equipment_type = np.full(size, NO_EQUIPMENT, dtype=np.int8)
+        self.channel_equipment = np.full(size, NO_EQUIPMENT, dtype=np.intp)
+        self.channel_winding = np.full(size, NO_EQUIPMENT, dtype=np.intp)
+        for equipment_type, name, position, groups in owners:
+            all_channels = []
+            for channels, winding in groups:
+                channels = _valid_channels(channels)
+                unowned = channels[self.channel_equipment_type[channels] == NO_EQUIPMENT]
+                self.channel_equipment_type[unowned] = equipment_type.value[0]
+                self.channel_equipment[unowned] = position
+                self.channel_winding[unowned] = winding
+                all_channels.extend(channels.tolist())
+            self.equipment_channels.setdefault((equipment_type, name), _valid_channels(all_channels))
+        self.indexed_counts = (len(self.buses), len(self.lines), len(self.transformers))
+
+    def _ensure_index(self):
+        """设备数量与生成索引时不一致（直接向设备列表追加或删除了设备）时重新生成索引"""
+        if self.indexed_counts != (len(self.buses), len(self.lines), len(self.transformers)):
+            self.build_index()
+
+    def get_equipment_channels(self, name: str, equipment_type: EquipmentType = EquipmentType.LINE) -> np.ndarray:
+        """
+        获取设备的全部模拟量通道索引号
+        :param name: 设备名称
+        :param equipment_type: 设备类型，默认为线路
+        :return: 通道索引号数组，设备不存在时为空数组
+        """
+        self._ensure_index()
+        channels = self.equipment_channels.get((equipment_type, name))
+        return channels if channels is not None else np.empty(0, dtype=np.intp)
+
+    def get_channel_equipment(self, idx_cfg: Union[int, list[int], np.ndarray]) -> tuple:
+        """
+        按模拟量通道索引号查找所属设备，支持多个通道一次查找
+        :param idx_cfg: 通道索引号或通道索引号数组
+        :return: (设备类型代码, 设备在对应列表中的位置, 变压器绕组位置)数组元组，不属于任何设备的位置均为-1
+        """
+        self._ensure_index()
+        idx_cfg = np.asarray(idx_cfg, dtype=np.intp)
+        inside = (idx_cfg >= 0) & (idx_cfg < self.channel_equipment_type.size)
+        clipped = np.where(inside, idx_cfg, 0)
+        return (np.where(inside, self.channel_equipment_type[clipped], NO_EQUIPMENT),
+                np.where(inside, self.channel_equipment[clipped], NO_EQUIPMENT),
+                np.where(inside, self.channel_winding[clipped], NO_EQUIPMENT))
+
+    def find_equipment_by_channel(self, idx_cfg: int) -> Optional[tuple[EquipmentType, Union[Bus, Line, Transformer]]]:
+        """
+        根据模拟量通道索引号查找所属设备
+        :param idx_cfg: 通道索引号
+        :return: 存在返回(设备类型, 设备)，不存在返回None
+        """
+        equipment_type, position, _ = (int(value) for value in self.get_channel_equipment(idx_cfg))
+        if equipment_type == NO_EQUIPMENT:
+            return None
+        equipment_type = next(member for member in EquipmentType if member.value[0] == equipment_type)
+        equipments = {EquipmentType.BUS: self.buses, EquipmentType.LINE: self.lines,
+                      EquipmentType.TRANSFORMER: self.transformers}[equipment_type]
+        return equipment_type, equipments[position]
+
+    def find_bus_by_idx(self, bus_idx: int) -> Optional[Bus]:
+        """
+        根据母线索引号查找母线
+        :param bus_idx: 母线索引号
+        :return: 存在返回母线，不存在返回None
+        """
+        self._ensure_index()
+        position = self.bus_idxs.get(bus_idx)
+        return None if position is None else self.buses[position]
 
     def is_bus_exist(self, bus_name: str) -> bool:
         """
@@ -39,7 +186,8 @@ class DMF(BaseModel):
         :param bus_name:母线标识
         :return: 存在返回True，不存在返回False
         """
-        return any(bus.name == bus_name for bus in self.buses)
+        self._ensure_index()
+        return bus_name in self.bus_names
 
     def is_line_exist(self, line_name: str) -> bool:
         """
@@ -47,7 +195,8 @@ class DMF(BaseModel):
         :param line_name:线路标识
         :return: 存在返回True，不存在返回False
         """
-        return any(line.name == line_name for line in self.lines)
+        self._ensure_index()
+        return line_name in self.line_names
 
     def is_transformer_exist(self, transformer_name: str) -> bool:
         """
@@ -55,7 +204,8 @@ class DMF(BaseModel):
         :param transformer_name:变压器标识
         :return: 存在返回True，不存在返回False
         """
-        return any(transformer.name == transformer_name for transformer in self.transformers)
+        self._ensure_index()
+        return transformer_name in self.transformer_names
 
     def find_bus_by_name(self, bus_name: str) -> Optional[tuple[int, Bus]]:
         """
@@ -63,10 +213,9 @@ class DMF(BaseModel):
         :param bus_name:母线标识
         :return: 存在返回母线，不存在返回None
         """
-        for index, bus in enumerate(self.buses):
-            if bus.name == bus_name:
-                return index, bus
-        return None
+        self._ensure_index()
+        index = self.bus_names.get(bus_name)
+        return None if index is None else (index, self.buses[index])
 
     def find_line_by_name(self, line_name: str) -> Optional[tuple[int, Line]]:
         """
@@ -74,10 +223,9 @@ class DMF(BaseModel):
         :param line_name:线路标识
         :return: 存在返回线路，不存在返回None
         """
-        for index, line in enumerate(self.lines):
-            if line.name == line_name:
-                return index, line
-        return None
+        self._ensure_index()
+        index = self.line_names.get(line_name)
+        return None if index is None else (index, self.lines[index])
 
     def find_transformer_by_name(self, transformer_name: str) -> Optional[tuple[int, Transformer]]:
         """
@@ -85,10 +233,22 @@ class DMF(BaseModel):
         :param transformer_name:变压器标识
         :return: 存在返回变压器，不存在返回None
         """
-        for index, transformer in enumerate(self.transformers):
-            if transformer.name == transformer_name:
-                return index, transformer
-        return None
+        self._ensure_index()
+        index = self.transformer_names.get(transformer_name)
+        return None if index is None else (index, self.transformers[index])
 
     def bus_edit(self, bus_name: str, **kwargs) -> None:
-        idx = kwargs.get('idx', 1)
+        """
+        修改母线的属性并重新生成索引
+        :param bus_name: 母线标识
+        :param kwargs: 要修改的母线属性，如name、idx、acv_chn
+        """
+        found = self.find_bus_by_name(bus_name)
+        if found is None:
+            raise ValueError(f"母线不存在：{bus_name}")
+        bus = found[1]
+        for field, value in kwargs.items():
+            if field not in Bus.model_fields:
+                raise ValueError(f"母线没有属性：{field}")
+            setattr(bus, field, value)
+        self.build_index()
@@ -4,9 +4,9 @@ from .analog_enum import BranNum, CtDirection, ElectricalUnit, PsType, AnalogTyp
     TvInstallation, WGFlag
 from .data_file_type import DataFileType
 from .digital_enum import SignalType, ChannelFlag, RelayFlag, BreakerFlag, WarningFlag, Contact
-from .mode_enum import ReadMode, SampleMode
+from .mode_enum import GroupMode, ReadMode, SampleMode
 from .phase_code import PhaseCode
-from .types import FilePath, FloatArray32, FloatArray64, IntArray32, IntArray64
+from .types import EquipmentType, FilePath, FloatArray32, FloatArray64, IntArray32, IntArray64
 
 __all__ = [ElectricalUnit,
            PsType,
@@ -26,7 +26,9 @@ __all__ = [ElectricalUnit,
            Contact,
            ReadMode,
            SampleMode,
+           GroupMode,
            PhaseCode,
+           EquipmentType,
            FilePath,
            FloatArray32,
            FloatArray64,
@@ -11,6 +11,30 @@
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
 from enum import Enum
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _code_table(enum_cls) -> tuple:
+    """
+    每个枚举类只构建一次的查找表
+    :param enum_cls: 枚举类
+    :return: (大写代码到成员的字典, 按成员定义顺序排列的(大写代码, 成员)元组)
+    """
+    codes = tuple((str(member.get_code()).upper(), member) for member in enum_cls)
+    exact = {}
+    for code, member in codes:
+        exact.setdefault(code, member)
+    return exact, codes
+
+
+@lru_cache(maxsize=4096)
+def _fuzzy_match(enum_cls, string: str):
+    """按成员定义顺序查找代码为字符串结尾的第一个成员，找不到时返回None"""
+    for code, member in _code_table(enum_cls)[1]:
+        if string.endswith(code):
+            return member
+    return None
 
 
 class BaseEnum(Enum):
@@ -33,13 +57,18 @@ class BaseEnum(Enum):
     def from_string(cls, string: str, fuzzy: bool = True, default=None):
         """
         尝试将给定的字符串转换为对应的枚举成员。
+        每个枚举类的代码查找表只构建一次，模糊匹配结果缓存在有界的LRU缓存中。
 
-        :param string: 要解析的字符串
+        :param string: 要解析的字符串，非字符串输入按str()转换，传入本类成员时直接返回
         :param fuzzy: 是否启用模糊匹配（如结尾匹配），默认开启
         :param default: 默认枚举值
         :return: 对应的枚举成员
         :raises ValueError: 如果找不到匹配项且未启用 fuzzy 或 fuzzy 也失败
         """
+        if isinstance(string, cls):
+            return string
+        if string is not None and not isinstance(string, str):
+            string = str(string)
         # 处理空字符串或空白字符串
         if not string or string.strip() == '':
             if default is not None:
@@ -49,16 +78,14 @@ class BaseEnum(Enum):
         string = string.strip().upper()
 
         # 精确匹配
-        for member in cls:
-            code = str(member.get_code()).upper()
-            if code == string:
-                return member
+        member = _code_table(cls)[0].get(string)
+        if member is not None:
+            return member
 
         # 模糊匹配（结尾匹配）
         if fuzzy:
-            for member in cls:
-                code = str(member.get_code()).upper()
-                if string.endswith(code):
-                    return member
+            member = _fuzzy_match(cls, string)
+            if member is not None:
+                return member
 
         raise ValueError(f"无法将 '{string}' 映射到 {cls.__name__} 枚举类型中")
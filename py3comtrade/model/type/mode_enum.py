@@ -18,9 +18,15 @@ class ReadMode(Enum):
     CFG = (1, "仅读取cfg文件")
     DAT = (2, "读取cfg和dat文件")
     DMF = (3, "读取cfg和dmf文件")
+    LAZY = (4, "读取cfg和dat文件，dat文件采用内存映射按需读取")
 
 
 class SampleMode(Enum):
     CENTERED = (0, "以当前点为中心，前后各取数据。")  # 表示以当前点为中心，前后各取数据。
     FORWARD = (1, "表示从起点向后取数据。")
     BACKWARD = (-1, "表示从终点向前取数据。")
+
+
+class GroupMode(Enum):
+    CCBM = (0, "按模拟量通道的被监视元件和相别分组")
+    DMF = (1, "按dmf文件中母线的电压通道和线路的电流分支分组")
@@ -28,3 +28,9 @@ class IdxType(Enum):
 class ChannelType(Enum):
     ANALOG = (0, "模拟通道")
     DIGITAL = (1, "开关量通道")
+
+
+class EquipmentType(Enum):
+    BUS = (0, "母线")
+    LINE = (1, "线路")
+    TRANSFORMER = (2, "变压器")
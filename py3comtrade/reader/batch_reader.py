@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from py3comtrade.model.type import ReadMode
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+from py3comtrade.reader.config_reader import config_reader
+from py3comtrade.utils.file_tools import file_finder
+
+
+class BatchResult(BaseModel):
+    """批量读取中单个录波文件的结果，读取失败时result为None，error为异常信息"""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    index: int = Field(..., description="文件在输入列表中的序号")
+    file_path: str = Field(..., description="cfg文件路径")
+    result: Any = Field(default=None, description="读取结果，按读取模式为Configure或Comtrade，指定处理函数时为其返回值")
+    error: Optional[str] = Field(default=None, description="异常类型及信息")
+    elapsed: float = Field(default=0.0, description="读取及处理耗时，单位s")
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def read_record(index: int, file_path: str, read_mode: ReadMode = ReadMode.FULL,
+                handler: Optional[Callable] = None) -> BatchResult:
+    """
+    读取单个录波文件，异常被捕获到结果中，不影响批量中的其他文件
+    :param index: 文件序号
+    :param file_path: cfg文件路径
+    :param read_mode: 读取模式，CFG模式使用config_reader，其余模式使用comtrade_reader
+    :param handler: 在工作进程中对读取结果进一步处理的函数，只将其返回值传回主进程，需可被pickle
+    :return: 读取结果
+    """
+    start = time.perf_counter()
+    try:
+        if read_mode == ReadMode.CFG:
+            record = config_reader(file_path)
+        else:
+            record = comtrade_reader(file_path, read_mode)
+        if handler is not None:
+            record = handler(record)
+        return BatchResult(index=index, file_path=file_path, result=record, elapsed=time.perf_counter() - start)
+    except Exception as e:
+        return BatchResult(index=index, file_path=file_path, error=f"{type(e).__name__}: {e}",
+                           elapsed=time.perf_counter() - start)
+
+
+def batch_reader(file_paths: Iterable[str], read_mode: ReadMode = ReadMode.FULL, handler: Optional[Callable] = None,
+                 max_workers: Optional[int] = None, max_in_flight: Optional[int] = None, ordered: bool = True,
+                 progress: Optional[Callable[[int, int, BatchResult], None]] = None) -> Iterator[BatchResult]:
+    """
+    使用进程池批量读取录波文件，逐个产出结果
+
+    参数:
+        file_paths: cfg文件路径列表
+        read_mode: 读取模式，CFG模式使用config_reader，其余模式使用comtrade_reader
+        handler: 在工作进程中对读取结果进一步处理的函数，如只需统计信息时可避免在进程间传递完整的录波数据
+        max_workers: 进程数，默认为CPU核数，为1时在当前进程中顺序读取
+        max_in_flight: 同时提交及等待产出的文件数上限，默认为进程数的2倍，限制大批量读取时的内存占用
+        ordered: 为True时按输入顺序产出结果，否则按完成顺序产出
+        progress: 进度回调函数，参数为已完成文件数、文件总数和当前结果
+    返回值:
+        BatchResult迭代器
+    """
+    file_paths = list(file_paths)
+    total = len(file_paths)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max(max_in_flight or 2 * max_workers, 1)
+    done = 0
+    if max_workers == 1:
+        for index, file_path in enumerate(file_paths):
+            result = read_record(index, file_path, read_mode, handler)
+            done += 1
+            if progress is not None:
+                progress(done, total, result)
+            yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        tasks = iter(enumerate(file_paths))
+        pending: set[Future] = set()
+        # 按序产出时先完成的结果暂存于此，等待前面的文件完成
+        finished: dict[int, BatchResult] = {}
+        next_index = 0
+
+        def submit():
+            while len(pending) + len(finished) < max_in_flight:
+                task = next(tasks, None)
+                if task is None:
+                    return
+                pending.add(executor.submit(read_record, task[0], task[1], read_mode, handler))
+
+        submit()
+        while pending:
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending.difference_update(completed)
+            for future in completed:
+                result = future.result()
+                done += 1
+                if progress is not None:
+                    progress(done, total, result)
+                if ordered:
+                    finished[result.index] = result
+                else:
+                    yield result
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+            submit()
+
+
+def batch_read_directory(directory: str, recursive: bool = False, **kwargs) -> Iterator[BatchResult]:
+    """
+    批量读取目录下的所有cfg文件
+    :param directory: 录波文件目录
+    :param recursive: 是否递归查找子目录
+    :param kwargs: 传递给batch_reader的其他参数
+    :return: BatchResult迭代器
+    """
+    return batch_reader(sorted(file_finder(directory, '.cfg', recursive)), **kwargs)
+
+
+def parse_arguments(args=None):
+    parser = argparse.ArgumentParser(description='批量读取录波文件。')
+    parser.add_argument('directory', type=str, help='录波文件目录')
+    parser.add_argument('-r', '--recursive', action='store_true', help='递归查找子目录中的cfg文件')
+    parser.add_argument('-m', '--mode', type=str, default='FULL', choices=[mode.name for mode in ReadMode],
+                        help='读取模式(默认FULL)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='进程数(默认为CPU核数)')
+    parser.add_argument('--in-flight', type=int, default=None, help='同时处理的文件数上限(默认为进程数的2倍)')
+    parser.add_argument('--unordered', action='store_true', help='按完成顺序输出结果')
+    return parser.parse_args(args)
+
+
+def record_summary(record) -> str:
+    """CLI中在工作进程内生成单个录波的概要信息，避免传回完整的录波数据"""
+    summary = f"{record.channel_num.analog_num}A/{record.channel_num.digital_num}D"
+    if getattr(record, "analog_raw", None) is not None:
+        summary += f"，{record.analog_raw.shape[1]}个采样点"
+    return summary
+
+
+def main(args=None):
+    args = parse_arguments(args)
+    start = time.perf_counter()
+    failed = []
+
+    def progress(done: int, total: int, result: BatchResult):
+        print(f"[{done}/{total}] {result.file_path} {result.result if result.ok else result.error}")
+        if not result.ok:
+            failed.append(result)
+
+    results = batch_read_directory(args.directory, args.recursive, read_mode=ReadMode[args.mode],
+                                   handler=record_summary, max_workers=args.workers,
+                                   max_in_flight=args.in_flight, ordered=not args.unordered, progress=progress)
+    total = sum(1 for _ in results)
+    print(f"共读取{total}个文件，失败{len(failed)}个，耗时{time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
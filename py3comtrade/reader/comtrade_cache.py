@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright (c) [2019] [name of copyright holder]
+#  [py3comtrade] is licensed under Mulan PSL v2.
+#  You can use this software according to the terms and conditions of the Mulan
+#  PSL v2.
+#  You may obtain a copy of Mulan PSL v2 at:
+#           http://license.coscl.org.cn/MulanPSL2
+#  THIS SOFTWARE IS PROVIDED ON CFGAN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY
+#  KIND, EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+#  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+#  See the Mulan PSL v2 for more details.
+import hashlib
+import os
+import pickle
+import shutil
+import time
+from typing import Optional
+
+import numpy as np
+
+from py3comtrade.model import Comtrade
+from py3comtrade.model.data import Data
+from py3comtrade.model.type import FilePath, ReadMode
+
+# 抽样指纹读取文件首尾的字节数，较小的文件读取全部内容
+HASH_BLOCK_BYTES = 64 * 1024
+# 对全部内容取摘要时每次读取的字节数
+FULL_HASH_BLOCK_BYTES = 1024 * 1024
+CACHE_VERSION = 1
+MATRICES = ("sample_time", "analog_raw", "digital_raw")
+
+
+def file_signature(file_path: str, full_hash: bool = False) -> bytes:
+    """
+    文件签名，由路径、大小、修改时间和文件内容的摘要组成，文件不存在时只包含路径。
+    默认为抽样指纹，超过2*HASH_BLOCK_BYTES的文件只对首尾各HASH_BLOCK_BYTES字节取摘要，
+    文件中部的内容被改写而大小和修改时间均不变时签名不变；full_hash为True时对全部内容取摘要
+    :param file_path: 文件路径
+    :param full_hash: 是否对文件全部内容取摘要，默认为False，只取首尾内容
+    :return: 签名字节串
+    """
+    if not file_path:
+        return b""
+    digest = hashlib.blake2b(os.path.abspath(file_path).encode("utf-8"), digest_size=16)
+    if not os.path.isfile(file_path):
+        return digest.digest()
+    stat = os.stat(file_path)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode("ascii"))
+    with open(file_path, "rb") as f:
+        if full_hash:
+            while block := f.read(FULL_HASH_BLOCK_BYTES):
+                digest.update(block)
+        elif stat.st_size <= 2 * HASH_BLOCK_BYTES:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(HASH_BLOCK_BYTES))
+            f.seek(-HASH_BLOCK_BYTES, os.SEEK_END)
+            digest.update(f.read(HASH_BLOCK_BYTES))
+    return digest.digest()
+
+
+class ComtradeCache:
+    """
+    comtrade_reader读取结果的磁盘缓存，按需启用。
+    每条缓存为一个目录，解析后的配置、dmf模型和开关量变位索引以pickle保存，采样时间和采样值矩阵以npy保存。
+    命中时的结果与读取模式一致：LAZY模式下采样时间和采样值矩阵为只读的内存映射，其他模式下读入内存。
+    缓存键默认使用录波文件的抽样指纹(见file_signature)，文件内容被原地改写而大小和修改时间不变时可能命中旧的缓存，
+    此时可设置full_hash对文件全部内容取摘要。缓存总大小超过上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3, full_hash: bool = False):
+        """
+        :param cache_dir: 缓存目录，不存在时自动创建
+        :param max_bytes: 缓存总大小上限，单位字节
+        :param full_hash: 缓存键是否对录波文件全部内容取摘要，默认为False，只取文件首尾内容，每次读取时开销较小
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.full_hash = full_hash
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, files: FilePath, read_mode: ReadMode) -> str:
+        """
+        缓存键，cfg、dat、dmf任一文件的路径、大小、修改时间或参与摘要的内容变化时缓存键随之变化
+        :param files: 录波文件路径
+        :param read_mode: 读取模式
+        :return: 缓存键
+        """
+        digest = hashlib.blake2b(f"{CACHE_VERSION}:{read_mode.name}:{int(self.full_hash)}".encode("ascii"),
+                                 digest_size=20)
+        for name in ("cfg_path", "dat_path", "dmf_path"):
+            digest.update(file_signature(files.get(name), self.full_hash))
+        return digest.hexdigest()
+
+    def load(self, files: FilePath, read_mode: ReadMode) -> Optional[Comtrade]:
+        """
+        读取缓存，LAZY模式下采样时间和采样值矩阵为只读的内存映射，其他模式下读入内存
+        :param files: 录波文件路径
+        :param read_mode: 读取模式
+        :return: 命中时返回Comtrade对象，否则返回None
+        """
+        entry = os.path.join(self.cache_dir, self.key(files, read_mode))
+        meta_path = os.path.join(entry, "comtrade.pkl")
+        try:
+            with open(meta_path, "rb") as f:
+                comtrade, change_index, changed = pickle.load(f)
+            mmap_mode = "r" if read_mode == ReadMode.LAZY else None
+            matrices = {name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode=mmap_mode)
+                        for name in MATRICES if os.path.exists(os.path.join(entry, f"{name}.npy"))}
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return None
+        if "analog_raw" in matrices:
+            comtrade.load_data(Data(file_path=files.get("dat_path"),
+                                    sample_time=matrices["sample_time"],
+                                    analog_value=matrices["analog_raw"].T,
+                                    digital_value=matrices["digital_raw"].T,
+                                    digital_num=comtrade.channel_num.digital_num,
+                                    lazy=mmap_mode is not None))
+            comtrade.change_index = change_index
+            if changed is not None:
+                comtrade.digital_change = [comtrade.digitals[i] for i in changed]
+        self._touch(meta_path)
+        return comtrade
+
+    def store(self, files: FilePath, read_mode: ReadMode, comtrade: Comtrade):
+        """
+        写入缓存，先写入临时目录再整体改名，并发读写同一录波时不会读到不完整的缓存
+        :param files: 录波文件路径
+        :param read_mode: 读取模式
+        :param comtrade: comtrade_reader刚读取的Comtrade对象
+        """
+        key = self.key(files, read_mode)
+        entry = os.path.join(self.cache_dir, key)
+        if os.path.exists(entry):
+            return
+        tmp_entry = os.path.join(self.cache_dir, f".{key}.{os.getpid()}.tmp")
+        os.makedirs(tmp_entry, exist_ok=True)
+        try:
+            matrices = {name: getattr(comtrade, name) for name in MATRICES if getattr(comtrade, name) is not None}
+            for name, matrix in matrices.items():
+                np.save(os.path.join(tmp_entry, f"{name}.npy"), np.ascontiguousarray(matrix))
+            # 采样值以npy单独保存，pickle的是不含采样值矩阵及各通道视图的副本，不修改调用方的对象
+            digitals = [digital.model_copy() for digital in comtrade.digitals]
+            for digital in digitals:
+                digital.raw = []
+                digital._words = None
+            state = comtrade.model_copy(update={name: None for name in MATRICES} | {
+                "change_index": None,
+                "analogs": [analog.model_copy(update={"raw": []}) for analog in comtrade.analogs],
+                "digitals": digitals})
+            state._instant_cache = {}
+            state._digital_change = None
+            # 变位开关量以通道序号保存，读取时对应到副本中的通道
+            changed = None if comtrade._digital_change is None else [d.index for d in comtrade._digital_change]
+            with open(os.path.join(tmp_entry, "comtrade.pkl"), "wb") as f:
+                pickle.dump((state, comtrade.change_index, changed), f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._touch(os.path.join(tmp_entry, "comtrade.pkl"))
+            size = self._entry_size(tmp_entry)
+            if size > self.max_bytes:
+                return
+            os.replace(tmp_entry, entry)
+        except OSError:
+            # 其他进程已写入同一缓存或磁盘不可写时放弃本次缓存，不影响读取结果
+            pass
+        finally:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        """按最近访问时间从旧到新删除缓存，直至总大小不超过上限"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            size = self._entry_size(entry)
+            try:
+                accessed = os.stat(os.path.join(entry, "comtrade.pkl")).st_mtime_ns
+            except OSError:
+                accessed = 0
+            entries.append((accessed, size, entry))
+            total += size
+        for accessed, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """清空缓存目录"""
+        for name in os.listdir(self.cache_dir):
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+    def size(self) -> int:
+        """缓存总大小，单位字节"""
+        return sum(self._entry_size(os.path.join(self.cache_dir, name)) for name in os.listdir(self.cache_dir)
+                   if os.path.isdir(os.path.join(self.cache_dir, name)))
+
+    @staticmethod
+    def _touch(meta_path: str):
+        """以修改时间记录最近访问时间，供淘汰时排序。显式写入当前时间，避免文件系统时间戳精度不足时无法区分先后"""
+        now = time.time_ns()
+        os.utime(meta_path, ns=(now, now))
+
+    @staticmethod
+    def _entry_size(entry: str) -> int:
+        size = 0
+        for name in os.listdir(entry):
+            try:
+                size += os.path.getsize(os.path.join(entry, name))
+            except OSError:
+                pass
+        return size
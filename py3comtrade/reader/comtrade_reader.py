@@ -11,12 +11,18 @@
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
 import os
+import warnings
+import xml.etree.ElementTree as ET
+from typing import Optional, Union
 
 from py3comtrade.model import Comtrade
+from py3comtrade.model.dmf import DMF
 from py3comtrade.model.type import FilePath
 from py3comtrade.model.type import ReadMode
+from py3comtrade.reader.comtrade_cache import ComtradeCache
 from py3comtrade.reader.config_reader import config_reader
 from py3comtrade.reader.data_reader import data_reader
+from py3comtrade.reader.dmf_reader import dmf_stream_parser
 
 
 def get_comtrade_path(_file_path: str) -> FilePath:
@@ -57,17 +63,33 @@ def get_comtrade_path(_file_path: str) -> FilePath:
         return FilePath(cfg_path="", dat_path="", dmf_path="")
 
 
-def comtrade_reader(_file_path: str, read_mode: ReadMode = ReadMode.FULL) -> Comtrade:
+def comtrade_reader(_file_path: str, read_mode: ReadMode = ReadMode.FULL,
+                    cache: Optional[Union[ComtradeCache, str]] = None) -> Comtrade:
     """
     读取Comtrade数据
 
     参数:
         _file_path(str): 文件路径
-        read_mode: 读取模式
+        read_mode: 读取模式，LAZY模式下二进制dat文件采用内存映射，仅在访问通道或采样范围时读取对应数据
+        cache: 磁盘缓存或缓存目录，默认不使用缓存。命中缓存时不再解析录波文件，结果与读取模式一致，仅LAZY模式下采样值矩阵为只读的内存映射；
+            缓存键默认使用文件首尾内容的抽样指纹，需对全部内容取摘要时传入ComtradeCache(cache_dir, full_hash=True)
     返回:
         Comtrade对象
     """
     files = get_comtrade_path(_file_path)
+    if cache is not None:
+        if not isinstance(cache, ComtradeCache):
+            cache = ComtradeCache(cache)
+        _comtrade = cache.load(files, read_mode)
+        if _comtrade is None:
+            _comtrade = _read_comtrade(_file_path, files, read_mode)
+            cache.store(files, read_mode, _comtrade)
+        return _comtrade
+    return _read_comtrade(_file_path, files, read_mode)
+
+
+def _read_comtrade(_file_path: str, files: FilePath, read_mode: ReadMode) -> Comtrade:
+    """解析录波文件生成Comtrade对象"""
     cfg = config_reader(files.get("cfg_path"))
     _comtrade: Comtrade = Comtrade(file_path=files,
                                    header=cfg.header,
@@ -78,27 +100,40 @@ def comtrade_reader(_file_path: str, read_mode: ReadMode = ReadMode.FULL) -> Com
                                    file_start_time=cfg.file_start_time,
                                    fault_time=cfg.fault_time,
                                    timemult=cfg.timemult)
-    if read_mode in [ReadMode.DAT, ReadMode.FULL]:
+    if read_mode in [ReadMode.DAT, ReadMode.FULL, ReadMode.LAZY]:
         try:
-            dat = data_reader(files.get("dat_path"), cfg.sample)
-            _comtrade.sample_time = dat.sample_time.tolist()
-            for analog in _comtrade.analogs:
-                analog.raw = dat.analog_value.T[analog.index, :].tolist()
-                # analog.instants = np.round(vs * analog.a + analog.b, 3).tolist()
-            for digital in _comtrade.digitals:
-                digital.raw = dat.digital_value.T[digital.index, :].tolist()
+            dat = data_reader(files.get("dat_path"), cfg.sample, read_mode)
+            _comtrade.load_data(dat)
         except ValueError as e:
-            raise f"{_file_path}文件解析失败：{e}"
-        _comtrade.analyze_digital_change_status()
+            raise ValueError(f"{_file_path}文件解析失败：{e}") from e
+        if read_mode != ReadMode.LAZY:
+            # 按需读取时不在打开文件时分析开关量，首次获取变位开关量时再分析
+            _comtrade.analyze_digital_change_status()
     if read_mode in [ReadMode.DMF, ReadMode.FULL]:
-        pass
+        _comtrade.dmf = _read_dmf(files.get("dmf_path"))
     return _comtrade
 
 
+def _read_dmf(dmf_path: str) -> Optional[DMF]:
+    """
+    读取录波对应的dmf模型文件，dmf文件为可选文件，不存在或无法解析时不影响录波数据的读取
+    :param dmf_path: dmf文件路径
+    :return: DMF对象，文件不存在或解析失败时返回None，解析失败时给出警告
+    """
+    if not dmf_path or not os.path.exists(dmf_path):
+        return None
+    try:
+        return dmf_stream_parser(dmf_path)
+    except (ET.ParseError, ValueError, AttributeError) as e:
+        # 格式错误、属性值不符合模型(pydantic的ValidationError为ValueError)或缺少必需的子元素
+        warnings.warn(f"{dmf_path}文件解析失败：{e}")
+        return None
+
+
 if __name__ == '__main__':
     file_path = r'D:\codeArea\gitee\comtradeOfPython\tests\data\xtz.cfg'
     comtrade = comtrade_reader(file_path, ReadMode.DAT)
     raw_a = comtrade.get_raw_by_analog_indices()
     raw_d = comtrade.get_instant_by_digital_indices()
-    for dc in comtrade.digital_change:
+    for dc in comtrade.get_digital_change():
         print(dc.name, dc.idx_cfg, dc.phase)
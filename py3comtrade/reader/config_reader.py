@@ -11,8 +11,7 @@
 #  NON-INFRINGEMENT, MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 #  See the Mulan PSL v2 for more details.
 import os
-
-import chardet
+from itertools import islice
 
 from .analog_parser import analog_parser
 from .channel_num_parser import channel_num_parser
@@ -23,19 +22,7 @@ from ..model import Configure
 from ..model import PrecisionTime
 from ..model import TimeMult
 from ..model.type import DataFileType
-
-
-def detect_file_encoding(file_path):
-    """
-    检测文件的编码格式
-    :param file_path: 文件路径
-    :return: 文件的编码格式
-    """
-    with open(file_path, "rb") as file:
-        raw_data = file.read()
-        result = chardet.detect(raw_data)
-        encoding = result["encoding"]
-        return encoding
+from ..utils.file_tools import detect_file_encoding
 
 
 def read_file(file_path):
@@ -52,6 +39,26 @@ def read_file(file_path):
         return content
 
 
+def _parse_sample_info(_configure: Configure, cfg_content: list[str]):
+    """
+    解析通道信息之后的采样频率、采样段、文件起始时间、故障时间、数据文件类型和时间倍率
+    :param _configure: 已解析文件头和通道数量的配置对象
+    :param cfg_content: 剩余的cfg文件行
+    """
+    _configure.sample = create_nrates(cfg_content.pop(0),
+                                      cfg_content.pop(0))
+    for i in range(_configure.sample.nrate_num):
+        _configure.sample.add_nrate(create_nrate(cfg_content.pop(0)))
+    _configure.sample.channel_num = _configure.channel_num
+    _configure.sample.calc_sampling()
+    _configure.file_start_time = PrecisionTime(cfg_content.pop(0))
+    _configure.fault_time = PrecisionTime(cfg_content.pop(0))
+    _configure.sample.data_file_type = DataFileType.from_string(cfg_content.pop(0))
+    _configure.sample.calc_sampling()
+    if cfg_content:
+        _configure.timemult = TimeMult(timemult=float(cfg_content.pop(0)))
+
+
 def config_reader(cfg_file_name) -> Configure:
     cfg_content = read_file(cfg_file_name)
     _configure = Configure()
@@ -62,23 +69,44 @@ def config_reader(cfg_file_name) -> Configure:
             _configure.add_analog(analog_parser(cfg_content.pop(0)))
         for i in range(_configure.channel_num.digital_num):
             _configure.add_digital(digital_parser(cfg_content.pop(0)))
-        _configure.sample = create_nrates(cfg_content.pop(0),
-                                          cfg_content.pop(0))
-        for i in range(_configure.sample.nrate_num):
-            _configure.sample.add_nrate(create_nrate(cfg_content.pop(0)))
-        _configure.sample.channel_num = _configure.channel_num
-        _configure.sample.calc_sampling()
-        _configure.file_start_time = PrecisionTime(cfg_content.pop(0))
-        _configure.fault_time = PrecisionTime(cfg_content.pop(0))
-        _configure.sample.data_file_type = DataFileType.from_string(cfg_content.pop(0))
-        _configure.sample.calc_sampling()
-        if cfg_content:
-            _configure.timemult = TimeMult(timemult=float(cfg_content.pop(0)))
+        _parse_sample_info(_configure, cfg_content)
     except IndexError:
         raise ValueError("cfg文件格式错误")
     return _configure
 
 
+def config_header_reader(cfg_file_name) -> Configure:
+    """
+    快速读取cfg文件的概要信息，用于批量编目等只需要厂站名称、通道数量、起始时间和采样率的场景。
+    只解析文件头、通道数量和采样信息，模拟量和开关量通道行按行数直接跳过，不解码也不创建通道对象，
+    返回的配置对象中模拟量和开关量通道列表为空。
+
+    参数:
+        cfg_file_name(str) cfg文件路径
+    返回:
+        Configure对象
+    """
+    if not os.path.exists(cfg_file_name):
+        raise FileNotFoundError(f"文件不存在: {cfg_file_name}")
+    encoding = detect_file_encoding(cfg_file_name)
+    if encoding is None:
+        raise ValueError("无法确定文件编码格式")
+    _configure = Configure()
+    try:
+        with open(cfg_file_name, "rb") as f:
+            lines = (line for line in f if line.strip())
+            _configure.header = header_parser(next(lines).decode(encoding))  # 解析cfg文件头
+            _configure.channel_num = channel_num_parser(next(lines).decode(encoding))  # 解析通道数量
+            # 跳过模拟量和开关量通道行
+            skip = _configure.channel_num.analog_num + _configure.channel_num.digital_num
+            next(islice(lines, skip, skip), None)
+            cfg_content = [line.decode("latin-1").strip() for line in lines]
+        _parse_sample_info(_configure, cfg_content)
+    except (IndexError, StopIteration):
+        raise ValueError("cfg文件格式错误")
+    return _configure
+
+
 if __name__ == "__main__":
     configure = config_reader(r"D:\codeArea\gitee\comtradeOfPython\tests\data\hjz.cfg")
     print(configure.header.version)
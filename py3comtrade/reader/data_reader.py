@@ -12,31 +12,52 @@
 #  See the Mulan PSL v2 for more details.
 
 import struct
+import warnings
+from itertools import islice
+from typing import Iterator
 
 import numpy as np
-import pandas as pd
 
 from ..model.config_sample import ConfigSample
-from ..model.data import Data
-from ..model.type import DataFileType
+from ..model.data import Data, DataChunk, pack_digital
+from ..model.type import DataFileType, ReadMode
 
+# ASCII文件每次解析的行数，峰值内存约为最终数组加上该行数的文本和解析缓冲
+ASCII_CHUNK_ROWS = 10000
 
-def digital_split(datas: tuple) -> list:
+
+def parse_ascii_lines(lines: list[bytes], columns: int) -> np.ndarray:
     """
-    将开关量整数数组拆分成数组
-    :return: dat
+    将若干行ASCII格式的采样数据解析为二维数组
+
+    参数:
+        lines (list[bytes]): 数据文件中的若干行
+        columns (int): 每行的列数，即采样序号、时间戳和全部通道
+    返回:
+        形状为(行数, 列数)的数组，全部为int32范围内的整数时为int32，否则为float64
+    异常:
+        ValueError: 当数据无法解析或列数与配置不一致时抛出
     """
-    digitals = []
-    for data in datas:
-        binary_array = [(data >> i) & 1 for i in range(15, -1, -1)]
-        binary_array.reverse()
-        digitals.extend(binary_array)
-    return digitals
+    # 由numpy的C解析器整块解析，空行自动跳过。先按整数解析，不为判断是否含小数而扫描或复制文本；
+    # 遇到小数或超出int32范围时numpy给出DeprecationWarning(今后版本为ValueError)，转为异常后按浮点数重新解析
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.loadtxt(lines, dtype=np.int32, delimiter=",", ndmin=2)
+    except (ValueError, DeprecationWarning):
+        try:
+            values = np.loadtxt(lines, dtype=np.float64, delimiter=",", ndmin=2)
+        except ValueError as e:
+            raise ValueError(f"数据文件格式错误：{e}") from e
+    if values.size and values.shape[1] != columns:
+        raise ValueError(f"数据文件格式错误：每行应有{columns}列，实际为{values.shape[1]}列")
+    return values
 
 
 def read_ascii_file(file_path: str, _sample: ConfigSample):
     """
-    读取ASCII格式的数据文件并解析为样本数据
+    读取ASCII格式的数据文件并解析为样本数据。
+    按采样信息预先分配数组，分块解析后直接写入，峰值内存接近最终数组大小。
 
     参数:
         file_path (str): 要读取的ASCII格式的comtrade文件路径
@@ -45,49 +66,71 @@ def read_ascii_file(file_path: str, _sample: ConfigSample):
     返回:
         Data: 包含解析后数据的Data对象，包含以下属性：
             - file_path: 文件路径
-            - sample_time: 采样时间数据（前2列）
-            - analog_value: 模拟量数据（第3列到模拟量通道数+2列）
-            - digital_value: 数字量数据（模拟量通道数+2列之后的所有列）
+            - sample_time: 采样序号及时间戳（前2列），与二进制格式一致为int32
+            - analog_value: 模拟量数据（第3列到模拟量通道数+2列），整数时为int32，存在小数时为float64
+            - digital_value: 开关量数据（模拟量通道数+2列之后的所有列），按16位打包为开关量字，uint16
 
     异常:
         ValueError: 当文件数据格式与配置不匹配时抛出
     """
-    # 读取CSV格式的ASCII文件内容
-    with open(file_path, 'r') as f:
-        content = pd.read_csv(f, header=None)
-        # 验证数据文件的行列数是否与配置匹配
-        if _sample.count != content.shape[0] or _sample.channel_num.total_num != content.shape[1]:
-            raise ValueError("数据文件格式错误")
-
-    # 按列分割数据：前2列为采样时间，中间为模拟量数据，剩余为数字量数据
-    sample_time = content[:, 0:2]
-    analog_value = content[:, 2:_sample.channel_num.analog_num + 2]
-    digital_value = content[:, _sample.channel_num.analog_num + 2:]
+    analog_num = _sample.channel_num.analog_num
+    digital_num = _sample.channel_num.digital_num
+    columns = analog_num + digital_num + 2
+    count = _sample.count
+    sample_time = np.empty((count, 2), dtype=np.int32)
+    analog_value = np.empty((count, analog_num), dtype=np.int32)
+    digital_value = np.empty((count, _sample.digital_word_num), dtype=np.uint16)
+
+    row = 0
+    with open(file_path, 'rb') as f:
+        while lines := list(islice(f, ASCII_CHUNK_ROWS)):
+            block = parse_ascii_lines(lines, columns)
+            end = row + block.shape[0]
+            if end > count:
+                raise ValueError(f"数据文件格式错误：采样点数超过配置的{count}个")
+            if block.dtype.kind == 'f' and analog_value.dtype.kind != 'f':
+                analog_value = analog_value.astype(np.float64)
+            sample_time[row:end] = block[:, 0:2]
+            analog_value[row:end] = block[:, 2:analog_num + 2]
+            digital_value[row:end] = pack_digital(block[:, analog_num + 2:], _sample.digital_word_num)
+            row = end
+    # 验证数据文件的行数是否与配置匹配
+    if row != count:
+        raise ValueError(f"数据文件格式错误：配置的采样点数为{count}，实际为{row}")
 
     # 构造并返回Data对象
     return Data(file_path=file_path,
                 sample_time=sample_time,
                 analog_value=analog_value,
-                digital_value=digital_value)
+                digital_value=digital_value,
+                digital_num=digital_num)
 
 
-def read_binary_file(file_path: str, _sample: ConfigSample):
+def read_binary_file(file_path: str, _sample: ConfigSample, lazy: bool = False):
     """
-    读取二进制文件并解析为结构化数据
+    读取二进制文件并解析为结构化数据，支持BINARY、BINARY32和FLOAT32格式
 
     参数:
         file_path (str): 二进制文件的路径
         _sample (ConfigSample): 配置样本对象，包含通道数量等配置信息
+        lazy (bool): 是否采用内存映射按需读取，默认为False，读取整个文件到内存
 
     返回:
-        Data: 包含解析后数据的对象，包括时间戳、模拟量和开关量数据
+        Data: 包含解析后数据的对象，包括时间戳、模拟量和开关量数据，开关量保持文件中按16位打包的开关量字。
+        按需读取时各部分均为内存映射的视图，仅在访问对应采样点时才从磁盘读取
     """
-    # 定义数据结构类型，用于解析二进制数据
-    dt = np.dtype([
-        ('timestamp', np.int32, 2),  # 2个int作为时间戳
-        ('analog', np.int16, _sample.channel_num.analog_num),  # 模拟量
-        ('digital', np.uint16, _sample.channel_num.digital_num // 16),  # 开关量
-    ])
+    # 定义数据结构类型，用于解析二进制数据，模拟量按BINARY、BINARY32、FLOAT32分别为int16、int32、float32
+    dt = _sample.record_dtype()
+
+    if lazy:
+        # 将文件按结构类型映射为只读数组，不读取文件内容
+        data = np.memmap(file_path, dtype=dt, mode='r')
+        return Data(file_path=file_path,
+                    sample_time=data['timestamp'],
+                    analog_value=data['analog'],
+                    digital_value=data['digital'],
+                    digital_num=_sample.channel_num.digital_num,
+                    lazy=True)
 
     # 读取整个二进制文件到内存缓冲区
     with open(file_path, 'rb') as f:
@@ -97,22 +140,20 @@ def read_binary_file(file_path: str, _sample: ConfigSample):
     data = np.frombuffer(buffer, dtype=dt)
 
     # 提取各部分
-    sample_time = data['timestamp']
-    analog_value = data['analog']
-    digital_value = np.unpackbits(data['digital'].view(np.uint8), bitorder='little', axis=-1)
     return Data(file_path=file_path,
-                sample_time=sample_time,
-                analog_value=analog_value,
-                digital_value=digital_value)
+                sample_time=data['timestamp'],
+                analog_value=data['analog'],
+                digital_value=data['digital'],
+                digital_num=_sample.channel_num.digital_num)
 
 
 def read_binary(file_path: str, _sample: ConfigSample):
-    str_struct = f"ii{_sample.analog_sampe_word // 2}h{_sample.digital_sampe_word // 2}H"
+    analog_code = {DataFileType.BINARY32: "i", DataFileType.FLOAT32: "f"}.get(_sample.data_file_type, "h")
+    str_struct = f"<ii{_sample.channel_num.analog_num}{analog_code}{_sample.digital_word_num}H"
     sample_time = np.zeros((_sample.count, 2), dtype=np.int32)
     analog_value = np.zeros((_sample.count, _sample.channel_num.analog_num),
                             dtype=np.float32)
-    digital_value = np.zeros((_sample.count, _sample.channel_num.digital_num),
-                             dtype=np.int32)
+    digital_value = np.zeros((_sample.count, _sample.digital_word_num), dtype=np.uint16)
     with open(file_path, 'rb') as f:
         for i in range(_sample.count):
             byte_str = f.read(_sample.total_sampe_word)
@@ -121,15 +162,91 @@ def read_binary(file_path: str, _sample: ConfigSample):
             sample_struct = struct.unpack(str_struct, byte_str)
             sample_time[i:] = sample_struct[0:2]
             analog_value[i:] = sample_struct[2:2 + _sample.channel_num.analog_num]
-            digital_value[i:] = digital_split(sample_struct[2 + _sample.channel_num.analog_num:])
+            digital_value[i:] = sample_struct[2 + _sample.channel_num.analog_num:]
     return Data(file_path=file_path,
                 sample_time=sample_time,
                 analog_value=analog_value,
-                digital_value=digital_value)
+                digital_value=digital_value,
+                digital_num=_sample.channel_num.digital_num)
+
 
+def data_reader(file_path: str, _sample: ConfigSample, read_mode: ReadMode = ReadMode.FULL) -> Data:
+    """
+    根据采样信息中的数据文件类型读取dat文件
 
-def data_reader(file_path: str, _sample: ConfigSample) -> Data:
+    参数:
+        file_path (str): dat文件路径
+        _sample (ConfigSample): 采样信息对象
+        read_mode (ReadMode): 读取模式，为LAZY时二进制文件采用内存映射按需读取，ASCII文件仍完整读取
+    返回:
+        Data对象
+    """
     if _sample.data_file_type.value == DataFileType.ASCII.value:
         return read_ascii_file(file_path, _sample)
     else:
-        return read_binary_file(file_path, _sample)
+        return read_binary_file(file_path, _sample, lazy=read_mode == ReadMode.LAZY)
+
+
+def _iter_chunk_ranges(_sample: ConfigSample, chunk_size: int):
+    """按采样段划分数据块范围，每个数据块不跨越采样段"""
+    for nrate in _sample.nrates:
+        for start in range(nrate.start_point, nrate.end_point, chunk_size):
+            yield nrate, start, min(start + chunk_size, nrate.end_point)
+
+
+def _read_ascii_rows(f, rows: int, columns: int) -> np.ndarray:
+    """从ASCII文件的当前位置读取指定行数的采样数据，跳过空行"""
+    blocks = []
+    remain = rows
+    while remain > 0 and (lines := list(islice(f, remain))):
+        block = parse_ascii_lines(lines, columns)
+        blocks.append(block)
+        remain -= block.shape[0]
+    if remain != 0:
+        raise ValueError(f"数据文件格式错误：采样点数少于配置的{rows}个")
+    return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+
+def iter_samples(file_path: str, _sample: ConfigSample, chunk_size: int = 10000) -> Iterator[DataChunk]:
+    """
+    分块流式读取dat文件，内存占用只与数据块大小有关，与录波长度无关。
+    数据块按采样段边界切分，每个数据块只属于一个采样段，可通过数据块的nrate获取其采样率。
+
+    参数:
+        file_path (str): dat文件路径
+        _sample (ConfigSample): 采样信息对象
+        chunk_size (int): 每个数据块最多包含的采样点数
+    返回:
+        DataChunk数据块迭代器，数据块的sample_time、analog_value、digital_value与data_reader的结果格式一致
+    异常:
+        ValueError: 当文件采样点数少于配置或格式错误时抛出
+    """
+    if chunk_size <= 0:
+        raise ValueError("数据块采样点数chunk_size必须是正整数")
+    analog_num = _sample.channel_num.analog_num
+    digital_num = _sample.channel_num.digital_num
+    is_ascii = _sample.data_file_type.value == DataFileType.ASCII.value
+    dt = None if is_ascii else _sample.record_dtype()
+    with open(file_path, 'rb') as f:
+        for nrate, start, end in _iter_chunk_ranges(_sample, chunk_size):
+            if is_ascii:
+                block = _read_ascii_rows(f, end - start, analog_num + digital_num + 2)
+                sample_time = block[:, 0:2].astype(np.int32)
+                analog_value = block[:, 2:analog_num + 2]
+                if analog_value.dtype.kind != 'f':
+                    analog_value = analog_value.astype(np.int32)
+                digital_value = pack_digital(block[:, analog_num + 2:], _sample.digital_word_num)
+            else:
+                records = np.fromfile(f, dtype=dt, count=end - start)
+                if records.shape[0] != end - start:
+                    raise ValueError("文件长度不足")
+                sample_time = records['timestamp']
+                analog_value = records['analog']
+                digital_value = records['digital']
+            yield DataChunk(file_path=file_path,
+                            sample_time=sample_time,
+                            analog_value=analog_value,
+                            digital_value=digital_value,
+                            digital_num=digital_num,
+                            nrate=nrate,
+                            start_point=start)
@@ -23,6 +23,8 @@ from py3comtrade.model.type import BreakerFlag, ChannelFlag, Contact, PsType, Re
 from py3comtrade.model.type.analog_enum import Multiplier, TvInstallation, BranNum, CtDirection, TransWindLocation, \
     WGFlag
 
+SCL_NS = 'http://www.iec.ch/61850/2003/SCL'
+
 
 def analog_channel_parser(channel_xml) -> AnalogChannel:
     """
@@ -72,7 +74,7 @@ def status_channel_parser(channel_xml) -> StatusChannel:
     idx_org = channel_xml.get('idx_org', "")
     signal_type_str = channel_xml.get('type', None)
     signal_type = SignalType.from_string(signal_type_str, default=SignalType.RELAY)
-    flag = channel_xml.get('flag', ChannelFlag.GENERAL)
+    flag = channel_xml.get('flag', "")
     if signal_type is SignalType.RELAY:
         flag = RelayFlag.from_string(flag, default=RelayFlag.TR)
     elif signal_type is SignalType.BREAKER:
@@ -207,6 +209,49 @@ def dmf_parser(_file_path) -> DMF:
 
     for tran in root.findall('scl:Transformer', ns):
         _dmf.transformers.append(transformer_parser(tran, ns))
+    _dmf.build_index()
+    return _dmf
+
+
+def dmf_stream_parser(_file_path) -> DMF:
+    """
+    以流式方式解析dmf文件，每读完一个顶层元素即转换为模型对象并释放该元素，
+    大型厂站模型文件解析时不必在内存中保留整棵xml树
+    :param _file_path: dmf文件路径
+    :return: DMF对象，与dmf_parser的解析结果一致
+    """
+    ns = {'scl': SCL_NS}
+    _dmf = DMF()
+    # 只分派根元素的直接子元素，按其结束事件的标签选择解析函数
+    handlers = {
+        f'{{{SCL_NS}}}AnalogChannel': (_dmf.analog_channels, analog_channel_parser),
+        f'{{{SCL_NS}}}StatusChannel': (_dmf.status_channels, status_channel_parser),
+        f'{{{SCL_NS}}}Bus': (_dmf.buses, lambda elem: bus_parser(elem, ns)),
+        f'{{{SCL_NS}}}Line': (_dmf.lines, lambda elem: line_parser(elem, ns)),
+        f'{{{SCL_NS}}}Transformer': (_dmf.transformers, lambda elem: transformer_parser(elem, ns)),
+    }
+    root = None
+    depth = 0
+    for event, elem in ET.iterparse(_file_path, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        handler = handlers.get(elem.tag)
+        if handler is not None:
+            equipments, parser = handler
+            equipments.append(parser(elem))
+        # 顶层元素结束时其下属的分支、通道已全部读入，转换后即从根元素中移除，已处理的元素不再占用内存
+        root.remove(elem)
+    _dmf.station_name = root.get('station_name', "变电站")
+    _dmf.version = root.get('version', 1.0)
+    _dmf.reference = root.get('reference', 0)
+    _dmf.rec_dev_name = root.get('rec_dev_name', "录波器")
+    _dmf.build_index()
     return _dmf
 
 
@@ -13,7 +13,7 @@ import logging
 import os
 from typing import List
 
-import chardet
+from py3comtrade.utils.file_tools import detect_file_encoding as _detect_file_encoding
 
 # 配置日志系统
 logging.basicConfig(
@@ -24,8 +24,6 @@ logging.basicConfig(
         logging.FileHandler('log.txt', mode='w', encoding='utf-8')  # 输出到文件,取消注释
     ]
 )
-# 定义读取字节数的常量
-READ_BYTES_FOR_ENCODING = 10 * 1024  # 10KB
 
 
 def is_valid_encoding(encoding: str) -> bool:
@@ -43,7 +41,7 @@ def is_valid_encoding(encoding: str) -> bool:
 
 def detect_file_encoding(file_path: str):
     """
-    读取文件前10KB数据用于检测编码格式
+    读取有限字节的样本检测编码格式，检测逻辑见file_tools.detect_file_encoding
     :param file_path: 文件路径
     :return: 检测到的编码格式，若无法识别则返回 None
     """
@@ -51,15 +49,8 @@ def detect_file_encoding(file_path: str):
         raise logging.error(f"必须是一个字符串,{file_path}")
 
     try:
-        with open(file_path, "rb") as file:
-            raw_data = file.read(READ_BYTES_FOR_ENCODING)
-            result = chardet.detect(raw_data)
-
-            # 可选：根据置信度过滤结果
-            if result["confidence"] < 0.5:
-                return None
-
-            return result["encoding"] if is_valid_encoding(result["encoding"]) else None
+        encoding = _detect_file_encoding(file_path)
+        return encoding if is_valid_encoding(encoding) else None
     except (IOError, OSError) as e:
         logging.error(f"无法读取文件 {file_path}: {e}")
         raise RuntimeError(f"无法读取文件 {file_path}: {e}")
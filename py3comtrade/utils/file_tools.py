@@ -7,11 +7,21 @@
 @Version :   1.0
 @Desc    :   文件操作工具
 """
+import codecs
 import os
 import zipfile
+from typing import Optional
+
+import chardet
 
 # 定义读取字节数的常量
 READ_BYTES_FOR_ENCODING = 10 * 1024  # 10KB
+# 样本为纯ASCII时向后查找非ASCII字节的最大块数，超过后不再读取，检测耗时不随文件大小增长
+MAX_SCAN_BLOCKS = 4
+# 快速检测时依次严格尝试的编码，GB18030兼容GBK且覆盖录波器中常见的生僻字
+FAST_ENCODINGS = ("utf-8", "gb18030")
+# 按录波文件所在目录缓存的编码检测结果，查找范围内未出现非ASCII字节时沿用
+_encoding_cache: dict[str, str] = {}
 
 
 def file_finder(directory: str, extension: str, recursive: bool = False):
@@ -75,6 +85,72 @@ def verify_file_validity(file_path: str):
         return f"发生错误：{str(e)}"
 
 
+def _read_encoding_sample(file_path: str, sample_size: int) -> tuple[bytes, bool]:
+    """
+    读取用于检测编码的样本。文件开头为纯ASCII时，向后最多查找MAX_SCAN_BLOCKS块，
+    从第一个非ASCII字节开始截取样本，以免开头的英文内容掩盖后面的中文通道名称。
+    :param file_path: 文件路径
+    :param sample_size: 样本字节数
+    :return: 样本字节串，以及是否已查找到文件末尾；查找范围内全部为ASCII时样本为文件开头
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(sample_size)
+        if not head.isascii():
+            return head, True
+        offset = len(head)
+        for _ in range(MAX_SCAN_BLOCKS):
+            block = f.read(READ_BYTES_FOR_ENCODING * 16)
+            if not block:
+                return head, True
+            if not block.isascii():
+                start = offset + next(i for i, b in enumerate(block) if b > 0x7F)
+                f.seek(start)
+                return f.read(sample_size), True
+            offset += len(block)
+        return head, not f.read(1)
+
+
+def _strict_decodable(sample: bytes, encoding: str) -> bool:
+    """样本能否以指定编码严格解码，样本末尾被截断的多字节字符不视为错误"""
+    try:
+        codecs.getincrementaldecoder(encoding)(errors="strict").decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def detect_file_encoding(file_path: str, sample_size: int = READ_BYTES_FOR_ENCODING,
+                         use_cache: bool = True) -> Optional[str]:
+    """
+    检测cfg、dmf等文本文件的编码格式，检测耗时不随文件大小增长。
+    只读取有限字节的样本，依次严格尝试ASCII、UTF-8和GB18030(兼容GBK)，均失败时才用chardet检测样本。
+    严格解码成功的编码按目录缓存，查找范围内未出现非ASCII字节而文件尚未读完时，沿用同目录缓存的编码，
+    无缓存时按兼容ASCII的GB18030处理，不把剩余内容未知的文件判定为ASCII。
+    :param file_path: 文件路径
+    :param sample_size: 用于检测的样本字节数
+    :param use_cache: 是否使用按目录缓存的检测结果
+    :return: 文件的编码格式，无法识别时返回None
+    """
+    sample, complete = _read_encoding_sample(file_path, sample_size)
+    directory = os.path.dirname(os.path.abspath(file_path))
+    if sample.isascii():
+        if complete:
+            return "ascii"
+        cached = _encoding_cache.get(directory) if use_cache else None
+        return cached or FAST_ENCODINGS[-1]
+    encoding = next((enc for enc in FAST_ENCODINGS if _strict_decodable(sample, enc)), None)
+    if encoding is None:
+        return chardet.detect(sample)["encoding"]
+    if use_cache:
+        _encoding_cache[directory] = encoding
+    return encoding
+
+
+def clear_encoding_cache():
+    """清空按目录缓存的编码检测结果"""
+    _encoding_cache.clear()
+
+
 def read_file_adaptive_encoding(filename):
     """
     尝试以GBK和UTF-8两种编码读取文件，以适应不确定的编码情况。
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.computation.calcium import Calcium
+from py3comtrade.computation.fourier import dft_exp_decay, dft_kernel, dft_rx, dft_rx_channels, \
+    eliminate_exp_decay_channels
+from py3comtrade.computation.vector import Vector
+
+
+class TestFourier(unittest.TestCase):
+    def setUp(self):
+        n = np.arange(64)
+        self.vs = 100 * np.sin(2 * np.pi * n / 64 + 0.3) + 20 * np.cos(2 * np.pi * 3 * n / 64)
+
+    def test_dft_rx(self):
+        theta = np.arange(64) * np.pi / 32
+        expected = complex(self.vs.dot(np.sin(theta)), self.vs.dot(np.cos(theta))) / 32 / np.sqrt(2)
+        self.assertAlmostEqual(expected, dft_rx(self.vs, 64, 1), places=9)
+        self.assertAlmostEqual(20 / np.sqrt(2), abs(dft_rx(self.vs, 64, 3)), places=9)
+
+    def test_dft_kernel_cached(self):
+        self.assertIs(dft_kernel(64, 1), dft_kernel(64, 1))
+        self.assertFalse(dft_kernel(64, 1).flags.writeable)
+
+    def test_backends_agree(self):
+        expected = dft_rx(self.vs, 64, 1)
+        self.assertAlmostEqual(expected, Calcium.dft_rx(self.vs.tolist(), 1), places=9)
+        self.assertAlmostEqual(expected, Vector.calc_vector(self.vs.tolist(), 1), places=9)
+        channels = dft_rx_channels(np.vstack((self.vs, 2 * self.vs)))
+        self.assertAlmostEqual(expected, channels[0], places=9)
+        self.assertAlmostEqual(2 * expected, channels[1], places=9)
+
+    def test_eliminate_exp_decay_channels(self):
+        n = np.arange(96)
+        vs = np.vstack([100 * np.sin(2 * np.pi * n / 64 + p) + 80 * np.exp(-n / 30) for p in (0.1, 1.2, 2.5)])
+        phasors = eliminate_exp_decay_channels(vs)
+        self.assertEqual((3,), phasors.shape)
+        for i in range(3):
+            self.assertAlmostEqual(dft_exp_decay(vs[i]), phasors[i], places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
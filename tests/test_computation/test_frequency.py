@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.computation.frequency import calc_rocof, comtrade_frequency, phasor_frequency, system_frequency
+from py3comtrade.computation.phasor import calc_phasors, comtrade_phasors
+from py3comtrade.model.nrate import Nrate
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+
+class TestFrequency(unittest.TestCase):
+    def setUp(self):
+        self.nrates = [Nrate(index=0, samp=3200, start_point=0, end_point=3200, cycle_point=64.0)]
+        n = np.arange(3200)
+        self.vs = np.stack([100 * np.sqrt(2) * np.sin(2 * np.pi * 49.0 * n / 3200 + phase)
+                            for phase in (0, -2 * np.pi / 3, 2 * np.pi / 3)])
+
+    def test_phasor_frequency(self):
+        phasors = calc_phasors(self.vs, self.nrates)
+        frequency = phasor_frequency(phasors, self.nrates)
+        self.assertTrue(np.isnan(frequency[:, :64]).all())
+        self.assertLess(np.nanmax(np.abs(frequency - 49.0)), 0.05)
+        system = system_frequency(frequency, phasors)
+        self.assertLess(np.nanmax(np.abs(system - 49.0)), 0.05)
+        self.assertLess(np.nanmax(np.abs(calc_rocof(system, self.nrates))), 1.0)
+        ramp = np.linspace(50, 51, 3200)
+        np.testing.assert_allclose(1.0, calc_rocof(ramp, self.nrates)[64:], rtol=1e-3)
+
+    def test_adaptive_window(self):
+        phasors = calc_phasors(self.vs, self.nrates)
+        adaptive = calc_phasors(self.vs, self.nrates, frequency=49.0)
+        # 数据窗长度按49Hz取3200/49≈65点，频谱泄漏误差减小
+        self.assertLess(np.nanmax(np.abs(np.abs(adaptive) - 100)), np.nanmax(np.abs(np.abs(phasors) - 100)) / 3)
+        per_point = calc_phasors(self.vs, self.nrates, frequency=np.full(3200, 49.0))
+        np.testing.assert_allclose(adaptive[:, :3100], per_point[:, :3100])
+
+    def test_comtrade_frequency(self):
+        ygz = comtrade_reader(r'../data/ygz.cfg')
+        frequency = comtrade_frequency(ygz)
+        self.assertEqual(ygz.sample.count, frequency.frequency.shape[0])
+        self.assertEqual((len(frequency.channels), ygz.sample.count), frequency.channel_frequency.shape)
+        self.assertAlmostEqual(50.0, np.nanmedian(frequency.frequency), places=1)
+        phasors = comtrade_phasors(ygz, frequency=frequency.frequency)
+        self.assertEqual((len(ygz.analogs), ygz.sample.count), phasors.shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.computation.fourier import dft_rx
+from py3comtrade.computation.harmonic import calc_harmonics, comtrade_harmonics, cycle_spectrum, \
+    total_harmonic_distortion
+from py3comtrade.computation.phasor import comtrade_instants
+from py3comtrade.model.nrate import Nrate
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+
+class TestHarmonic(unittest.TestCase):
+    def test_cycle_spectrum(self):
+        n = np.arange(64 * 3)
+        vs = np.stack((100 * np.sqrt(2) * np.sin(2 * np.pi * n / 64) + 20 * np.sqrt(2) * np.sin(2 * np.pi * 3 * n / 64),
+                       np.cos(2 * np.pi * 5 * n / 64), np.zeros(n.shape)))
+        phasors = cycle_spectrum(vs, 64, 40)
+        self.assertEqual((3, 3, 40), phasors.shape)
+        for k in (1, 3, 5):
+            self.assertAlmostEqual(dft_rx(vs[0, 64:128], 64, k), phasors[0, 1, k - 1])
+            self.assertAlmostEqual(dft_rx(vs[1, 64:128], 64, k), phasors[1, 1, k - 1])
+        self.assertAlmostEqual(100, abs(phasors[0, 0, 0]))
+        self.assertAlmostEqual(20, abs(phasors[0, 0, 2]))
+        self.assertAlmostEqual(20, total_harmonic_distortion(phasors)[0, 0])
+        self.assertTrue(np.isnan(total_harmonic_distortion(phasors)[2, 0]))
+        # 每周波64点时，32次及以上谐波无法计算
+        self.assertFalse(np.isnan(phasors[0, 0, 30]))
+        self.assertTrue(np.isnan(phasors[0, 0, 31:]).all())
+
+    def test_calc_harmonics_segments(self):
+        nrates = [Nrate(index=0, samp=3200, start_point=0, end_point=150, cycle_point=64),
+                  Nrate(index=1, samp=50, start_point=150, end_point=160, cycle_point=1),
+                  Nrate(index=2, samp=1600, start_point=160, end_point=260, cycle_point=32)]
+        vs = np.sin(np.arange(260) * 0.3)[None]
+        spectrum = calc_harmonics(vs, nrates, 20)
+        np.testing.assert_array_equal([0, 64, 160, 192, 224], spectrum.points)
+        self.assertEqual((1, 5, 20), spectrum.magnitude.shape)
+        self.assertTrue(np.isnan(spectrum.magnitude[0, 2, 15:]).all())
+        self.assertFalse(np.isnan(spectrum.magnitude[0, 0, 15:]).any())
+
+    def test_comtrade_harmonics(self):
+        ygz = comtrade_reader(r'../data/ygz.cfg')
+        spectrum = comtrade_harmonics(ygz, keep_phasors=True)
+        self.assertEqual((len(ygz.analogs), len(spectrum.points), 13), spectrum.magnitude.shape)
+        instants = comtrade_instants(ygz)
+        point = spectrum.points[5]
+        self.assertAlmostEqual(dft_rx(instants[2, point:point + 64], 64, 2), spectrum.phasors[2, 5, 1])
+        self.assertAlmostEqual(np.angle(spectrum.phasors[2, 5, 0], deg=True), spectrum.angle[2, 5, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
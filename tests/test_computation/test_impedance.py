@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.computation.impedance import LOOPS, line_loop_impedances, loop_impedances, zero_sequence_factor
+from py3comtrade.computation.phasor import comtrade_phasors
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+
+class TestImpedance(unittest.TestCase):
+    def test_loop_impedances(self):
+        z1, k0 = complex(1, 8), complex(0.3, 0.1)
+        i = np.array([[complex(2, -1)], [complex(-1, -1)], [complex(0.5, 1)]])
+        u = z1 * (i + k0 * i.sum(axis=0))
+        impedances = loop_impedances(u, i, k0)
+        self.assertEqual((6, 1), impedances.shape)
+        for n in range(3, 6):
+            self.assertAlmostEqual(z1, impedances[n, 0])
+        self.assertAlmostEqual((u[0, 0] - u[1, 0]) / (i[0, 0] - i[1, 0]), impedances[LOOPS.index("AB"), 0])
+        self.assertTrue(np.isnan(loop_impedances(u, np.zeros_like(i))[0, 0]))
+
+    def test_line_loop_impedances(self):
+        ygz = comtrade_reader(r'../data/ygz.cfg')
+        line = ygz.dmf.lines[0]
+        k0 = zero_sequence_factor(line)
+        self.assertAlmostEqual((complex(0.1795, 0.6269) - complex(0.0422, 0.3084)) / (3 * complex(0.0422, 0.3084)),
+                               k0)
+        phasors = comtrade_phasors(ygz)
+        impedances = line_loop_impedances(ygz, phasors)
+        self.assertEqual(6, len(impedances))
+        xgx = impedances['xgx']
+        self.assertEqual((6, ygz.sample.count), xgx.shape)
+        # xgx线路接于1号母线，电压通道1~3，电流通道45~47
+        u, i = phasors[0:3, 100], phasors[44:47, 100]
+        self.assertAlmostEqual(u[1] / (i[1] + k0 * i.sum()), xgx[LOOPS.index("BG"), 100])
+        self.assertAlmostEqual((u[2] - u[0]) / (i[2] - i[0]), xgx[LOOPS.index("CA"), 100])
+
+
+if __name__ == '__main__':
+    unittest.main()
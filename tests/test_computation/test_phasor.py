@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.computation.basic_calc import raw_to_instant, raw_to_instant_matrix
+from py3comtrade.computation.fourier import dft_exp_decay, dft_rx
+from py3comtrade.computation.phasor import calc_phasors, calc_phasors_exp_decay, comtrade_phasors, sliding_dft
+from py3comtrade.model.type.mode_enum import SampleMode
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+
+class TestPhasor(unittest.TestCase):
+    def setUp(self):
+        self.xtz = comtrade_reader(r'../data/xtz.cfg')
+        analogs = self.xtz.analogs
+        self.instants = raw_to_instant_matrix(self.xtz.analog_raw, [a.a for a in analogs], [a.b for a in analogs],
+                                              [a.primary for a in analogs], [a.secondary for a in analogs],
+                                              [False] * len(analogs))
+
+    def test_invalid_ratio(self):
+        # 二次值为0的通道与逐通道换算一样报错，不产生inf或nan
+        secondary = [a.secondary for a in self.xtz.analogs]
+        secondary[5] = 0
+        with self.assertRaises(ValueError):
+            raw_to_instant_matrix(self.xtz.analog_raw, [1.0] * 48, [0.0] * 48, [1.0] * 48, secondary, [False] * 48)
+        with self.assertRaises(ValueError):
+            raw_to_instant(self.xtz.analog_raw[5], 1.0, 0.0, 1.0, 0)
+
+    def test_sliding_dft(self):
+        vs = self.instants[3, :200]
+        phasors = sliding_dft(vs, 64, 1)
+        self.assertEqual(137, phasors.shape[0])
+        for j in (0, 50, 136):
+            self.assertAlmostEqual(dft_rx(vs[j:j + 64], 64, 1), phasors[j], places=9)
+        self.assertAlmostEqual(dft_rx(vs[10:74], 64, 3), sliding_dft(vs, 64, 3)[10], places=9)
+
+    def test_comtrade_phasors(self):
+        phasors = comtrade_phasors(self.xtz)
+        self.assertEqual((48, 3077), phasors.shape)
+        vs = self.instants[3]
+        self.assertAlmostEqual(dft_rx(vs[1216:1280], 64, 1), phasors[3, 1216], places=9)
+        self.assertAlmostEqual(dft_rx(vs[1316:1380], 64, 1), phasors[3, 1316], places=9)
+        # 数据窗超出采样段以及50Hz采样段没有相量
+        self.assertTrue(np.isnan(phasors[3, 1217]))
+        self.assertTrue(np.isnan(phasors[3, 1300]))
+
+    def test_phasor_mode_and_harmonics(self):
+        nrates = self.xtz.sample.nrates
+        forward = calc_phasors(self.instants, nrates)
+        backward = calc_phasors(self.instants, nrates, mode=SampleMode.BACKWARD)
+        centered = calc_phasors(self.instants, nrates, mode=SampleMode.CENTERED)
+        np.testing.assert_array_equal(forward[:, 0:1000], backward[:, 63:1063])
+        np.testing.assert_array_equal(forward[:, 0:1000], centered[:, 31:1031])
+        harmonics = calc_phasors(self.instants, nrates, [1, 2, 5])
+        self.assertEqual((3, 48, 3077), harmonics.shape)
+        np.testing.assert_array_equal(forward, harmonics[0])
+        self.assertAlmostEqual(dft_rx(self.instants[0, 100:164], 64, 5), harmonics[2, 0, 100], places=9)
+
+    def test_phasors_exp_decay(self):
+        phasors = calc_phasors_exp_decay(self.instants, self.xtz.sample.nrates)
+        self.assertEqual((48, 3077), phasors.shape)
+        vs = self.instants[3]
+        for point in (0, 500, 1184, 1316):
+            self.assertAlmostEqual(dft_exp_decay(vs[point:point + 96], 64), phasors[3, point], places=9)
+        self.assertTrue(np.isnan(phasors[3, 1185]))
+        backward = calc_phasors_exp_decay(self.instants, self.xtz.sample.nrates, SampleMode.BACKWARD)
+        np.testing.assert_array_equal(phasors[:, 0:1000], backward[:, 95:1095])
+
+
+if __name__ == '__main__':
+    unittest.main()
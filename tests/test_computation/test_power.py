@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.computation.phasor import comtrade_phasors
+from py3comtrade.computation.power import comtrade_powers, cycle_points, three_phase_power
+from py3comtrade.computation.sequence import A
+from py3comtrade.model.type.mode_enum import SampleMode
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+
+class TestPower(unittest.TestCase):
+    def test_three_phase_power(self):
+        rotation = np.array([[1], [A * A], [A]])
+        u = 57.7 * rotation
+        i = 2 * np.exp(-1j * np.pi / 6) * rotation
+        s = three_phase_power(u, i)
+        self.assertAlmostEqual(3 * 57.7 * 2 * np.cos(np.pi / 6), s[0].real)
+        self.assertAlmostEqual(3 * 57.7 * 2 * np.sin(np.pi / 6), s[0].imag)
+
+    def test_comtrade_powers(self):
+        ygz = comtrade_reader(r'../data/ygz.cfg')
+        phasors = comtrade_phasors(ygz)
+        powers = comtrade_powers(ygz, phasors)
+        xgx = powers['xgx']
+        self.assertEqual((ygz.sample.count,), xgx.p.shape)
+        # xgx线路接于1号母线，电压通道1~3，电流通道45~47
+        s = (phasors[0:3, 100] * np.conj(phasors[44:47, 100])).sum()
+        self.assertAlmostEqual(s.real, xgx.p[100])
+        self.assertAlmostEqual(s.imag, xgx.q[100])
+        self.assertAlmostEqual(abs(s), xgx.s[100])
+        self.assertAlmostEqual(s.real / abs(s), xgx.pf[100])
+
+        per_cycle = comtrade_powers(ygz, phasors, per_cycle=True)['xgx']
+        np.testing.assert_array_equal(cycle_points(ygz.sample.nrates), per_cycle.points)
+        np.testing.assert_array_equal(xgx.p[per_cycle.points], per_cycle.p)
+        self.assertEqual([0, 64, 128], per_cycle.points[:3].tolist())
+
+    def test_per_cycle_mode(self):
+        ygz = comtrade_reader(r'../data/ygz.cfg')
+        forward = comtrade_powers(ygz, per_cycle=True)['xgx']
+        for mode in (SampleMode.BACKWARD, SampleMode.CENTERED):
+            phasors = comtrade_phasors(ygz, mode=mode)
+            powers = comtrade_powers(ygz, phasors, per_cycle=True, mode=mode)['xgx']
+            # 各数据窗对应的采样点随mode偏移，数据窗本身不变
+            offset = 63 if mode == SampleMode.BACKWARD else 31
+            np.testing.assert_array_equal(forward.points + offset, powers.points)
+            np.testing.assert_allclose(forward.p, powers.p)
+            np.testing.assert_allclose(forward.q, powers.q)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.computation.phasor import comtrade_phasors
+from py3comtrade.computation.sequence import A, comtrade_sequences, phase_groups, phasor_to_sequence_by_matrix, \
+    phasor_to_sequence_by_rotate, phasor_to_sequence_series
+from py3comtrade.model.type import GroupMode
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+
+class TestSequence(unittest.TestCase):
+    def setUp(self):
+        self.ygz = comtrade_reader(r'../data/ygz.cfg')
+
+    def test_phasor_to_sequence(self):
+        # 正序对称的三相相量只有正序分量
+        sequence = phasor_to_sequence_by_matrix(np.array([1, A * A, A]) * np.sqrt(2))
+        self.assertAlmostEqual(1, sequence.positive)
+        self.assertAlmostEqual(0, sequence.negative)
+        self.assertAlmostEqual(0, sequence.zero)
+        pa, pb, pc = complex(3, 1), complex(-2, -1), complex(0.5, 2)
+        rotate = phasor_to_sequence_by_rotate(pa, pb, pc)
+        matrix = phasor_to_sequence_by_matrix(np.array([pa, pb, pc]))
+        self.assertAlmostEqual(rotate.positive, matrix.positive)
+        self.assertAlmostEqual(rotate.negative, matrix.negative)
+        self.assertAlmostEqual(rotate.zero, matrix.zero)
+        # 序列计算的输入为有效值相量，结果不再除以√2
+        series = phasor_to_sequence_series(np.array([[pa, 0], [pb, 0], [pc, 0]]))
+        self.assertEqual((3, 2), series.shape)
+        self.assertAlmostEqual(matrix.zero * np.sqrt(2), series[0, 0])
+        self.assertAlmostEqual(matrix.positive * np.sqrt(2), series[1, 0])
+        self.assertAlmostEqual(matrix.negative * np.sqrt(2), series[2, 0])
+
+    def test_sequence_series_rms(self):
+        # 对称的有效值相量组，正序分量等于相量幅值，负序、零序分量接近0
+        phase = 57.7 * np.exp(1j * np.linspace(0, np.pi, 5))
+        series = phasor_to_sequence_series(np.array([phase, phase * A * A, phase * A]))
+        np.testing.assert_allclose(57.7, np.abs(series[1]))
+        np.testing.assert_allclose(0, np.abs(series[[0, 2]]), atol=1e-9)
+
+    def test_phase_groups(self):
+        groups = phase_groups(self.ygz)
+        self.assertEqual('xgx214线路电压', groups[0].name)
+        self.assertEqual([0, 1, 2], groups[0].indices)
+        dmf_groups = phase_groups(self.ygz, GroupMode.DMF)
+        self.assertEqual(12, len(dmf_groups))
+        self.assertEqual('xgx', dmf_groups[6].name)
+        self.assertEqual([44, 45, 46], dmf_groups[6].indices)
+
+    def test_comtrade_sequences(self):
+        phasors = comtrade_phasors(self.ygz)
+        sequences = comtrade_sequences(self.ygz, GroupMode.DMF, phasors)
+        bus = sequences['220kVxgx214开关U']
+        self.assertEqual((3, self.ygz.sample.count), bus.shape)
+        expected = phasor_to_sequence_by_matrix(phasors[0:3, 100])
+        self.assertAlmostEqual(expected.positive * np.sqrt(2), bus[1, 100])
+        self.assertAlmostEqual(expected.negative * np.sqrt(2), bus[2, 100])
+        self.assertGreater(abs(bus[1, 100]), 100 * abs(bus[2, 100]))
+        # 故障前对称的母线电压，正序分量有效值等于相电压有效值
+        ccbm = comtrade_sequences(self.ygz, phasors=phasors)['xgx214线路电压']
+        self.assertAlmostEqual(np.abs(phasors[0:3, 100]).mean(), abs(ccbm[1, 100]), delta=0.5)
+
+
+    def test_duplicate_group_names(self):
+        # 同名的通道组不互相覆盖
+        self.ygz.dmf.lines[1].name = self.ygz.dmf.lines[0].name
+        groups = phase_groups(self.ygz, GroupMode.DMF)
+        names = [group.name for group in groups]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertIn(f"{self.ygz.dmf.lines[0].name}_2", names)
+        sequences = comtrade_sequences(self.ygz, GroupMode.DMF)
+        self.assertEqual(len(groups), len(sequences))
+
+
+if __name__ == '__main__':
+    unittest.main()
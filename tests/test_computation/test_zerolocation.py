@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.computation.impedance import LOOPS
+from py3comtrade.computation.zerolocation import comtrade_fault_locations, double_ended_distance, \
+    double_ended_fault_location, fault_windows, reactance_distance, select_loops, takagi_distance
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+
+
+class TestZeroLocation(unittest.TestCase):
+    def test_single_ended_distance(self):
+        z1, d, rf = complex(0.04, 0.3), 20.0, 5.0
+        i_pre, i_fault = complex(300, -50), complex(1000, -1500)
+        i_loop = i_pre + i_fault
+        # 故障点经过渡电阻接地，故障支路电流相位与本侧电流突变量一致时Takagi法不受过渡电阻影响
+        u_loop = d * z1 * i_loop + rf * i_fault * 2
+        takagi = takagi_distance(u_loop, i_loop, i_loop - i_pre, z1)
+        self.assertAlmostEqual(d, takagi)
+        self.assertNotAlmostEqual(d, reactance_distance(u_loop, i_loop, z1), places=1)
+        self.assertAlmostEqual(d, reactance_distance(d * z1 * i_loop, i_loop, z1))
+        distances = takagi_distance(np.full(4, u_loop), np.full(4, i_loop), np.full(4, i_fault), z1)
+        self.assertEqual((4,), distances.shape)
+
+    def test_double_ended_distance(self):
+        z1, length = complex(0.04, 0.3), 50.0
+        i_s, i_r = np.array([complex(100, -300), complex(50, 20)]), np.array([complex(80, -200), complex(60, -90)])
+        d = np.array([12.0, 37.5])
+        u_f = np.array([complex(1000, 200), complex(-300, 800)])
+        u_s, u_r = u_f + d * z1 * i_s, u_f + (length - d) * z1 * i_r
+        # 对侧数据相对本侧有任意相角差时结果不变
+        shift = np.exp(1j * np.array([0.3, -1.2]))
+        np.testing.assert_allclose(d, double_ended_distance(u_s, i_s, u_r * shift, i_r * shift, z1, length))
+
+    def test_select_loops(self):
+        i_pre = np.full((4, 3), complex(100, 0))
+        i_post = i_pre + np.array([[1000, 10, 10], [10, 900, 1000], [800, 10, 900], [900, 1000, 950]])
+        self.assertEqual(["AG", "BC", "CA", "AB"], [LOOPS[n] for n in select_loops(i_pre, i_post)])
+
+    def test_comtrade_fault_locations(self):
+        ygz = comtrade_reader(r'../data/ygz.cfg')
+        self.assertEqual((512, 704, 64), fault_windows(ygz))
+        locations = {location.name: location for location in comtrade_fault_locations(ygz)}
+        self.assertEqual({"xgx", "ghx"}, set(locations))
+        # xgx线路A相接地故障，线路全长52.27公里
+        xgx = locations["xgx"]
+        self.assertEqual("AG", xgx.loop)
+        self.assertAlmostEqual(20.8, xgx.takagi, places=1)
+        self.assertAlmostEqual(20.8, xgx.reactance, places=1)
+        self.assertAlmostEqual(xgx.takagi / 52.27, xgx.ratio)
+        # 两侧使用同一录波数据时，负序电压相等的点在线路中点
+        self.assertAlmostEqual(52.27 / 2, double_ended_fault_location(ygz, ygz, "xgx"))
+
+
+if __name__ == '__main__':
+    unittest.main()
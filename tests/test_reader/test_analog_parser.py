@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from py3comtrade.model.type.analog_enum import ElectricalUnit, PsType
+from py3comtrade.model.type.analog_enum import BranNum, ElectricalUnit, PsType
 from py3comtrade.model.type.phase_code import PhaseCode
 from py3comtrade.reader.analog_parser import analog_parser
 
@@ -25,3 +25,16 @@ class TestAnalogParser(unittest.TestCase):
         self.assertEqual(ElectricalUnit.V, analog_c.unit)
         self.assertEqual(PhaseCode.C_PHASE, analog_c.phase)
         self.assertEqual(PsType.S, analog_c.ps)
+
+    def test_enum_from_string(self):
+        self.assertIs(ElectricalUnit.KV, ElectricalUnit.from_string(" kv "))
+        # 结尾匹配按成员定义顺序，无法识别的相别落到代码为空的无相别成员
+        self.assertIs(PhaseCode.A_PHASE, PhaseCode.from_string("IA"))
+        self.assertIs(PhaseCode.NO_PHASE, PhaseCode.from_string("XYZ"))
+        self.assertIs(PhaseCode.NO_PHASE, PhaseCode.from_string("xyz"))
+        self.assertIs(PsType.P, PsType.from_string("", default=PsType.P))
+        self.assertIs(PsType.S, PsType.from_string(PsType.S))
+        # 非字符串输入按str()转换后匹配
+        self.assertIs(BranNum.B2, BranNum.from_string(2))
+        with self.assertRaises(ValueError):
+            PsType.from_string("X", fuzzy=False)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+
+from py3comtrade.model.configure import Configure
+from py3comtrade.model.type import ReadMode
+from py3comtrade.reader.batch_reader import batch_reader, record_summary
+
+
+class TestBatchReader(unittest.TestCase):
+    def setUp(self):
+        self.files = [r'../data/ygz.cfg', r'../data/不存在.cfg', r'../data/xtz.cfg', r'../data/ymz.cfg']
+
+    def test_ordered_with_errors(self):
+        progress = []
+        results = list(batch_reader(self.files, ReadMode.CFG, max_workers=2, max_in_flight=2,
+                                    progress=lambda done, total, result: progress.append((done, total))))
+        self.assertEqual(self.files, [result.file_path for result in results])
+        self.assertEqual([True, False, True, True], [result.ok for result in results])
+        self.assertIsInstance(results[0].result, Configure)
+        self.assertEqual(96, results[0].result.channel_num.analog_num)
+        self.assertIsNone(results[1].result)
+        self.assertEqual([(i, 4) for i in range(1, 5)], progress)
+
+    def test_unordered_handler(self):
+        results = list(batch_reader(self.files[:3], ReadMode.DAT, handler=record_summary, max_workers=2,
+                                    ordered=False))
+        summaries = {result.index: result.result for result in results}
+        self.assertEqual({0, 1, 2}, set(summaries))
+        self.assertEqual("96A/128D，2830个采样点", summaries[0])
+        self.assertEqual("48A/96D，3077个采样点", summaries[2])
+
+    def test_in_process(self):
+        results = list(batch_reader(self.files, ReadMode.CFG, max_workers=1))
+        self.assertEqual([0, 1, 2, 3], [result.index for result in results])
+        self.assertIn("FileNotFoundError", results[1].error)
+
+
+if __name__ == '__main__':
+    unittest.main()
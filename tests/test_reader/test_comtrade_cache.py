@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from py3comtrade.model.type import ReadMode
+from py3comtrade.reader.comtrade_cache import HASH_BLOCK_BYTES, ComtradeCache, file_signature
+from py3comtrade.reader.comtrade_reader import comtrade_reader, get_comtrade_path
+
+
+class TestComtradeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ComtradeCache(os.path.join(self.tmp_dir.name, "cache"))
+        for src in glob.glob(r'../data/ygz.*'):
+            shutil.copy(src, self.tmp_dir.name)
+        self.cfg_path = os.path.join(self.tmp_dir.name, "ygz.cfg")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def entries(self):
+        return [name for name in os.listdir(self.cache.cache_dir) if not name.startswith(".")]
+
+    def test_warm_read(self):
+        cold = comtrade_reader(self.cfg_path, cache=self.cache)
+        self.assertEqual(1, len(self.entries()))
+        warm = comtrade_reader(self.cfg_path, cache=self.cache)
+        # FULL模式命中缓存时与未命中一致，采样值读入内存
+        self.assertNotIsInstance(warm.analog_raw, np.memmap)
+        self.assertTrue(warm.analog_raw.flags.writeable)
+        np.testing.assert_array_equal(cold.analog_raw, warm.analog_raw)
+        np.testing.assert_array_equal(cold.sample_time, warm.sample_time)
+        np.testing.assert_array_equal(cold.get_analog_instant_matrix(), warm.get_analog_instant_matrix())
+        np.testing.assert_array_equal(cold.change_index.point, warm.change_index.point)
+        self.assertEqual([d.change_status for d in cold.get_digital_change()],
+                         [d.change_status for d in warm.get_digital_change()])
+        np.testing.assert_array_equal(cold.analogs[5].raw, warm.analogs[5].raw)
+        self.assertEqual(cold.dmf.find_line_by_name("xgx")[1].idx, warm.dmf.find_line_by_name("xgx")[1].idx)
+        self.assertIs(warm.get_digital_change()[0], warm.digitals[warm.get_digital_change()[0].index])
+        # 读取结果写入缓存后原对象的通道视图保持不变
+        self.assertIs(cold.analog_raw, cold.analogs[0].raw.base)
+        self.assertIs(cold.digital_raw, cold.digitals[0]._words)
+
+    def test_lazy_hit_memmap(self):
+        cold = comtrade_reader(self.cfg_path, ReadMode.LAZY, cache=self.cache)
+        warm = comtrade_reader(self.cfg_path, ReadMode.LAZY, cache=self.cache)
+        self.assertIsInstance(warm.analog_raw, np.memmap)
+        self.assertFalse(warm.analog_raw.flags.writeable)
+        np.testing.assert_array_equal(cold.analog_raw, warm.analog_raw)
+        self.assertEqual(cold.digitals[0], warm.digitals[0])
+
+    def test_invalidated_by_change(self):
+        comtrade_reader(self.cfg_path, ReadMode.CFG, cache=self.cache)
+        comtrade_reader(self.cfg_path, ReadMode.CFG, cache=self.cache)
+        self.assertEqual(1, len(self.entries()))
+        stat = os.stat(self.cfg_path)
+        os.utime(self.cfg_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        configure = comtrade_reader(self.cfg_path, ReadMode.CFG, cache=self.cache)
+        self.assertEqual(2, len(self.entries()))
+        self.assertIsNone(configure.analog_raw)
+
+    def test_file_signature(self):
+        file_path = os.path.join(self.tmp_dir.name, "large.dat")
+        content = bytearray(4 * HASH_BLOCK_BYTES)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        sampled, full = file_signature(file_path), file_signature(file_path, full_hash=True)
+        # 原地改写文件中部并恢复修改时间，抽样指纹不变，全部内容的摘要随之变化
+        stat = os.stat(file_path)
+        content[2 * HASH_BLOCK_BYTES] = 1
+        with open(file_path, "wb") as f:
+            f.write(content)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(sampled, file_signature(file_path))
+        self.assertNotEqual(full, file_signature(file_path, full_hash=True))
+
+    def test_full_hash(self):
+        cache = ComtradeCache(os.path.join(self.tmp_dir.name, "full"), full_hash=True)
+        cold = comtrade_reader(self.cfg_path, cache=cache)
+        warm = comtrade_reader(self.cfg_path, cache=cache)
+        np.testing.assert_array_equal(cold.analog_raw, warm.analog_raw)
+        self.assertNotEqual(cache.key(get_comtrade_path(self.cfg_path), ReadMode.FULL),
+                            self.cache.key(get_comtrade_path(self.cfg_path), ReadMode.FULL))
+
+    def test_lru_eviction(self):
+        paths = []
+        for name in ("a", "b", "c"):
+            for src in glob.glob(os.path.join(self.tmp_dir.name, "ygz.*")):
+                shutil.copy(src, os.path.join(self.tmp_dir.name, f"{name}{os.path.splitext(src)[1]}"))
+            paths.append(os.path.join(self.tmp_dir.name, f"{name}.cfg"))
+        comtrade_reader(paths[0], ReadMode.DAT, cache=self.cache)
+        self.cache.max_bytes = int(self.cache.size() * 2.5)
+        comtrade_reader(paths[1], ReadMode.DAT, cache=self.cache)
+        # 再次访问a后写入c，淘汰最久未访问的b
+        comtrade_reader(paths[0], ReadMode.DAT, cache=self.cache)
+        comtrade_reader(paths[2], ReadMode.DAT, cache=self.cache)
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+        keys = {self.cache.key(get_comtrade_path(paths[i]), ReadMode.DAT) for i in (0, 2)}
+        self.assertEqual(keys, set(self.entries()))
+
+
+if __name__ == '__main__':
+    unittest.main()
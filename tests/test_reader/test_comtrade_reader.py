@@ -1,9 +1,16 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import glob
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+
 from py3comtrade.model.type.types import IdxType, ChannelType
 from py3comtrade.reader.comtrade_reader import ReadMode, comtrade_reader
+from py3comtrade.reader.data_reader import data_reader
 
 
 class TestComtrade(unittest.TestCase):
@@ -20,6 +27,17 @@ class TestComtrade(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.xtz.get_channel_raw_data_range(48)
 
+    def test_channel_raw_is_matrix_view(self):
+        self.assertEqual((48, 3077), self.xtz.analog_raw.shape)
+        self.assertTrue(np.shares_memory(self.xtz.analogs[2].raw, self.xtz.analog_raw))
+        ch2_ysz = self.xtz.get_channel_raw_data_range(2, start_point=10, end_point=20)
+        self.assertEqual(11, len(ch2_ysz[0].raw))
+        self.assertTrue(np.shares_memory(ch2_ysz[0].raw, self.xtz.analog_raw))
+        raw = self.xtz.get_raw_matrix(start_point=10, end_point=20)
+        self.assertEqual((48, 11), raw.shape)
+        self.assertTrue(np.shares_memory(raw, self.xtz.analog_raw))
+        self.assertEqual(7940, self.xtz.get_raw_matrix([0, 1, 2])[2, 4])
+
     def test_get_raw_by_analog_indices(self):
         ysz1 = self.xtz.get_channel_raw_data_range([0, 1, 2])
         self.assertEqual(7940, ysz1[2].raw[4])
@@ -41,6 +59,29 @@ class TestComtrade(unittest.TestCase):
         self.assertEqual(48, len(instants))
         self.assertEqual(0.136, instants[10].y[0])
 
+    def test_get_analog_instant_matrix(self):
+        instants = self.xtz.get_analog_instant_matrix()
+        self.assertEqual((48, 3077), instants.shape)
+        self.assertIs(instants, self.xtz.get_analog_instant_matrix())
+        self.assertFalse(instants.flags.writeable)
+        self.assertAlmostEqual(-84.691, instants[0, 0], places=3)
+        primary = self.xtz.get_analog_instant_matrix(output_primary=True)
+        self.assertIsNot(instants, primary)
+        single = self.xtz.get_analog_instant_matrix(dtype=np.float32)
+        self.assertEqual(np.float32, single.dtype)
+        np.testing.assert_allclose(instants, single, rtol=1e-6, atol=1e-3)
+        y = self.xtz.get_analog_instant_data_range(10, start_point=100, end_point=200, output_primary=True)[0].y
+        np.testing.assert_allclose(np.around(primary[10, 100:201], 3), y)
+        # 按通道和采样范围取瞬时值矩阵，单个通道时为缓存矩阵的视图，不做舍入
+        part = self.xtz.get_instant_matrix(11, IdxType.CFGAN, start_point=100, end_point=200, output_primary=True)
+        self.assertEqual((1, 101), part.shape)
+        self.assertTrue(np.shares_memory(primary, part))
+        np.testing.assert_array_equal(primary[10, 100:201], part[0])
+        np.testing.assert_array_equal(primary[[0, 2], :], self.xtz.get_instant_matrix([0, 2], output_primary=True))
+        # 重新载入dat文件后缓存失效
+        self.xtz.load_data(data_reader(r'../data/xtz.dat', self.xtz.sample))
+        self.assertIsNot(instants, self.xtz.get_analog_instant_matrix())
+
     def test_get_raw_by_digital_index(self):
         d1 = self.xtz.get_channel_raw_data_range(0, channel_type=ChannelType.DIGITAL)
         self.assertEqual(3077, len(d1[0].raw))
@@ -55,6 +96,93 @@ class TestComtrade(unittest.TestCase):
         digital = self.xtz.get_channel_raw_data_range(1, idx_type=IdxType.CFGAN, channel_type=ChannelType.DIGITAL)
         self.assertEqual(3077, len(digital[0].raw))
 
+    def test_digital_raw(self):
+        # 开关量通道的raw在访问时才从开关量字中提取
+        matrix = self.xtz.get_raw_matrix(channel_type=ChannelType.DIGITAL)
+        for digital in self.xtz.digitals:
+            np.testing.assert_array_equal(matrix[digital.index], digital.raw)
+        self.assertEqual([], comtrade_reader(r'../data/xtz.cfg', ReadMode.CFG).digitals[0].raw)
+        # raw不是模型字段，序列化和复制的结果与是否访问过raw无关
+        digital = comtrade_reader(r'../data/xtz.dat', ReadMode.DAT).digitals[3]
+        dumped = digital.model_dump(warnings=False)
+        self.assertNotIn("raw", dumped)
+        self.assertEqual(3077, len(digital.raw))
+        self.assertEqual(dumped, digital.model_dump(warnings=False))
+        np.testing.assert_array_equal(matrix[3], digital.model_copy().raw)
+
     def test_get_digital_change(self):
         digitals = self.xtz.get_digital_change()
         self.assertEqual(12, len(digitals))
+        # digital_change属性与get_digital_change一致，未变位的通道只有初始状态记录
+        self.assertIs(digitals, self.xtz.digital_change)
+        unchanged = next(d for d in self.xtz.digitals if d not in digitals)
+        self.assertEqual(1, len(unchanged.change_status))
+        self.assertEqual(0, unchanged.change_status[0].timestamp)
+        self.assertEqual([], comtrade_reader(r'../data/xtz.cfg', ReadMode.CFG).digital_change)
+
+    def test_channel_equality(self):
+        # 采样值为数组的通道可以直接比较，两次读取的结果相等
+        other = comtrade_reader(r'../data/xtz.dat', ReadMode.DAT)
+        self.assertEqual(self.xtz.analogs[0], other.analogs[0])
+        self.assertEqual(self.xtz.digitals[0], other.digitals[0])
+        self.assertEqual(self.xtz.digital_change, other.digital_change)
+        self.assertNotEqual(self.xtz.analogs[0], other.analogs[1])
+        changed = self.xtz.get_channel_raw_data_range(0, start_point=0, end_point=99)[0]
+        self.assertNotEqual(self.xtz.analogs[0], changed)
+
+    def test_digital_change_index(self):
+        index = self.xtz.change_index
+        self.assertEqual(12, len(index.changed_channels()))
+        matrix = self.xtz.get_raw_matrix(channel_type=ChannelType.DIGITAL)
+        self.assertEqual((96, 3077), matrix.shape)
+        for digital in self.xtz.get_digital_change():
+            raw = matrix[digital.index]
+            points = np.flatnonzero(raw[1:] != raw[:-1]) + 1
+            records = [(r.timestamp, r.status) for r in digital.change_status]
+            expected = [(0, raw[0])] + [(p, raw[p]) for p in points]
+            self.assertEqual(expected, records)
+
+    def test_lazy_read_mode(self):
+        lazy = comtrade_reader(r'../data/xtz.dat', ReadMode.LAZY)
+        self.assertIsInstance(lazy.analog_raw, np.memmap)
+        self.assertIsNone(lazy.change_index)
+        np.testing.assert_array_equal(self.xtz.analog_raw, lazy.analog_raw)
+        ch2_ysz = lazy.get_channel_raw_data_range(2, start_point=100, end_point=199)
+        self.assertIsInstance(ch2_ysz[0].raw, np.memmap)
+        np.testing.assert_array_equal(self.xtz.analogs[2].raw[100:200], ch2_ysz[0].raw)
+        d1 = lazy.get_channel_raw_data_range(channel_type=ChannelType.DIGITAL)
+        self.assertEqual(96, len(d1))
+        np.testing.assert_array_equal(self.xtz.digital_raw, lazy.digital_raw)
+        self.assertEqual(12, len(lazy.get_digital_change()))
+
+    def test_read_dmf_by_mode(self):
+        # FULL和DMF模式读取同名的dmf文件，DAT模式不读取
+        full = comtrade_reader(r'../data/ygz.cfg', ReadMode.FULL)
+        self.assertIsNotNone(full.dmf)
+        self.assertIsNotNone(full.analog_raw)
+        dmf_only = comtrade_reader(r'../data/ygz.cfg', ReadMode.DMF)
+        self.assertIsNone(dmf_only.analog_raw)
+        self.assertEqual(len(full.dmf.lines), len(dmf_only.dmf.lines))
+        self.assertIsNone(comtrade_reader(r'../data/ygz.cfg', ReadMode.DAT).dmf)
+        # dmf文件不存在时不影响读取
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for src in glob.glob(r'../data/ygz.c*') + glob.glob(r'../data/ygz.dat'):
+                shutil.copy(src, tmp_dir)
+            ygz = comtrade_reader(os.path.join(tmp_dir, "ygz.cfg"))
+            self.assertIsNone(ygz.dmf)
+            self.assertIsNotNone(ygz.analog_raw)
+
+    def test_invalid_dmf_warns(self):
+        # dmf格式正确但属性值不符合模型时只给出警告，不影响录波数据的读取
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for src in glob.glob(r'../data/ygz.*'):
+                shutil.copy(src, tmp_dir)
+            dmf_path = os.path.join(tmp_dir, "ygz.dmf")
+            with open(dmf_path, encoding="utf-8") as f:
+                content = f.read()
+            with open(dmf_path, "w", encoding="utf-8") as f:
+                f.write(content.replace('idx_org="1"', 'idx_org="x"', 1))
+            with self.assertWarns(UserWarning):
+                ygz = comtrade_reader(os.path.join(tmp_dir, "ygz.cfg"))
+            self.assertIsNone(ygz.dmf)
+            self.assertEqual((96, 2830), ygz.analog_raw.shape)
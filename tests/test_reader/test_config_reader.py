@@ -2,9 +2,12 @@
 # -*- coding: utf-8 -*-
 import unittest
 
+import numpy as np
+
+from py3comtrade.model.type import PhaseCode
 from py3comtrade.model.type.mode_enum import SampleMode
 from py3comtrade.model.type.types import ChannelType, IdxType
-from py3comtrade.reader.config_reader import config_reader
+from py3comtrade.reader.config_reader import config_header_reader, config_reader
 
 
 class TestConfigReader(unittest.TestCase):
@@ -60,6 +63,43 @@ class TestConfigReader(unittest.TestCase):
 
         index_analogs = self.xtz.get_channel([0, 1, 2, 3])
         self.assertEqual("220kV母线I_Uc", index_analogs[2].name)
+        an_analogs = self.xtz.get_channel([48, 3], ChannelType.ANALOG, IdxType.CFGAN)
+        self.assertEqual(["高频通道8", "220kV母线I_Uc"], [analog.name for analog in an_analogs])
+        with self.assertRaises(ValueError):
+            self.xtz.get_channel(100, ChannelType.ANALOG, IdxType.CFGAN)
+        with self.assertRaises(ValueError):
+            self.xtz.get_channel([1, 100], ChannelType.ANALOG, IdxType.CFGAN)
+
+    def test_get_channel_indices(self):
+        np.testing.assert_array_equal([47, 2], self.xtz.get_channel_indices(idx_cfg=[48, 3]))
+        np.testing.assert_array_equal([4], self.xtz.get_channel_indices(name="220kV母线II_Ua"))
+        np.testing.assert_array_equal([0, 4], self.xtz.get_channel_indices(idx_cfg=range(1, 9), phase="A"))
+        np.testing.assert_array_equal([4, 5, 6], self.xtz.get_channel_indices(
+            ccbm="220kV母线II_U", phase=[PhaseCode.A_PHASE, PhaseCode.B_PHASE, PhaseCode.C_PHASE]))
+        self.assertEqual(96, len(self.xtz.get_channel_indices(ChannelType.DIGITAL)))
+        with self.assertRaises(ValueError):
+            self.xtz.get_channel_indices(idx_cfg=[1, 100])
+
+    def test_add_channel_updates_lookup(self):
+        analog = self.xtz.analogs[0].model_copy(update={"idx_cfg": 49, "name": "新增通道"})
+        self.xtz.add_analog(analog)
+        np.testing.assert_array_equal([48], self.xtz.get_channel_indices(idx_cfg=49))
+        inserted = analog.model_copy(update={"idx_cfg": 50, "name": "插入通道"})
+        self.xtz.add_analog(inserted, 0)
+        self.assertEqual(0, self.xtz.get_channel(50, ChannelType.ANALOG, IdxType.CFGAN).index)
+        np.testing.assert_array_equal([1, 49], self.xtz.get_channel_indices(idx_cfg=[1, 49]))
+
+    def test_replace_channels_updates_lookup(self):
+        # 通道数量不变时替换通道列表，查找索引同步更新
+        renumbered = [analog.model_copy(update={"idx_cfg": analog.idx_cfg + 100}) for analog in self.xtz.analogs]
+        self.xtz.analogs = renumbered
+        self.assertIs(renumbered[0], self.xtz.get_channel(101, ChannelType.ANALOG, IdxType.CFGAN))
+        with self.assertRaises(ValueError):
+            self.xtz.get_channel(1, ChannelType.ANALOG, IdxType.CFGAN)
+        # 直接修改通道属性后重新生成查找索引
+        self.xtz.analogs[0].name = "改名通道"
+        self.xtz.rebuild_channel_lookup()
+        np.testing.assert_array_equal([0], self.xtz.get_channel_indices(name="改名通道"))
 
     def test_get_header(self):
         self.assertEqual('xtz', self.xtz.header.station_name)
@@ -78,5 +118,26 @@ class TestConfigReader(unittest.TestCase):
         self.assertEqual(803774, self.xtz.fault_time.time.microsecond)
         self.assertEqual(603838, self.xtz.file_start_time.time.microsecond)
 
+    def test_calc_sampling_time(self):
+        # 第一段3200Hz共1280点，用时400ms
+        self.assertAlmostEqual(400, self.xtz.sample.nrates[0].waste_time)
+        sample = self.xtz.sample.model_copy(deep=True)
+        sample.freg = 60
+        sample.calc_sampling()
+        self.assertAlmostEqual(400, sample.nrates[0].waste_time)
+
+    def test_get_zero_point(self):
+        # 零时刻距起始时刻199.936ms，位于3200Hz的第一个采样段
+        self.assertEqual(640, self.xtz.get_zero_point())
+
     def test_get_data_file_type(self):
         self.assertEqual('BINARY', self.xtz.sample.data_file_type.name)
+
+    def test_config_header_reader(self):
+        header = config_header_reader(r'../data/xtz.cfg')
+        self.assertEqual(self.xtz.header, header.header)
+        self.assertEqual(self.xtz.channel_num, header.channel_num)
+        self.assertEqual(self.xtz.sample, header.sample)
+        self.assertEqual(self.xtz.fault_time, header.fault_time)
+        self.assertEqual(0, len(header.analogs))
+        self.assertEqual(0, len(header.digitals))
@@ -2,19 +2,97 @@
 # -*- coding: utf-8 -*-
 
 
+import os
+import tempfile
 import unittest
 
+import numpy as np
+
+from py3comtrade.model.data import digital_bits, pack_digital, unpack_digital
+from py3comtrade.model.type import DataFileType
 from py3comtrade.reader.config_reader import config_reader
-from py3comtrade.reader.data_reader import data_reader
+from py3comtrade.reader.data_reader import data_reader, iter_samples, parse_ascii_lines
 
 
 class TestDataReader(unittest.TestCase):
 
     def setUp(self):
-        cfg_name = r'../dat/xtz._cfg'
-        dat_name = r'../dat/xtz.dat'
+        cfg_name = r'../data/xtz.cfg'
+        dat_name = r'../data/xtz.dat'
         self.cfg = config_reader(cfg_name)
         self.dat = data_reader(dat_name, self.cfg.sample)
 
     def test_read_file(self):
-        pass
+        self.assertEqual((3077, 2), self.dat.sample_time.shape)
+        self.assertEqual((3077, 48), self.dat.analog_value.shape)
+        self.assertEqual((3077, 6), self.dat.digital_value.shape)
+        self.assertEqual(np.uint16, self.dat.digital_value.dtype)
+        self.assertEqual(96, self.dat.digital_num)
+
+    def test_read_binary32_and_float32(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for data_file_type, dtype in ((DataFileType.BINARY32, np.int32), (DataFileType.FLOAT32, np.float32)):
+                sample = self.cfg.sample.model_copy(update={"data_file_type": data_file_type})
+                sample.calc_sampling()
+                self.assertEqual(8 + 48 * 4 + 12, sample.total_sampe_word)
+                dat_name = os.path.join(tmp_dir, f"xtz_{data_file_type.code}.dat")
+                self.dat.write_binary(dat_name, sample)
+                self.assertEqual(3077 * sample.total_sampe_word, os.path.getsize(dat_name))
+                dat = data_reader(dat_name, sample)
+                self.assertEqual(dtype, dat.analog_value.dtype)
+                np.testing.assert_array_equal(self.dat.sample_time, dat.sample_time)
+                np.testing.assert_array_equal(self.dat.analog_value, dat.analog_value)
+                np.testing.assert_array_equal(self.dat.digital_value, dat.digital_value)
+
+    def test_read_ascii_file(self):
+        cfg = config_reader(r'../data/D51_RCD_2346_20150917_105253_065_F.cfg')
+        dat = data_reader(r'../data/D51_RCD_2346_20150917_105253_065_F.dat', cfg.sample)
+        self.assertEqual((2131, 2), dat.sample_time.shape)
+        self.assertEqual((2131, 24), dat.analog_value.shape)
+        self.assertEqual((2131, 3), dat.digital_value.shape)
+        self.assertEqual([1, -77500], dat.sample_time[0].tolist())
+        # 采样时间与二进制格式一致为int32
+        self.assertEqual(self.dat.sample_time.dtype, dat.sample_time.dtype)
+        self.assertEqual(25, dat.analog_value[0, 4])
+        self.assertEqual([1, 0, 0], unpack_digital(dat.digital_value, 37)[0, 6:9].tolist())
+
+    def test_pack_digital(self):
+        bits = np.random.default_rng(0).integers(0, 2, (50, 37), dtype=np.uint8)
+        words = pack_digital(bits)
+        self.assertEqual((50, 3), words.shape)
+        np.testing.assert_array_equal(bits, unpack_digital(words, 37))
+        np.testing.assert_array_equal(bits[:, 17], digital_bits(words.T, 17))
+        np.testing.assert_array_equal(bits[:, [0, 20, 36]].T, digital_bits(words.T, [0, 20, 36]))
+
+    def test_parse_ascii_lines(self):
+        block = parse_ascii_lines([b"1,0,+12,-3,1\r\n", b"2,833,4,5,0\r\n"], 5)
+        self.assertEqual(np.int32, block.dtype)
+        self.assertEqual([[1, 0, 12, -3, 1], [2, 833, 4, 5, 0]], block.tolist())
+        block = parse_ascii_lines([b"1,0,1.5,-3,1\n", b"\n", b"2,833,4,5e1,0\n"], 5)
+        self.assertEqual([[1, 0, 1.5, -3, 1], [2, 833, 4, 50, 0]], block.tolist())
+        # 超出int32范围的整数按浮点数解析，不截断
+        block = parse_ascii_lines([b"1,0,3000000000,-3,1\n"], 5)
+        self.assertEqual(np.float64, block.dtype)
+        self.assertEqual(3000000000, block[0, 2])
+        with self.assertRaises(ValueError):
+            parse_ascii_lines([b"1,0,1,2\n"], 5)
+        with self.assertRaises(ValueError):
+            parse_ascii_lines([b"1,0,x,2,1\n"], 5)
+
+    def test_iter_samples(self):
+        chunks = list(iter_samples(r'../data/xtz.dat', self.cfg.sample, chunk_size=1000))
+        self.assertEqual([0, 1000, 1280, 1316, 2316, 2788], [chunk.start_point for chunk in chunks])
+        self.assertEqual([3200, 3200, 50, 3200, 3200, 50], [chunk.nrate.samp for chunk in chunks])
+        np.testing.assert_array_equal(self.dat.analog_value, np.concatenate([c.analog_value for c in chunks]))
+        np.testing.assert_array_equal(self.dat.digital_value, np.concatenate([c.digital_value for c in chunks]))
+
+        cfg = config_reader(r'../data/D51_RCD_2346_20150917_105253_065_F.cfg')
+        dat_name = r'../data/D51_RCD_2346_20150917_105253_065_F.dat'
+        dat = data_reader(dat_name, cfg.sample)
+        chunks = list(iter_samples(dat_name, cfg.sample, chunk_size=1000))
+        for chunk in chunks:
+            self.assertLessEqual(chunk.nrate.start_point, chunk.start_point)
+            self.assertLessEqual(chunk.start_point + len(chunk.sample_time), chunk.nrate.end_point)
+        np.testing.assert_array_equal(dat.sample_time, np.concatenate([c.sample_time for c in chunks]))
+        np.testing.assert_array_equal(dat.analog_value, np.concatenate([c.analog_value for c in chunks]))
+        np.testing.assert_array_equal(dat.digital_value, np.concatenate([c.digital_value for c in chunks]))
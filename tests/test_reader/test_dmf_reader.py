@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from py3comtrade.model.bus import Bus
+from py3comtrade.model.type import EquipmentType
+from py3comtrade.reader.comtrade_reader import comtrade_reader
+from py3comtrade.reader.dmf_reader import dmf_parser, dmf_stream_parser
+
+
+class TestDmfReader(unittest.TestCase):
+    def setUp(self):
+        self.hjz = dmf_parser(r'../data/hjz.dmf')
+
+    def test_find_by_name(self):
+        self.assertTrue(self.hjz.is_bus_exist("220kV母线U"))
+        self.assertFalse(self.hjz.is_line_exist("不存在的线路"))
+        index, bus = self.hjz.find_bus_by_name("220kV母线U")
+        self.assertEqual(0, index)
+        self.assertIs(bus, self.hjz.find_bus_by_idx(bus.idx))
+        index, transformer = self.hjz.find_transformer_by_name("1号主变")
+        self.assertIs(self.hjz.transformers[index], transformer)
+        self.assertIsNone(self.hjz.find_line_by_name("不存在的线路"))
+
+    def test_channel_equipment(self):
+        # 1号主变高压侧绕组引用220kV母线电压通道1~4，电流通道21~24，低压侧电流通道49~52
+        channels = self.hjz.get_equipment_channels("1号主变", EquipmentType.TRANSFORMER)
+        np.testing.assert_array_equal([1, 2, 3, 4, 21, 22, 23, 24, 5, 6, 7, 8, 49, 50, 51, 52], channels)
+        types, positions, windings = self.hjz.get_channel_equipment([1, 21, 49, 999])
+        np.testing.assert_array_equal([0, 2, 2, -1], types)
+        np.testing.assert_array_equal([0, 0, 0, -1], positions)
+        np.testing.assert_array_equal([-1, 0, 1, -1], windings)
+        equipment_type, equipment = self.hjz.find_equipment_by_channel(21)
+        self.assertEqual(EquipmentType.TRANSFORMER, equipment_type)
+        self.assertEqual("1号主变", equipment.name)
+        self.assertIsNone(self.hjz.find_equipment_by_channel(999))
+
+    def test_index_rebuilt_after_append(self):
+        self.hjz.buses.append(Bus(idx=99, name="新增母线"))
+        self.assertTrue(self.hjz.is_bus_exist("新增母线"))
+        self.assertEqual(99, self.hjz.find_bus_by_idx(99).idx)
+
+    def test_index_rebuilt_after_edit(self):
+        # 设备数量不变时修改名称，索引同步更新
+        self.hjz.bus_edit("220kV母线U", name="改名母线")
+        self.assertIsNone(self.hjz.find_bus_by_name("220kV母线U"))
+        self.assertEqual(0, self.hjz.find_bus_by_name("改名母线")[0])
+        with self.assertRaises(ValueError):
+            self.hjz.bus_edit("不存在的母线", name="x")
+        self.hjz.lines = list(reversed(self.hjz.lines))
+        self.assertIs(self.hjz.lines[0], self.hjz.find_line_by_name(self.hjz.lines[0].name)[1])
+        # 直接修改设备属性后调用build_index
+        self.hjz.lines[0].name = "改名线路"
+        self.hjz.build_index()
+        self.assertTrue(self.hjz.is_line_exist("改名线路"))
+
+    def test_get_equipment_rows(self):
+        ygz = comtrade_reader(r'../data/ygz.cfg')
+        rows = ygz.get_equipment_rows("xgx")
+        # xgx线路电流通道45~47位于analogs的第44~46行
+        np.testing.assert_array_equal([44, 45, 46], rows[:3])
+        self.assertEqual((len(rows), ygz.sample.count), ygz.analog_raw[rows].shape)
+
+    def test_stream_parser(self):
+        for name in ["hjz", "ygz", "ymz"]:
+            expected = dmf_parser(fr'../data/{name}.dmf')
+            dmf = dmf_stream_parser(fr'../data/{name}.dmf')
+            self.assertEqual(expected.model_dump(warnings=False), dmf.model_dump(warnings=False))
+            np.testing.assert_array_equal(expected.channel_equipment, dmf.channel_equipment)
+        index, bus = dmf_stream_parser(r'../data/hjz.dmf').find_bus_by_name("220kV母线U")
+        self.assertEqual(0, index)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from py3comtrade.utils.file_tools import MAX_SCAN_BLOCKS, READ_BYTES_FOR_ENCODING, clear_encoding_cache, \
+    detect_file_encoding
+
+
+class TestDetectFileEncoding(unittest.TestCase):
+
+    def setUp(self):
+        clear_encoding_cache()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        clear_encoding_cache()
+
+    def write(self, name, content: bytes):
+        file_path = os.path.join(self.tmp_dir.name, name)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        return file_path
+
+    def test_detect_test_data(self):
+        self.assertEqual("gb18030", detect_file_encoding(r'../data/xtz.cfg'))
+        self.assertEqual("utf-8", detect_file_encoding(r'../data/ygz.dmf'))
+
+    def test_detect_non_ascii_after_sample(self):
+        # 开头超过样本长度的纯ASCII内容不能掩盖后面的中文通道名称
+        content = b"1,Ua,A,,V,1,0,0,-32767,32767,1,1,S\n" * (READ_BYTES_FOR_ENCODING // 10)
+        gbk_path = self.write("gbk.cfg", content + "母线电压".encode("gbk"))
+        self.assertEqual("gb18030", detect_file_encoding(gbk_path, use_cache=False))
+        utf8_path = self.write("utf8.cfg", content + "母线电压".encode("utf-8"))
+        self.assertEqual("utf-8", detect_file_encoding(utf8_path, use_cache=False))
+        ascii_path = self.write("ascii.cfg", content)
+        self.assertEqual("ascii", detect_file_encoding(ascii_path))
+
+    def test_directory_cache_verified(self):
+        utf8_path = self.write("utf8.cfg", "母线电压".encode("utf-8"))
+        gbk_path = self.write("gbk.cfg", "母线电压".encode("gbk"))
+        self.assertEqual("utf-8", detect_file_encoding(utf8_path))
+        # 缓存的UTF-8无法解码同目录下的GBK文件时重新检测
+        self.assertEqual("gb18030", detect_file_encoding(gbk_path))
+
+    def test_mixed_encodings_in_directory(self):
+        # 缓存GB18030后，同目录下的UTF-8文件仍应识别为UTF-8
+        text = "母线电压,220kV线路"
+        gbk_path = self.write("a.cfg", text.encode("gbk"))
+        utf8_path = self.write("b.cfg", text.encode("utf-8"))
+        self.assertEqual("gb18030", detect_file_encoding(gbk_path))
+        self.assertEqual("utf-8", detect_file_encoding(utf8_path))
+        self.assertEqual("gb18030", detect_file_encoding(gbk_path))
+        with open(utf8_path, encoding=detect_file_encoding(utf8_path)) as f:
+            self.assertEqual(text, f.read())
+
+    def test_scan_capped(self):
+        # 查找范围内全部为ASCII但文件未读完时不判定为ASCII，无缓存时按GB18030处理
+        content = b"1,Ua,A,,V,1,0,0,-32767,32767,1,1,S\n" * (READ_BYTES_FOR_ENCODING * 16 * (MAX_SCAN_BLOCKS + 1) // 35)
+        file_path = self.write("long.cfg", content + "母线电压".encode("gbk"))
+        self.assertEqual("gb18030", detect_file_encoding(file_path))
+        with open(file_path, encoding=detect_file_encoding(file_path)) as f:
+            self.assertTrue(f.read().endswith("母线电压"))
+        # 同目录已缓存UTF-8时沿用缓存的编码
+        self.assertEqual("utf-8", detect_file_encoding(self.write("utf8.cfg", "母线电压".encode("utf-8"))))
+        utf8_path = self.write("long_utf8.cfg", content + "母线电压".encode("utf-8"))
+        self.assertEqual("utf-8", detect_file_encoding(utf8_path))
+